@@ -0,0 +1,112 @@
+import os
+import argparse
+import matplotlib
+import pandas as pd
+from multiprocessing.util import Finalize
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_FORMATS = ("png",)
+# Same columns as the SECTOR_SCAN peer table
+PEER_COLUMNS = ['Ticker', 'Market Cap', 'FCF Yield', 'Sequential Growth', 'EV/EBIT', 'P/E Ratio',
+                'Equity Risk Premium (ERP)', 'ROIC']
+
+# One dashboard per worker process: its figure templates are reused for every ticker
+_worker_dashboard = None
+
+def _init_worker():
+    """Pool initializer: only worker processes switch to Agg, the caller's backend is untouched."""
+    global _worker_dashboard
+    matplotlib.use("Agg") # Headless: no GUI backend, nothing blocks on plt.show()
+    from dashboards.valuation_dashboard import ValuationDashboard
+    _worker_dashboard = ValuationDashboard()
+    # Pool workers leave through multiprocessing's exit hooks (atexit does not run there)
+    Finalize(_worker_dashboard, _worker_dashboard.close, exitpriority=10)
+
+def _paths(output_dir, name, formats):
+    return [os.path.join(output_dir, f"{name}.{fmt}") for fmt in formats]
+
+def _render_one(job):
+    # Each chart is drawn once and saved once per format
+    ticker, metrics, trends, output_dir, formats = job
+    written = []
+    try:
+        if metrics:
+            written += _worker_dashboard.plot_dashboard(
+                ticker, metrics, output_path=_paths(output_dir, f"{ticker}_dashboard", formats)
+            )
+        if trends is not None and not trends.empty:
+            written += _worker_dashboard.plot_historical_trends(
+                ticker, trends, output_path=_paths(output_dir, f"{ticker}_trends", formats)
+            )
+    except Exception as e:
+        print(f"❌ [Render] {ticker} failed: {e}")
+    return ticker, written
+
+def _render_peers(df_peers, output_dir, formats):
+    from dashboards.peer_dashboard import PeerDashboard
+    return PeerDashboard().plot_peer_comparison(df_peers, output_path=_paths(output_dir, "peer_map", formats))
+
+def peer_frame(reports):
+    """Peer map input (one row per ticker) from the per-ticker metrics dicts."""
+    rows = [dict({c: r['metrics'].get(c, 0) for c in PEER_COLUMNS[1:]}, Ticker=t)
+            for t, r in reports.items() if r.get('metrics')]
+    return pd.DataFrame(rows, columns=PEER_COLUMNS).rename(columns={'Equity Risk Premium (ERP)': 'ERP'})
+
+def render_reports(reports, output_dir, formats=DEFAULT_FORMATS, max_workers=None, peer_map=True):
+    """
+    Renders the report deck to files, headless (Agg).
+
+    reports: {ticker: {'metrics': process_analysis dict, 'trends': process_time_series frame}}
+    Per ticker: {ticker}_dashboard.{fmt} and {ticker}_trends.{fmt}; plus peer_map.{fmt}
+    when more than one ticker is given. Tickers are spread over worker
+    processes (Agg, even with max_workers=1, so the calling process keeps its own
+    backend); each worker reuses its figures and closes them when it exits.
+
+    Returns {ticker: [written paths]} (key 'PEERS' for the peer map).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    formats = tuple(f.lower().lstrip('.') for f in formats)
+    jobs = [(t, r.get('metrics'), r.get('trends'), output_dir, formats) for t, r in reports.items()]
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    df_peers = peer_frame(reports) if peer_map and len(reports) > 1 else None
+
+    print(f"🖨️ [Render] {len(jobs)} tickers -> {output_dir} ({', '.join(formats)}, {max_workers} workers)")
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+        peers = None
+        if df_peers is not None and not df_peers.empty:
+            peers = pool.submit(_render_peers, df_peers, output_dir, formats)
+        results = dict(pool.map(_render_one, jobs, chunksize=max(1, len(jobs) // (max_workers * 4))))
+        if peers is not None:
+            try:
+                results['PEERS'] = peers.result() or []
+            except Exception as e:
+                print(f"❌ [Render] Peer map failed: {e}")
+
+    total = sum(len(v) for v in results.values())
+    print(f"✅ [Render] {total} files written.")
+    return results
+
+def reports_from_run(run_id, root=None):
+    """Loads metrics / trends of every ticker from a run manifest (pipelines/run_cache)."""
+    from pipelines.run_manifest import RunManifest
+    manifest = RunManifest(run_id, root=root)
+    reports = {}
+    for ticker in manifest.tickers():
+        metrics = manifest.latest(ticker, "metrics")
+        if metrics:
+            reports[ticker] = {'metrics': metrics, 'trends': manifest.latest(ticker, "trends")}
+    return reports
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="Render the dashboards of a finished run to files (headless)")
+    cli.add_argument("--run-id", required=True, help="Run manifest to read (see pipelines/analysis_pipeline.py)")
+    cli.add_argument("--out", default="reports", help="Output folder")
+    cli.add_argument("--format", action="append", choices=["png", "svg", "pdf"], help="Repeatable (default: png)")
+    cli.add_argument("--workers", type=int, default=None)
+    args = cli.parse_args()
+
+    reports = reports_from_run(args.run_id)
+    if not reports:
+        print(f"❌ No metrics recorded for run {args.run_id}.")
+    else:
+        render_reports(reports, args.out, formats=args.format or DEFAULT_FORMATS, max_workers=args.workers)
@@ -15,8 +15,8 @@ class PeerDashboard:
             'highlight': '#00a4eb'   # 高亮 (蓝)
         }
         
-        # 全局配置
-        plt.rcParams.update({
+        # 样式只在绘图时通过 rc_context 生效, 不改全局 rcParams
+        self.rc = {
             'font.family': 'sans-serif',
             'font.weight': 'bold',
             'axes.edgecolor': self.styles['bg'],
@@ -29,19 +29,35 @@ class PeerDashboard:
             'axes.grid': True,
             'grid.color': self.styles['grid'],
             'grid.linestyle': '--'
-        })
+        }
 
-    def plot_peer_comparison(self, df_metrics):
+    def plot_peer_comparison(self, df_metrics, output_path=None):
         """
         绘制同业对标散点图 (Alpha Map)
         X轴: Growth (动量)
         Y轴: Value (估值/Yield)
         气泡大小: Market Cap
+        output_path: 写入文件 (.png / .svg / .pdf, 或路径列表: 画一次存多种格式) 并关闭 figure, 返回 output_path; 否则弹窗并返回 figure
         """
         if df_metrics.empty:
             print("❌ No data to plot.")
             return
 
+        with plt.rc_context(self.rc):
+            fig = self._draw_peer_map(df_metrics.reset_index(drop=True))
+            print("📊 Peer Comparison Dashboard Generated.")
+            if output_path is None:
+                plt.show()
+                return fig
+            try:
+                for path in ([output_path] if isinstance(output_path, str) else output_path):
+                    fig.savefig(path, facecolor=fig.get_facecolor())
+            finally:
+                plt.close(fig)
+            return output_path
+
+    def _draw_peer_map(self, df_metrics):
+
         # 1. 提取数据
         tickers = df_metrics['Ticker']
         x_growth = df_metrics['Sequential Growth']
@@ -97,9 +113,5 @@ class PeerDashboard:
         ax.text(0.05, 0.05, "⚠️ AVOID AREA\nLow Growth + Low Yield", 
                 transform=ax.transAxes, ha='left', va='bottom', color=self.styles['bubble_neg'], alpha=0.5, fontsize=12)
 
-        plt.tight_layout()
-        print("📊 Peer Comparison Dashboard Generated.")
-        plt.show()
-
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
\ No newline at end of file
@@ -12,33 +12,80 @@ class ValuationDashboard:
             'blue': '#00a4eb', 'gold': '#ff9f00', 'text': '#ffffff',
             'sub': '#888888', 'grid': '#1a1a1a'
         }
-        # 全局配置
-        plt.rcParams.update({
+        # 样式只在绘图时通过 rc_context 生效, 不改全局 rcParams
+        self.rc = {
             'font.family': 'sans-serif', 'font.weight': 'bold',
             'axes.edgecolor': self.rh['bg'], 'axes.facecolor': self.rh['bg'],
             'figure.facecolor': self.rh['bg'], 'text.color': self.rh['text'],
             'xtick.color': self.rh['sub'], 'ytick.color': self.rh['sub'],
             'axes.labelcolor': self.rh['sub'], 'axes.grid': True,
             'grid.color': self.rh['grid'], 'grid.linestyle': '--'
-        })
+        }
+        # Headless 模式下按图表类型复用同一个 figure (只清空坐标轴重画)
+        self._templates = {}
+
+    def _template(self, name, build):
+        if name not in self._templates:
+            self._templates[name] = build()
+        fig, axes = self._templates[name]
+        for ax in axes:
+            ax.clear()
+        return fig, axes
 
-    def plot_historical_trends(self, ticker, df_history):
+    def _finish(self, fig, output_path):
+        """
+        交互模式: plt.show(); 否则写文件 (格式由扩展名决定: .png / .svg / .pdf).
+        output_path 可以是路径列表: 只画一次, 每种格式各 savefig 一次.
+        """
+        if output_path is None:
+            plt.show()
+            return None
+        for path in ([output_path] if isinstance(output_path, str) else output_path):
+            fig.savefig(path, facecolor=fig.get_facecolor())
+        return output_path
+
+    def close(self):
+        """关闭复用的 figure, 释放内存"""
+        for fig, _ in self._templates.values():
+            plt.close(fig)
+        self._templates.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _build_trends(self):
+        # 创建画布 (上下两图)
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
+        fig.subplots_adjust(hspace=0.3) # 调整间距
+        return fig, (ax1, ax2)
+
+    def plot_historical_trends(self, ticker, df_history, output_path=None):
         """
         [新增] 绘制历史趋势图 (Sparklines)
         包含: Gross Margin 走势 & FCF Yield 走势
+        output_path: 写入文件 (或文件列表) 而不是弹窗, 返回 output_path
         """
         if df_history is None or df_history.empty:
             print("❌ No historical data to plot.")
             return
 
+        with plt.rc_context(self.rc):
+            if output_path is None:
+                fig, (ax1, ax2) = self._build_trends()
+            else:
+                fig, (ax1, ax2) = self._template('trends', self._build_trends)
+            self._draw_trends(ticker, df_history, ax1, ax2)
+            print("📊 Historical Trend Dashboard Generated.")
+            return self._finish(fig, output_path)
+
+    def _draw_trends(self, ticker, df_history, ax1, ax2):
         # 确保按时间正序排列 (从过去到现在)
         df = df_history.sort_values(by='Date')
         dates = pd.to_datetime(df['Date'])
 
-        # 创建画布 (上下两图)
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
-        plt.subplots_adjust(hspace=0.3) # 调整间距
-
         # --- 图表 A: Gross Margin Trend (盈利能力) ---
         # 逻辑：毛利率下降是危险信号
         margins = df['Gross Margin']
@@ -70,15 +117,32 @@ class ValuationDashboard:
         last_yield = yields.iloc[-1]
         ax2.text(last_date, last_yield, f"  {last_yield:.2%}", color=line_color, fontsize=12, fontweight='bold', va='center')
 
-        print("📊 Historical Trend Dashboard Generated.")
-        plt.show()
 
+    def _build_dashboard(self):
+        # 创建画布 (2行2列)
+        fig = plt.figure(figsize=(14, 8))
+        gs = fig.add_gridspec(2, 2, height_ratios=[1.2, 1]) # 上面稍微高一点
+        axes = (fig.add_subplot(gs[0, :]), fig.add_subplot(gs[1, 0]), fig.add_subplot(gs[1, 1]))
+        fig.subplots_adjust(hspace=0.4, wspace=0.3, top=0.9, bottom=0.1, left=0.1, right=0.9)
+        return fig, axes
 
-    def plot_dashboard(self, ticker, metrics):
+    def plot_dashboard(self, ticker, metrics, output_path=None):
+        """output_path: 写入文件 (或文件列表) 而不是弹窗, 返回 output_path"""
         if not metrics:
             print("❌ No metrics to plot.")
             return
 
+        with plt.rc_context(self.rc):
+            if output_path is None:
+                fig, axes = self._build_dashboard()
+            else:
+                fig, axes = self._template('dashboard', self._build_dashboard)
+            self._draw_dashboard(ticker, metrics, *axes)
+            print("📊 Robinhood Data Dashboard Generated.")
+            return self._finish(fig, output_path)
+
+    def _draw_dashboard(self, ticker, metrics, ax1, ax2, ax3):
+
         # ---------------------------------------------------------
         # 1. 准备数据
         # ---------------------------------------------------------
@@ -92,17 +156,9 @@ class ValuationDashboard:
         # B. 估值数据
         ev_ebit = metrics.get('EV/EBIT', 0)
         
-        # ---------------------------------------------------------
-        # 2. 创建画布 (2行2列)
-        # ---------------------------------------------------------
-        fig = plt.figure(figsize=(14, 8))
-        gs = fig.add_gridspec(2, 2, height_ratios=[1.2, 1]) # 上面稍微高一点
-        
         # ---------------------------------------------------------
         # 图表 A: 盈利漏斗 (Financial Funnel) - 柱状图
         # ---------------------------------------------------------
-        ax1 = fig.add_subplot(gs[0, :])
-        
         labels = ['Revenue', 'Gross Profit', 'Net Income', 'Free Cash Flow']
         values = [rev, gross_profit, ni, fcf]
         # 使用霓虹配色区分层级
@@ -130,8 +186,6 @@ class ValuationDashboard:
         # ---------------------------------------------------------
         # 图表 B: 估值倍数 (Valuation Multiples) - 横向条形图
         # ---------------------------------------------------------
-        ax2 = fig.add_subplot(gs[1, 0])
-        
         ratios = ['P/E Ratio', 'EV/EBIT']
         vals = [pe, ev_ebit]
         # 逻辑颜色：红色代表 P/E (通常较高), 绿色代表 EV/EBIT (扣除现金后较低)
@@ -155,7 +209,6 @@ class ValuationDashboard:
         # ---------------------------------------------------------
         # 图表 C: 核心记分卡 (Institutional Signal) - 纯文字
         # ---------------------------------------------------------
-        ax3 = fig.add_subplot(gs[1, 1])
         ax3.axis('off')
         
         # 数据准备
@@ -188,11 +241,3 @@ class ValuationDashboard:
         # 装饰线
         ax3.plot([0.05, 0.9], [0.68, 0.68], color=self.rh['grid'], linewidth=1)
         ax3.plot([0.05, 0.9], [0.48, 0.48], color=self.rh['grid'], linewidth=1)
-
-        # ---------------------------------------------------------
-        # 3. 调整布局与展示
-        # ---------------------------------------------------------
-        plt.subplots_adjust(hspace=0.4, wspace=0.3, top=0.9, bottom=0.1, left=0.1, right=0.9)
-        
-        print("📊 Robinhood Data Dashboard Generated.")
-        plt.show()
\ No newline at end of file
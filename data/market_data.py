@@ -1,38 +1,191 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
 import yfinance as yf
 
+RISK_FREE_SYMBOL = "^TNX"      # 10年期美债收益率
+BENCHMARK_SYMBOL = "^GSPC"     # Beta 的市场基准
+DEFAULT_RISK_FREE_RATE = 0.045 # Fallback: 默认 4.5%
+
+MACRO_TTL = 15 * 60            # 宏观序列: 一次扫描内只请求一次
+REFERENCE_TTL = 24 * 60 * 60   # 股本等静态数据: 一天刷新一次
+BETA_PERIOD = "1y"             # 日收益率回归窗口
+MIN_BETA_OBS = 60
+SHARES_WORKERS = 8             # 股本没有批量接口: 每个 ticker 一次请求, 并发发出
+
+class TTLCache:
+    """
+    Process-wide TTL cache. Concurrent callers asking for the same missing key
+    wait for a single fetch instead of all hitting the network.
+    """
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._data = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, key, fetch):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry and time.monotonic() - entry[0] < self.ttl:
+                return entry[1]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock: # 其它线程可能刚刚取完
+                entry = self._data.get(key)
+                if entry and time.monotonic() - entry[0] < self.ttl:
+                    return entry[1]
+            value = fetch()
+            with self._lock:
+                self._data[key] = (time.monotonic(), value)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+MACRO_CACHE = TTLCache(MACRO_TTL)
+REFERENCE_CACHE = TTLCache(REFERENCE_TTL)
+
 class Market_Data:
+    @staticmethod
+    def get_macro_history(symbol, period="5d"):
+        """宏观序列的收盘价 (进程级 TTL 缓存, 所有 ticker 共用)"""
+        def fetch():
+            hist = yf.Ticker(symbol).history(period=period)
+            return hist['Close'] if not hist.empty else pd.Series(dtype=float)
+        return MACRO_CACHE.get((symbol, period), fetch)
+
+    @staticmethod
+    def get_risk_free_rate():
+        # 注意：^TNX 的价格 4.25 代表 4.25%，所以要除以 100
+        try:
+            closes = Market_Data.get_macro_history(RISK_FREE_SYMBOL, "5d") # 抓5d防假期
+            if not closes.empty:
+                return float(closes.iloc[-1]) / 100
+        except Exception as e:
+            print(f"   ⚠️ Failed to fetch ^TNX, using default 4.5%: {e}")
+        return DEFAULT_RISK_FREE_RATE
+
+    @staticmethod
+    def _shares_outstanding(ticker):
+        # fast_info 只请求股本序列, 不拉完整的 info
+        # 失败不进缓存, 下次调用重试
+        try:
+            return REFERENCE_CACHE.get(('shares', ticker), lambda: yf.Ticker(ticker).fast_info['shares'])
+        except Exception:
+            return None
+
+    @staticmethod
+    def _by_date(data):
+        """
+        索引统一为不带时区的交易日: yf.download 的日线索引没有时区,
+        Ticker.history 的 (^GSPC) 带交易所时区, 不对齐就一个日期都匹配不上.
+        """
+        idx = pd.DatetimeIndex(data.index)
+        if idx.tz is not None:
+            idx = idx.tz_localize(None) # 保留交易所当地日期
+        data = data.set_axis(idx.normalize())
+        return data[~data.index.duplicated(keep='last')]
+
+    @staticmethod
+    def _betas(closes, benchmark):
+        """所有 ticker 的 Beta 一次算完: cov(r_i, r_m) / var(r_m), 日收益率"""
+        closes, benchmark = Market_Data._by_date(closes), Market_Data._by_date(benchmark)
+        rets = closes.pct_change(fill_method=None)
+        mkt = benchmark.pct_change(fill_method=None).reindex(rets.index)
+        valid = rets.notna() & mkt.notna().to_numpy()[:, None]
+        r = rets.where(valid)
+        m = pd.DataFrame(np.where(valid, mkt.to_numpy()[:, None], np.nan), index=rets.index, columns=rets.columns)
+
+        n = valid.sum()
+        cov = ((r - r.mean()) * (m - m.mean())).sum() / (n - 1)
+        var = ((m - m.mean()) ** 2).sum() / (n - 1)
+        beta = cov / var.replace(0, np.nan)
+        return beta.where(n >= MIN_BETA_OBS)
+
+    @staticmethod
+    def get_quotes(tickers):
+        """
+        批量行情 (SECTOR_SCAN): 一次 yf.download 拿到所有 ticker 的价格历史,
+        Beta 对缓存的 ^GSPC 用 1 年日收益率向量化计算, 无风险利率整批只取一次.
+        股本 Yahoo 没有批量接口: 每个 ticker 一次 fast_info 请求 (并发, 缓存一天),
+        所以 N 个 ticker 首次扫描约为 N + 3 次请求.
+        Returns {ticker: market_data}; 取不到价格或市值的 ticker 不在结果里.
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        if not tickers: return {}
+        print(f"📡 [Market Data] Fetching batched quotes for {len(tickers)} tickers...")
+
+        try:
+            prices = yf.download(tickers, period=BETA_PERIOD, auto_adjust=False, progress=False, group_by='column')
+        except Exception as e:
+            print(f"❌ Market Data Error: {e}")
+            return {}
+        if prices is None or prices.empty:
+            return {}
+
+        closes = prices['Close']
+        if isinstance(closes, pd.Series): # 单个 ticker
+            closes = closes.to_frame(tickers[0])
+
+        try:
+            betas = Market_Data._betas(closes, Market_Data.get_macro_history(BENCHMARK_SYMBOL, BETA_PERIOD))
+        except Exception as e:
+            print(f"   ⚠️ Failed to compute Beta: {e}")
+            betas = pd.Series(np.nan, index=closes.columns)
+
+        rfr = Market_Data.get_risk_free_rate() # <--- 注入宏观因子
+        last_prices = closes.ffill().iloc[-1]
+        priced = [t for t in tickers if pd.notna(last_prices.get(t, np.nan))]
+
+        with ThreadPoolExecutor(max_workers=SHARES_WORKERS) as pool:
+            shares_by_ticker = dict(zip(priced, pool.map(Market_Data._shares_outstanding, priced)))
+
+        quotes = {}
+        for ticker in priced:
+            price, shares = float(last_prices[ticker]), shares_by_ticker[ticker]
+            if not shares:
+                # 没有市值无法估值: 跳过, 不把 None 传给 Alpha Engine
+                print(f"   ⚠️ {ticker}: shares outstanding unavailable, skipping.")
+                continue
+            beta = betas.get(ticker)
+            quotes[ticker] = {
+                "Price": price,
+                "Market Cap": price * shares,
+                "Shares Outstanding": shares,
+                "Beta": None if beta is None or pd.isna(beta) else float(beta),
+                "Industry": None, # 需要完整 info, 批量路径不抓取
+                "Risk-Free Rate": rfr
+            }
+        return quotes
+
     @staticmethod
     def get_realtime_market_data(ticker):
         """
-        [修改版] 增加宏观数据抓取 (^TNX - 10年期美债收益率)
+        [修改版] 单个 ticker (DEEP_DIVE): 完整 info (Yahoo 的 Beta / Industry),
+        宏观数据 (^TNX - 10年期美债收益率) 来自进程级缓存
         """
         print(f"📡 [Market Data] Fetching real-time data for {ticker}...")
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            
-            # --- 新增：抓取无风险利率 (Risk-Free Rate) ---
-            # 我们使用 Yahoo Finance 的 ^TNX 代码
-            try:
-                tnx = yf.Ticker("^TNX")
-                # 获取最新一天的收盘价 (Yield)
-                # 注意：^TNX 的价格 4.25 代表 4.25%，所以要除以 100
-                tnx_hist = tnx.history(period="5d") # 抓5d防假期
-                if not tnx_hist.empty:
-                    rfr = tnx_hist['Close'].iloc[-1] / 100
-                else:
-                    rfr = 0.045 # Fallback: 默认 4.5%
-            except Exception as e:
-                print(f"   ⚠️ Failed to fetch ^TNX, using default 4.5%: {e}")
-                rfr = 0.045
+            info = yf.Ticker(ticker).info
+            price = info.get('currentPrice', info.get('regularMarketPrice'))
+            shares = info.get('sharesOutstanding')
+            mkt_cap = info.get('marketCap') or (price * shares if price and shares else None)
+            if not mkt_cap:
+                print(f"   ⚠️ {ticker}: market cap unavailable.")
+                return None
 
             market_data = {
-                "Price": info.get('currentPrice', info.get('regularMarketPrice')),
-                "Market Cap": info.get('marketCap'),
-                "Shares Outstanding": info.get('sharesOutstanding'),
+                "Price": price,
+                "Market Cap": mkt_cap,
+                "Shares Outstanding": shares,
                 "Beta": info.get('beta'),
                 "Industry": info.get('industry'),
-                "Risk-Free Rate": rfr # <--- 注入宏观因子
+                "Risk-Free Rate": Market_Data.get_risk_free_rate() # <--- 注入宏观因子
             }
             return market_data
         except Exception as e:
@@ -0,0 +1,187 @@
+import os
+import json
+from datetime import date
+from data.sec_core.SEC_ParallelParser import sort_history
+
+FILING_FORMS = ("10-K", "10-Q")
+PREFERRED_UNIT = "USD"
+# Cover-page taxonomy: its dates (e.g. shares outstanding "as of") are not the report period
+COVER_TAXONOMY = "dei"
+# Durations (days) a filing reports for its own period, by fiscal period (fp):
+# a year for FY, the discrete quarter or the fiscal year-to-date for Q1-Q4
+PERIOD_DAYS = {
+    'FY': [(330, 400)],
+    'Q1': [(80, 100)],
+    'Q2': [(80, 100), (170, 195)],
+    'Q3': [(80, 100), (260, 285)],
+    'Q4': [(80, 100), (330, 400)],
+}
+FORM_FP = {'10-K': 'FY'}
+
+def _days(start, end):
+    return (date.fromisoformat(end) - date.fromisoformat(start)).days
+
+class SEC_CompanyFactsLoader:
+    """
+    Builds filing dicts from SEC companyfacts JSON (bulk companyfacts.zip,
+    extracted: one CIK##########.json per company) instead of parsing filings.
+
+    Concepts are mapped through the same metrics_config.json as SEC_Parser and
+    the output has the same shape as SEC_Parser.parse_single_filing:
+    {'Source', 'File', 'Period End Date', <metric>: value, ...} (+ 'Accession').
+    """
+    def __init__(self, facts_dir=None, metrics_map=None, client=None):
+        current_script_folder = os.path.dirname(os.path.abspath(__file__))
+        self.facts_dir = facts_dir or os.path.join(current_script_folder, "sec_data", "companyfacts")
+        self.client = client # 可选 SEC_EdgarClient, 仅用于 ticker -> CIK
+
+        if metrics_map is None:
+            config_path = os.path.join(current_script_folder, 'metrics_config.json')
+            try:
+                with open(config_path, 'r') as f:
+                    metrics_map = json.load(f)
+            except Exception as e:
+                print(f"⚠️ Failed to load metrics config: {e}")
+                metrics_map = {}
+        self.metrics_map = metrics_map
+        self._ticker_map = None
+
+    # --- CIK resolution ---
+    def _load_ticker_map(self):
+        # SEC company_tickers.json: {"0": {"cik_str": 320193, "ticker": "AAPL", ...}, ...}
+        for folder in (self.facts_dir, os.path.dirname(self.facts_dir)):
+            path = os.path.join(folder, "company_tickers.json")
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    rows = json.load(f).values()
+                return {str(r['ticker']).upper(): str(r['cik_str']).zfill(10) for r in rows}
+        return {}
+
+    def get_cik(self, ticker_or_cik):
+        value = str(ticker_or_cik).strip().upper()
+        if value.isdigit():
+            return value.zfill(10)
+        if self._ticker_map is None:
+            self._ticker_map = self._load_ticker_map()
+        if value in self._ticker_map:
+            return self._ticker_map[value]
+        if self.client is not None:
+            return self.client.get_cik(value)
+        raise ValueError(f"Ticker {value!r} cannot be mapped to a CIK (no company_tickers.json)")
+
+    def load_company_facts(self, ticker_or_cik):
+        cik = self.get_cik(ticker_or_cik)
+        path = os.path.join(self.facts_dir, f"CIK{cik}.json")
+        with open(path, 'r') as f:
+            return cik, json.load(f)
+
+    # --- Filing reconstruction ---
+    def _filing_periods(self, facts, forms):
+        """
+        accn -> {'form', 'end'}. The period end is the latest end date of a
+        duration matching the filing's fiscal period (fp: FY -> a year, Qn -> the
+        quarter or year-to-date), so later-dated facts (subsequent events, debt
+        maturities) are not taken for it. Without such a duration: the latest end date.
+        """
+        filings = {}
+        for taxonomy, concepts in facts.items():
+            if taxonomy == COVER_TAXONOMY: continue
+            for concept in concepts.values():
+                for entries in concept.get('units', {}).values():
+                    for e in entries:
+                        form = e.get('form')
+                        if form not in forms: continue
+                        info = filings.get(e['accn'])
+                        if info is None:
+                            info = filings[e['accn']] = {'form': form, 'end': e['end'], 'period_end': None}
+                        elif e['end'] > info['end']:
+                            info['end'] = e['end']
+                        if e.get('start') and (info['period_end'] is None or e['end'] > info['period_end']):
+                            windows = PERIOD_DAYS.get(e.get('fp') or FORM_FP.get(form), [])
+                            if any(lo <= _days(e['start'], e['end']) <= hi for lo, hi in windows):
+                                info['period_end'] = e['end']
+
+        for info in filings.values():
+            period_end = info.pop('period_end')
+            if period_end is not None:
+                info['end'] = period_end
+        return filings
+
+    def _concept_entries(self, facts, tag):
+        for taxonomy, concepts in facts.items():
+            if taxonomy == COVER_TAXONOMY or tag not in concepts: continue
+            units = concepts[tag].get('units', {})
+            if PREFERRED_UNIT in units:
+                return units[PREFERRED_UNIT]
+            if units:
+                return next(iter(units.values()))
+        return []
+
+    def _pick_values(self, entries, filings):
+        """
+        accn -> value of the fact matching the filing's period end.
+        Instants match directly; for durations a 10-Q takes the shortest
+        (discrete quarter, if reported) and a 10-K the one closest to a year.
+        """
+        best = {}
+        for e in entries:
+            info = filings.get(e.get('accn'))
+            if info is None or e['end'] != info['end']: continue
+
+            start = e.get('start')
+            if start is None:
+                rank = 0
+            elif info['form'] == '10-K':
+                rank = abs(_days(start, e['end']) - 365)
+            else:
+                rank = _days(start, e['end'])
+
+            current = best.get(e['accn'])
+            if current is None or rank < current[0]:
+                best[e['accn']] = (rank, e['val'])
+        return {accn: float(val) for accn, (_, val) in best.items()}
+
+    def build_filings(self, cik, company_facts, forms=FILING_FORMS):
+        facts = company_facts.get('facts', {})
+        filings = self._filing_periods(facts, set(forms))
+
+        results = {
+            accn: {
+                'Source': info['form'],
+                'File': f"CIK{cik}.json",
+                'Accession': accn,
+                'Period End Date': info['end']
+            }
+            for accn, info in filings.items()
+        }
+
+        for metric_name, tags in self.metrics_map.items():
+            for data in results.values():
+                data[metric_name] = 0.0
+            resolved = set()
+            # Tag order = priority, like SEC_Parser: later tags only fill the gaps
+            for tag in tags:
+                for accn, value in self._pick_values(self._concept_entries(facts, tag), filings).items():
+                    if accn not in resolved:
+                        results[accn][metric_name] = value
+                        resolved.add(accn)
+
+        return list(results.values())
+
+    def get_fundamental_history(self, ticker_or_cik, limit_per_form=None, forms=FILING_FORMS):
+        """
+        Same contract as the pipelines' get_fundamental_history:
+        filing dicts sorted by Period End Date, newest first.
+        """
+        cik, company_facts = self.load_company_facts(ticker_or_cik)
+        history = sort_history([(f['Accession'], f) for f in self.build_filings(cik, company_facts, forms)])
+
+        if limit_per_form:
+            counts = {}
+            kept = []
+            for f in history:
+                counts[f['Source']] = counts.get(f['Source'], 0) + 1
+                if counts[f['Source']] <= limit_per_form:
+                    kept.append(f)
+            history = kept
+        return history
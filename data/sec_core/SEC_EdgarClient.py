@@ -0,0 +1,248 @@
+import os
+import json
+import gzip
+import time
+import zlib
+import random
+import threading
+from http.client import HTTPException
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError, URLError
+
+# Base URLs can be pointed at a local stand-in for EDGAR (e.g. http://127.0.0.1:8000)
+SEC_WWW_BASE_URL = os.environ.get("SEC_WWW_BASE_URL", "https://www.sec.gov")
+SEC_DATA_BASE_URL = os.environ.get("SEC_DATA_BASE_URL", "https://data.sec.gov")
+
+# SEC fair-access policy: at most 10 requests per second
+SEC_MAX_REQUESTS_PER_SEC = 10
+
+CIK_LENGTH = 10
+AMENDS_SUFFIX = "/A"
+
+# Transient failures worth retrying (throttled / server side)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+DOWNLOAD_CHUNK = 1 << 16
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. acquire() blocks until a token is available.
+    capacity=1 means no bursts: requests are spaced exactly 1/rate apart,
+    which keeps every 1-second window within the limit.
+    """
+    def __init__(self, rate, capacity=1):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now (may go negative) and sleep outside the lock
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+# One bucket for the whole process: every client and thread shares the SEC quota
+SEC_RATE_LIMITER = TokenBucket(SEC_MAX_REQUESTS_PER_SEC)
+
+class SEC_EdgarClient:
+    """
+    Minimal EDGAR HTTP client (stdlib urllib): ticker -> CIK mapping,
+    submissions index and archive documents.
+    """
+    def __init__(self, company_name, email_address, www_base_url=None, data_base_url=None,
+                 rate_limiter=None, timeout=30, max_retries=5, backoff_base=0.5):
+        # SEC requires a declared User-Agent with contact info
+        self.user_agent = f"{company_name} {email_address}"
+        self.www_base_url = (www_base_url or SEC_WWW_BASE_URL).rstrip("/")
+        self.data_base_url = (data_base_url or SEC_DATA_BASE_URL).rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+
+        self.rate_limiter = rate_limiter or SEC_RATE_LIMITER
+        self._ticker_lock = threading.Lock()
+        self._ticker_map = None
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff_base * (2 ** attempt) + random.uniform(0, self.backoff_base)
+
+    def _with_retries(self, url, func):
+        """Runs func() (one HTTP attempt) with exponential backoff on transient errors."""
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                return func()
+            except HTTPError as e:
+                if e.code not in RETRY_STATUS or attempt == self.max_retries:
+                    raise
+                wait = self._backoff(attempt, e.headers.get("Retry-After") if e.headers else None)
+            except (URLError, HTTPException, TimeoutError, ConnectionError):
+                if attempt == self.max_retries:
+                    raise
+                wait = self._backoff(attempt)
+            print(f"⚠️ [EDGAR] Retry {attempt + 1}/{self.max_retries} in {wait:.1f}s: {url}")
+            time.sleep(wait)
+
+    def get_bytes(self, url):
+        def attempt():
+            req = Request(url, headers={"User-Agent": self.user_agent, "Accept-Encoding": "gzip, deflate"})
+            with urlopen(req, timeout=self.timeout) as resp:
+                body = resp.read()
+                encoding = resp.headers.get("Content-Encoding", "")
+            if encoding == "gzip":
+                return gzip.decompress(body)
+            if encoding == "deflate":
+                return zlib.decompress(body)
+            return body
+        return self._with_retries(url, attempt)
+
+    def get_json(self, url):
+        return json.loads(self.get_bytes(url).decode("utf-8"))
+
+    # --- URLs ---
+    def submissions_url(self, name):
+        return f"{self.data_base_url}/submissions/{name}"
+
+    def filing_url(self, cik, accession, document):
+        acc_no_dash = accession.replace("-", "")
+        return f"{self.www_base_url}/Archives/edgar/data/{int(cik)}/{acc_no_dash}/{document}"
+
+    # --- Lookups ---
+    def get_cik(self, ticker_or_cik):
+        value = str(ticker_or_cik).strip().upper()
+        if value.isdigit():
+            return value.zfill(CIK_LENGTH)
+
+        with self._ticker_lock: # Threads share a single mapping download
+            if self._ticker_map is None:
+                data = self.get_json(f"{self.www_base_url}/files/company_tickers_exchange.json")
+                cik_idx = data["fields"].index("cik")
+                ticker_idx = data["fields"].index("ticker")
+                self._ticker_map = {
+                    str(row[ticker_idx]).upper(): str(row[cik_idx]).zfill(CIK_LENGTH)
+                    for row in data["data"]
+                }
+
+        cik = self._ticker_map.get(value)
+        if cik is None:
+            raise ValueError(f"Ticker {value!r} cannot be mapped to a CIK")
+        return cik
+
+    def list_filings(self, cik, forms, limit_per_form, include_amends=False):
+        """
+        Latest filings of the given forms from the submissions index, newest first.
+        Older pages are only requested while some form is still short of its limit.
+
+        Returns a list of dicts: accession, form, filing_date, report_date, primary_document.
+        """
+        forms = set(forms)
+        counts = dict.fromkeys(forms, 0)
+        filings = []
+
+        resp = self.get_json(self.submissions_url(f"CIK{cik}.json"))
+        page = resp["filings"]["recent"]
+        extra_pages = [f["name"] for f in resp["filings"].get("files", [])]
+
+        while True:
+            report_dates = page.get("reportDate") or [""] * len(page["accessionNumber"])
+            for acc, form, doc, f_date, r_date in zip(
+                page["accessionNumber"], page["form"], page["primaryDocument"], page["filingDate"], report_dates
+            ):
+                is_amend = form.endswith(AMENDS_SUFFIX)
+                base_form = form[:-len(AMENDS_SUFFIX)] if is_amend else form
+                if base_form not in forms or (is_amend and not include_amends):
+                    continue
+                if counts[base_form] >= limit_per_form:
+                    continue
+
+                counts[base_form] += 1
+                filings.append({
+                    'accession': acc,
+                    'form': base_form,
+                    'filing_date': f_date,
+                    'report_date': r_date,
+                    'primary_document': doc
+                })
+
+            if all(c >= limit_per_form for c in counts.values()) or not extra_pages:
+                break
+            page = self.get_json(self.submissions_url(extra_pages.pop(0)))
+
+        return filings
+
+    def remote_size(self, url):
+        """Content-Length from a HEAD request, or None if the server does not say."""
+        def attempt():
+            req = Request(url, method="HEAD", headers={"User-Agent": self.user_agent, "Accept-Encoding": "identity"})
+            with urlopen(req, timeout=self.timeout) as resp:
+                length = resp.headers.get("Content-Length")
+            return int(length) if length and length.isdigit() else None
+        return self._with_retries(url, attempt)
+
+    @staticmethod
+    def _range_total(headers):
+        # 416 responses carry "Content-Range: bytes */<total>"
+        value = (headers.get("Content-Range") or "") if headers else ""
+        total = value.rpartition("/")[2].strip()
+        return int(total) if total.isdigit() else None
+
+    def download(self, url, dest_path):
+        """
+        Downloads url to dest_path, resumable: bytes go to dest_path + '.part'
+        and a retry (or a later run) continues from its current size with a
+        Range request. The .part file is renamed once complete.
+        A 416 only counts as complete when the .part size equals the remote
+        size (Content-Range total, else HEAD); otherwise the .part is dropped
+        and the download starts over.
+        Returns the final file size.
+        """
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        part_path = f"{dest_path}.part"
+
+        def attempt():
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            # Byte ranges only make sense on the identity encoding
+            headers = {"User-Agent": self.user_agent, "Accept-Encoding": "identity"}
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+            try:
+                resp = urlopen(Request(url, headers=headers), timeout=self.timeout)
+            except HTTPError as e:
+                if e.code != 416 or not offset:
+                    raise
+                total = self._range_total(e.headers)
+                if total is None:
+                    total = self.remote_size(url)
+                if total == offset:
+                    return # Nothing left to fetch: the .part file is complete
+                # Stale / oversized .part (e.g. the document changed): start over
+                print(f"⚠️ [EDGAR] Partial file does not match remote size ({offset} vs {total}), restarting: {url}")
+                os.remove(part_path)
+                del headers["Range"]
+                self.rate_limiter.acquire()
+                resp = urlopen(Request(url, headers=headers), timeout=self.timeout)
+
+            with resp:
+                # 206 = server honoured the range; 200 = full body, start over
+                mode = "ab" if offset and resp.status == 206 else "wb"
+                with open(part_path, mode) as f:
+                    while True:
+                        chunk = resp.read(DOWNLOAD_CHUNK)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+
+        self._with_retries(url, attempt)
+        os.replace(part_path, dest_path)
+        return os.path.getsize(dest_path)
@@ -0,0 +1,106 @@
+import os
+import glob
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyarrow.dataset as ds
+
+FACT_SCHEMA = pa.schema([
+    ("cik", pa.string()),
+    ("accession", pa.string()),
+    ("form", pa.string()),
+    ("document_period_end", pa.string()),
+    ("concept", pa.string()),
+    ("context_ref", pa.string()),
+    ("period_start", pa.string()),
+    ("period_end", pa.string()),
+    ("instant", pa.bool_()),
+    ("has_segment", pa.bool_()),
+    ("unit", pa.string()),
+    ("scale", pa.int32()),
+    ("value", pa.float64()),
+])
+
+PARTITIONING = ds.partitioning(pa.schema([("ticker", pa.string()), ("fiscal_year", pa.int32())]), flavor="hive")
+
+class SEC_FactStore:
+    """
+    Columnar store of every numeric XBRL fact the parser sees.
+
+    Layout (Hive partitioned Parquet, readable by pyarrow / pandas / DuckDB):
+        {root}/ticker={TICKER}/fiscal_year={YYYY}/{accession}.parquet
+    One file per filing, so parallel parser workers never write the same file
+    and re-ingesting a filing simply replaces it.
+    """
+    def __init__(self, root=None):
+        if root is None:
+            current_script_folder = os.path.dirname(os.path.abspath(__file__))
+            root = os.path.join(current_script_folder, "sec_data", "fact_store")
+        self.root = root
+
+    @staticmethod
+    def filing_identity(path):
+        """(ticker, form, accession) from .../{ticker}/{form}/{accession}[/file]."""
+        folder = os.path.normpath(path if os.path.isdir(path) else os.path.dirname(path))
+        accession = os.path.basename(folder)
+        form_dir = os.path.dirname(folder)
+        return os.path.basename(os.path.dirname(form_dir)).upper(), os.path.basename(form_dir), accession
+
+    def _filing_path(self, ticker, fiscal_year, accession):
+        return os.path.join(self.root, f"ticker={ticker}", f"fiscal_year={fiscal_year}", f"{accession}.parquet")
+
+    def _stored_copies(self, ticker, accession):
+        pattern = os.path.join(glob.escape(self.root), f"ticker={glob.escape(ticker)}", "fiscal_year=*", f"{glob.escape(accession)}.parquet")
+        return glob.glob(pattern)
+
+    def has_filing(self, path):
+        ticker, _, accession = self.filing_identity(path)
+        return bool(self._stored_copies(ticker, accession))
+
+    def write_filing(self, path, fiscal_year, records):
+        """
+        Stores one filing's facts. records are dicts with FACT_SCHEMA columns;
+        accession (and form, when missing) come from the filing path.
+        """
+        ticker, form, accession = self.filing_identity(path)
+        rows = [dict(r, accession=accession, form=r.get('form') or form) for r in records]
+        table = pa.Table.from_pylist(rows, schema=FACT_SCHEMA)
+
+        dest = self._filing_path(ticker, fiscal_year, accession)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        # Dot-prefixed temp name: dataset scans ignore it until the rename
+        tmp_path = os.path.join(os.path.dirname(dest), f".{accession}.{os.getpid()}.tmp")
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, dest)
+
+        # The filing may have moved partition (fiscal year changed): drop stale copies
+        for old in self._stored_copies(ticker, accession):
+            if os.path.abspath(old) != os.path.abspath(dest):
+                os.remove(old)
+        return dest
+
+    def dataset(self):
+        return ds.dataset(self.root, format="parquet", partitioning=PARTITIONING)
+
+    def query(self, tickers=None, concepts=None, fiscal_years=None, columns=None, include_segments=False):
+        """
+        Loads facts as a DataFrame, pushing the filters down to the Parquet scan
+        (partition pruning on ticker / fiscal_year).
+        """
+        if not os.path.isdir(self.root):
+            return pa.Table.from_pylist([], schema=FACT_SCHEMA).to_pandas()
+
+        conditions = []
+        if tickers is not None:
+            conditions.append(ds.field("ticker").isin([t.upper() for t in tickers]))
+        if fiscal_years is not None:
+            conditions.append(ds.field("fiscal_year").isin([int(y) for y in fiscal_years]))
+        if concepts is not None:
+            conditions.append(ds.field("concept").isin(list(concepts)))
+        if not include_segments:
+            conditions.append(~ds.field("has_segment"))
+
+        expr = None
+        for cond in conditions:
+            expr = cond if expr is None else expr & cond
+
+        return self.dataset().to_table(columns=columns, filter=expr).to_pandas()
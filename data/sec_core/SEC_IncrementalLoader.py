@@ -0,0 +1,157 @@
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+MANIFEST_NAME = "manifest.json"
+PRIMARY_DOC_STEM = "primary-document"
+DOC_EXTENSIONS = (".xml", ".htm", ".html")
+# Enough threads to keep the shared 10 req/s bucket busy while others wait on I/O
+DEFAULT_DOWNLOAD_WORKERS = 8
+
+class SEC_IncrementalLoader:
+    """
+    Incremental filing ingestion.
+
+    Keeps a per-ticker accession manifest next to the filings
+    ({filings_root}/{ticker}/manifest.json). An accession from the EDGAR
+    submissions index is skipped when its manifest entry points at a file of
+    the recorded size; accessions missing from the manifest are skipped when a
+    document is already on disk (e.g. from sec-edgar-downloader) and recorded.
+    Files use the sec-edgar-downloader layout, so SEC_Parser / get_filing_paths
+    read them unchanged: {filings_root}/{ticker}/{form}/{accession}/primary-document.html
+    """
+    def __init__(self, client, filings_root):
+        self.client = client
+        self.filings_root = filings_root
+
+    def _manifest_path(self, ticker):
+        return os.path.join(self.filings_root, ticker, MANIFEST_NAME)
+
+    def load_manifest(self, ticker):
+        path = self._manifest_path(ticker)
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"⚠️ [Ingestion] Corrupt manifest for {ticker}, rebuilding: {e}")
+        return {'ticker': ticker, 'cik': None, 'accessions': {}}
+
+    def save_manifest(self, ticker, manifest):
+        path = self._manifest_path(ticker)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _filing_folder(self, ticker, form, accession):
+        return os.path.join(self.filings_root, ticker, form, accession)
+
+    def _is_recorded(self, entry):
+        """Manifest entry whose downloaded file is still there with the recorded size."""
+        if not entry or not entry.get('file') or entry.get('size') is None:
+            return False
+        path = os.path.join(self.filings_root, entry['file'])
+        return os.path.isfile(path) and os.path.getsize(path) == entry['size']
+
+    def _has_document(self, folder):
+        # Filings fetched earlier by sec-edgar-downloader count as present too
+        if not os.path.isdir(folder):
+            return False
+        return any(name.lower().endswith(DOC_EXTENSIONS) for name in os.listdir(folder))
+
+    def plan(self, ticker, forms=("10-K", "10-Q"), amount=4):
+        """
+        Reads the manifest and the submissions index for one ticker.
+        Returns (manifest, jobs); jobs are (filing, url, dest_path) still to download.
+        """
+        manifest = self.load_manifest(ticker)
+        known = manifest['accessions']
+
+        cik = manifest.get('cik') or self.client.get_cik(ticker)
+        manifest['cik'] = cik
+
+        jobs = []
+        for filing in self.client.list_filings(cik, forms, amount):
+            accession, form = filing['accession'], filing['form']
+            folder = self._filing_folder(ticker, form, accession)
+
+            entry = known.get(accession)
+            if self._is_recorded(entry):
+                continue
+            if (entry is None or entry.get('file') is None) and self._has_document(folder):
+                if entry is None:
+                    # On disk but not yet recorded (e.g. from sec-edgar-downloader)
+                    known[accession] = dict(filing, file=None, fetched_at=None)
+                continue
+
+            # Recorded file missing or truncated, or a new accession: (re)download
+            document = filing['primary_document'].rsplit("/", 1)[-1]
+            ext = os.path.splitext(document)[1].lower()
+            suffix = {".htm": ".html"}.get(ext, ext)
+            dest_path = os.path.join(folder, f"{PRIMARY_DOC_STEM}{suffix}")
+            jobs.append((filing, self.client.filing_url(cik, accession, document), dest_path))
+
+        return manifest, jobs
+
+    def _download(self, job):
+        filing, url, dest_path = job
+        size = self.client.download(url, dest_path)
+        return dict(filing, file=os.path.relpath(dest_path, self.filings_root), size=size, fetched_at=time.time())
+
+    def sync(self, ticker, forms=("10-K", "10-Q"), amount=4, max_workers=DEFAULT_DOWNLOAD_WORKERS):
+        """
+        Brings the latest `amount` filings per form on disk.
+        Returns the manifest entries downloaded in this call.
+        """
+        return self.sync_many([ticker], forms, amount, max_workers)[ticker.upper()]
+
+    def sync_many(self, tickers, forms=("10-K", "10-Q"), amount=4, max_workers=DEFAULT_DOWNLOAD_WORKERS):
+        """
+        Concurrent sync for a universe of tickers. Index lookups and document
+        downloads of all tickers share one thread pool; the process-wide token
+        bucket in SEC_EdgarClient keeps the total at the SEC rate limit.
+        Manifests are only touched from the calling thread.
+
+        Returns {ticker: [downloaded entries]}; tickers whose index lookup failed map to [].
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        fetched = {t: [] for t in tickers}
+        manifests = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            # 1. Submissions index per ticker
+            plan_futures = {pool.submit(self.plan, t, forms, amount): t for t in tickers}
+            download_futures = {}
+            for future in as_completed(plan_futures):
+                ticker = plan_futures[future]
+                try:
+                    manifest, jobs = future.result()
+                except Exception as e:
+                    print(f"❌ [Ingestion] {ticker} index lookup failed: {e}")
+                    continue
+                manifests[ticker] = manifest
+
+                # 2. Missing documents start downloading as soon as their ticker is planned
+                for job in jobs:
+                    download_futures[pool.submit(self._download, job)] = ticker
+
+            # 3. Record completed downloads
+            for future in as_completed(download_futures):
+                ticker = download_futures[future]
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    print(f"❌ [Ingestion] {ticker} download failed: {e}")
+                    continue
+                manifests[ticker]['accessions'][entry['accession']] = entry
+                fetched[ticker].append(entry)
+
+        for ticker, manifest in manifests.items():
+            manifest['last_sync'] = time.time()
+            self.save_manifest(ticker, manifest)
+            fetched[ticker].sort(key=lambda e: e['accession'])
+
+        return fetched
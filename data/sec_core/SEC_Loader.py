@@ -1,6 +1,8 @@
 import os
 import glob
 from sec_edgar_downloader import Downloader
+from data.sec_core.SEC_EdgarClient import SEC_EdgarClient
+from data.sec_core.SEC_IncrementalLoader import SEC_IncrementalLoader
 
 class SEC_Loader:
     def __init__(self, company_name, email_address):
@@ -8,9 +10,20 @@ class SEC_Loader:
         self.download_folder = os.path.join(current_script_folder, "sec_data")
         self.dl = Downloader(company_name, email_address, self.download_folder)
         self.base_dir = os.path.join(self.download_folder, "sec-edgar-filings")
+        # 增量下载: 只拉取 manifest / 磁盘上还没有的 accession
+        self.incremental_loader = SEC_IncrementalLoader(SEC_EdgarClient(company_name, email_address), self.base_dir)
 
-    def fetch_filings(self, ticker, amount=4): 
+    def fetch_filings(self, ticker, amount=4, incremental=False): 
         # amount 设为 4，确保能覆盖最近的一年
+        if incremental:
+            print(f"🚀 [Ingestion] Syncing 10-K and 10-Q stream for {ticker} (incremental)...")
+            try:
+                fetched = self.incremental_loader.sync(ticker, ["10-K", "10-Q"], amount)
+                print(f"✅ Sync complete: {len(fetched)} new filings.")
+            except Exception as e:
+                print(f"❌ Download failed: {e}")
+            return
+
         print(f"🚀 [Ingestion] Downloading 10-K and 10-Q stream for {ticker}...")
         try:
             # 同时下载两种格式
@@ -20,6 +33,16 @@ class SEC_Loader:
         except Exception as e:
             print(f"❌ Download failed: {e}")
 
+    def fetch_filings_many(self, tickers, amount=4):
+        """
+        并发增量下载整个股票池 (共享 10 req/s 的 SEC 限速)
+        """
+        print(f"🚀 [Ingestion] Syncing 10-K and 10-Q stream for {len(tickers)} tickers (concurrent)...")
+        fetched = self.incremental_loader.sync_many(tickers, ["10-K", "10-Q"], amount)
+        total = sum(len(v) for v in fetched.values())
+        print(f"✅ Sync complete: {total} new filings.")
+        return fetched
+
     def get_filing_paths(self, ticker, form_type):
         """
         [新功能] 获取所有下载的 Filing 文件夹路径
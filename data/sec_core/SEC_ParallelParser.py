@@ -0,0 +1,110 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from data.sec_core.SEC_Parser import SEC_Parser
+from data.sec_core.SEC_FactStore import SEC_FactStore
+
+# One long-lived SEC_Parser per worker process, created by the pool initializer
+_worker_parser = None
+
+def _init_worker(streaming, fact_store_root):
+    global _worker_parser
+    # Workers write their own per-filing fact files; the parse cache stays in the parent
+    fact_store = SEC_FactStore(fact_store_root) if fact_store_root else None
+    _worker_parser = SEC_Parser(streaming=streaming, fact_store=fact_store)
+
+def _parse_in_worker(path):
+    target_file = _worker_parser.resolve_target_file(path)
+    if not target_file:
+        return path, None, None
+    return path, target_file, _worker_parser.parse_target_file(target_file, source_path=path)
+
+def sort_history(records):
+    """
+    records: [(path, data), ...] -> data dicts sorted by 'Period End Date'
+    (newest first). Ties are broken by path, so the order does not depend on
+    listdir order or on which worker finished first.
+    """
+    ordered = sorted(records, key=lambda r: r[0])
+    ordered.sort(key=lambda r: r[1].get('Period End Date', '0000-00-00'), reverse=True)
+    return [data for _, data in ordered]
+
+class SEC_ParallelParser:
+    """
+    Parses many filing folders across a process pool (lxml parsing is CPU-bound).
+
+    The parent process owns the parse cache: hits are served here, only misses
+    are sent to the workers, and their results are written back here.
+    The pool is created on first use and reused until close().
+    """
+    def __init__(self, parser=None, max_workers=None, streaming=None):
+        self.parser = parser or SEC_Parser()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.streaming = self.parser.streaming if streaming is None else streaming
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.streaming, self.parser.fact_store.root if self.parser.fact_store else None)
+            )
+        return self._pool
+
+    def parse_filings(self, paths):
+        """Returns [(path, data), ...] in input order; data is None when parsing failed."""
+        results = {}
+        pending = []
+
+        for path in paths:
+            if path in results:
+                continue
+            hit, data = self.parser.cached_result(path)
+            if hit:
+                results[path] = data
+                continue
+            pending.append(path)
+
+        if pending:
+            if len(pending) == 1 or self.max_workers <= 1:
+                for path in pending:
+                    results[path] = self.parser.parse_single_filing(path)
+            else:
+                results.update(self._parse_parallel(pending))
+
+        return [(path, results[path]) for path in paths]
+
+    def _parse_parallel(self, pending):
+        results = {}
+        try:
+            outputs = list(self._get_pool().map(_parse_in_worker, pending))
+        except Exception as e:
+            # Broken pool (e.g. a worker was killed): finish serially
+            print(f"⚠️ [Parser] Process pool failed ({e}), parsing serially.")
+            self.close()
+            return {path: self.parser.parse_single_filing(path) for path in pending}
+
+        for path, target_file, data in outputs:
+            if not target_file:
+                print(f"⚠️ [Parser] No XML/HTML file found in: {path}")
+                results[path] = None
+                continue
+
+            results[path] = data
+            if self.parser.cache is not None:
+                try:
+                    self.parser.cache.put(path, target_file, self.parser.config_hash, data)
+                except Exception as e:
+                    print(f"⚠️ [Parser] Cache write failed for {path}: {e}")
+        return results
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
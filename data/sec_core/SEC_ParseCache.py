@@ -0,0 +1,124 @@
+import os
+import glob
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+# Documents SEC_Parser.resolve_target_file chooses from
+DOC_PATTERNS = ("*.xml", "*.htm", "*.html")
+# Filings that parsed to None may have failed transiently (read error, parser bug fixed since)
+NONE_RESULT_TTL = 6 * 3600
+
+class SEC_ParseCache:
+    """
+    Persistent cache of parse_single_filing results (SQLite).
+
+    Filings never change once filed, so a row stays valid as long as the
+    parsed file keeps its size / mtime, the folder still holds the same
+    documents (name / size / mtime of every XML / HTML file, since the parser
+    picks the largest one) and the metrics config hash matches.
+    Filings that parsed to None are cached for none_ttl seconds only, so they
+    are not retried on every run but are not given up on forever either.
+    """
+    def __init__(self, db_path=None, none_ttl=NONE_RESULT_TTL):
+        if db_path is None:
+            current_script_folder = os.path.dirname(os.path.abspath(__file__))
+            db_path = os.path.join(current_script_folder, "sec_data", "parse_cache.sqlite")
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self.db_path = db_path
+        self.none_ttl = none_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS parsed_filings (
+                    folder TEXT PRIMARY KEY,
+                    file_path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    config_hash TEXT NOT NULL,
+                    data TEXT,
+                    parsed_at REAL NOT NULL,
+                    listing TEXT
+                )
+            """)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(parsed_filings)")}
+            if 'listing' not in columns: # Older cache: its rows have no listing and get re-parsed
+                self._conn.execute("ALTER TABLE parsed_filings ADD COLUMN listing TEXT")
+
+    @staticmethod
+    def _key(folder):
+        return os.path.abspath(folder)
+
+    @staticmethod
+    def fingerprint(file_path):
+        st = os.stat(file_path)
+        return st.st_size, st.st_mtime
+
+    @staticmethod
+    def listing(folder):
+        """Hash of the candidate documents in a filing folder (or of a single file)."""
+        if os.path.isfile(folder):
+            files = [folder]
+        else:
+            files = set()
+            for pattern in DOC_PATTERNS:
+                files.update(glob.glob(os.path.join(folder, "**", pattern), recursive=True))
+        entries = []
+        for path in sorted(files):
+            st = os.stat(path)
+            entries.append([os.path.relpath(path, folder), st.st_size, st.st_mtime])
+        return hashlib.sha256(json.dumps(entries).encode('utf-8')).hexdigest()
+
+    def get(self, folder, config_hash):
+        """
+        Returns (hit, data). data is a fresh dict (or None for filings that
+        had nothing to extract), so callers may modify it.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_path, size, mtime, config_hash, data, listing, parsed_at FROM parsed_filings WHERE folder = ?",
+                (self._key(folder),)
+            ).fetchone()
+        if row is None:
+            return False, None
+
+        file_path, size, mtime, cached_hash, data, listing, parsed_at = row
+        if cached_hash != config_hash:
+            return False, None
+        if data is None and time.time() - parsed_at >= self.none_ttl: # Failed parse: retry after the TTL
+            return False, None
+        try:
+            if self.fingerprint(file_path) != (size, mtime):
+                return False, None
+            if listing != self.listing(folder): # A document was added / replaced since
+                return False, None
+        except OSError:
+            return False, None
+
+        return True, (json.loads(data) if data is not None else None)
+
+    def put(self, folder, file_path, config_hash, data):
+        size, mtime = self.fingerprint(file_path)
+        listing = self.listing(folder)
+        payload = json.dumps(data) if data is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parsed_filings "
+                "(folder, file_path, size, mtime, config_hash, data, parsed_at, listing) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._key(folder), os.path.abspath(file_path), size, mtime, config_hash, payload, time.time(), listing)
+            )
+
+    def invalidate(self, folder=None):
+        """Drops one filing, or the whole cache when folder is None."""
+        with self._lock, self._conn:
+            if folder is None:
+                self._conn.execute("DELETE FROM parsed_filings")
+            else:
+                self._conn.execute("DELETE FROM parsed_filings WHERE folder = ?", (self._key(folder),))
+
+    def close(self):
+        self._conn.close()
@@ -2,11 +2,45 @@ import os
 import glob
 import re
 import json
+import hashlib
+from functools import lru_cache
 from lxml import etree
 from dateutil import parser as date_parser
 
+# Bump when extraction logic changes, so cached parse results are invalidated
+PARSER_VERSION = 2
+
+# iXBRL 事实标签 (概念名在 name 属性里, 例如 name="us-gaap:Revenues")
+IX_FACT_TAGS = {'nonFraction', 'nonNumeric'}
+# Text facts the parser reads; other text blocks are skipped while indexing
+TEXT_CONCEPTS = {'DocumentPeriodEndDate', 'DocumentType', 'DocumentFiscalYearFocus', 'EntityCentralIndexKey'}
+
+# Context period children that carry a date
+PERIOD_DATE_TAGS = {'startDate', 'endDate', 'instant'}
+ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+def _local_name(tag):
+    # '{ns}Revenues' / 'us-gaap:Revenues' -> 'Revenues'
+    return tag.rsplit('}', 1)[-1].rsplit(':', 1)[-1]
+
+@lru_cache(maxsize=4096)
+def _iso_date(raw_date):
+    # 绝大多数 context 日期已是 YYYY-MM-DD, 且同一 filing 里只有少数几个不同日期
+    if ISO_DATE_RE.fullmatch(raw_date):
+        return raw_date
+    try:
+        return date_parser.parse(raw_date).strftime("%Y-%m-%d")
+    except:
+        return raw_date
+
 class SEC_Parser:
-    def __init__(self):
+    def __init__(self, streaming=False, cache=None, fact_store=None):
+        # streaming=True: iterparse + 及时清理节点, 内存只和 fact 数量相关, 与文档大小无关
+        self.streaming = streaming
+        # cache: 可选 SEC_ParseCache, 未变化的 filing 直接读缓存
+        self.cache = cache
+        # fact_store: 可选 SEC_FactStore, 解析时顺便落盘所有数值 fact
+        self.fact_store = fact_store
         config_path = os.path.join(os.path.dirname(__file__), 'metrics_config.json')
         try:
             with open(config_path, 'r') as f:
@@ -15,58 +49,92 @@ class SEC_Parser:
             print(f"⚠️ Failed to load metrics config: {e}")
             self.metrics_map = {}
 
-    def parse_single_filing(self, path_input):
-        target_file = None
+        config_blob = json.dumps({'version': PARSER_VERSION, 'metrics': self.metrics_map}, sort_keys=True)
+        self.config_hash = hashlib.sha256(config_blob.encode('utf-8')).hexdigest()
 
-        # 1. 智能路径搜索
+    def resolve_target_file(self, path_input):
+        """智能路径搜索: 文件直接返回; 文件夹则取其中最大的 XML/HTML 文件"""
         if os.path.isfile(path_input):
-            target_file = path_input
-        else:
-            target_extensions = ["*.xml", "*.htm", "*.html"]
-            files = []
-            for ext in target_extensions:
-                files.extend(glob.glob(os.path.join(path_input, "**", ext), recursive=True))
-            if files:
-                target_file = max(files, key=os.path.getsize)
+            return path_input
+
+        target_extensions = ["*.xml", "*.htm", "*.html"]
+        files = []
+        for ext in target_extensions:
+            files.extend(glob.glob(os.path.join(path_input, "**", ext), recursive=True))
+        if files:
+            return max(files, key=os.path.getsize)
+        return None
+
+    def cached_result(self, path_input):
+        """
+        Returns (hit, data) from the parse cache. A hit whose facts are missing
+        from the fact store counts as a miss, so the filing gets re-parsed once.
+        """
+        if self.cache is None:
+            return False, None
+        hit, data = self.cache.get(path_input, self.config_hash)
+        if hit and data is not None and self.fact_store is not None and not self.fact_store.has_filing(path_input):
+            return False, None
+        return hit, data
 
+    def parse_single_filing(self, path_input):
+        # 0. 缓存命中: 文件未变 & 配置未变
+        hit, data = self.cached_result(path_input)
+        if hit:
+            return data
+
+        # 1. 智能路径搜索
+        target_file = self.resolve_target_file(path_input)
         if not target_file:
             print(f"⚠️ [Parser] No XML/HTML file found in: {path_input}")
             return None
-        
+
+        data = self.parse_target_file(target_file, source_path=path_input)
+
+        if self.cache is not None:
+            try:
+                self.cache.put(path_input, target_file, self.config_hash, data)
+            except Exception as e:
+                print(f"⚠️ [Parser] Cache write failed for {path_input}: {e}")
+        return data
+
+    def parse_target_file(self, target_file, source_path=None):
         extracted_data = {'Source': 'Unknown', 'File': os.path.basename(target_file)}
         
         try:
-            # recover=True 核心：容忍 HTML 语法错误
-            parser = etree.XMLParser(recover=True)
-            tree = etree.parse(target_file, parser)
-            root = tree.getroot()
-            
-            # 2. 解析 Contexts (使用 .xpath 替代 findall)
-            contexts = self._parse_contexts(root)
+            # 2. 单次遍历: 同时收集 Contexts / Units / Facts 索引
+            if self.streaming:
+                contexts, units, facts = self._index_stream(target_file)
+            else:
+                # recover=True 核心：容忍 HTML 语法错误
+                parser = etree.XMLParser(recover=True)
+                tree = etree.parse(target_file, parser)
+                contexts, units, facts = self._index_document(tree.getroot())
             
-            raw_date = self._get_document_period_end_date(root) # 先拿原始数据
+            raw_date = self._get_fact_text(facts, "DocumentPeriodEndDate") # 先拿原始数据
             
             # [新增] 强制日期标准化逻辑
             if raw_date:
-                try:
-                    dt = date_parser.parse(raw_date)
-                    extracted_data['Period End Date'] = dt.strftime("%Y-%m-%d") # 转为 2023-09-30
-                except:
-                    extracted_data['Period End Date'] = raw_date # 兜底
+                extracted_data['Period End Date'] = _iso_date(raw_date) # 转为 2023-09-30, 失败则保留原值
             else:
                 return None # 如果没日期，直接丢弃
 
             target_date = extracted_data['Period End Date']
+            # 期末 = 报告期末、且无 segment 的 context id 集合
+            target_contexts = self.context_table(contexts).get(target_date, frozenset())
 
-            # 4. 提取数据
+            # 4. 提取数据 (纯字典查找)
             for metric_name, tags in self.metrics_map.items():
-                val = self._extract_value(root, tags, contexts, target_date)
+                val = self._extract_value(facts, tags, target_contexts)
                 extracted_data[metric_name] = val
 
             # Document Type
-            doc_type = self._get_text_safe(root, "DocumentType")
+            doc_type = self._get_fact_text(facts, "DocumentType")
             if doc_type:
                 extracted_data['Source'] = doc_type
+
+            if self.fact_store is not None:
+                self._store_facts(source_path or target_file, extracted_data, contexts, units, facts)
             
             return extracted_data
 
@@ -74,117 +142,273 @@ class SEC_Parser:
             print(f"❌ [Parser] Critical Error in {os.path.basename(target_file)}: {e}")
             return None
 
-    def _parse_contexts(self, root):
-        contexts = {}
-        # 🔥 FIX: 使用 .xpath 支持 local-name()
-        # 查找所有 local-name 为 'context' 的节点
-        context_nodes = root.xpath(".//*[local-name()='context']")
-        
-        for context in context_nodes:
-            c_id = context.get("id")
-            if not c_id: continue
+    def _store_facts(self, path, extracted_data, contexts, units, facts):
+        # 财年: 优先 dei:DocumentFiscalYearFocus, 否则用报告期末的年份
+        fiscal_year = self._get_fact_text(facts, "DocumentFiscalYearFocus")
+        try:
+            fiscal_year = int(fiscal_year)
+        except (TypeError, ValueError):
+            fiscal_year = int(extracted_data['Period End Date'][:4])
 
-            info = {'has_segment': False}
-            
-            # 检查 Segment (使用 xpath 检查是否存在)
-            # xpath 返回的是 list，非空即为 True
-            segment_check = context.xpath(".//*[local-name()='entity']//*[local-name()='segment']")
-            if segment_check:
-                info['has_segment'] = True
-            
-            # 解析日期
-            # 1. Duration (Start/End)
-            start_node = context.xpath(".//*[local-name()='period']//*[local-name()='startDate']")
-            end_node = context.xpath(".//*[local-name()='period']//*[local-name()='endDate']")
-            
-            # 2. Instant (Instant)
-            instant_node = context.xpath(".//*[local-name()='period']//*[local-name()='instant']")
-            
-            raw_end_date = None
-            if start_node and end_node:
-                raw_end_date = self._get_node_text(end_node[0])
-            elif instant_node:
-                raw_end_date = self._get_node_text(instant_node[0])
-            
-            # [新增] Context 日期也必须转为 ISO 格式
-            if raw_end_date:
+        cik = self._get_fact_text(facts, "EntityCentralIndexKey")
+        form = extracted_data['Source'] if extracted_data['Source'] != 'Unknown' else None
+        records = self.fact_records(contexts, units, facts)
+        for r in records:
+            r.update(cik=cik, form=form, document_period_end=extracted_data['Period End Date'])
+
+        try:
+            self.fact_store.write_filing(path, fiscal_year, records)
+        except Exception as e:
+            print(f"⚠️ [Parser] Fact store write failed for {os.path.basename(path)}: {e}")
+
+    def fact_records(self, contexts, units, facts):
+        """Flattens every numeric fact of the index into one row per fact."""
+        records = []
+        for concept, fact_list in facts.items():
+            for fact in fact_list:
+                if not fact['numeric']: continue
+                value = self._fact_value(fact)
+                if value is None: continue
+
+                ctx = contexts.get(fact['contextRef'], {})
                 try:
-                    info['end'] = date_parser.parse(raw_end_date).strftime("%Y-%m-%d")
-                except:
-                    info['end'] = raw_end_date
-            
-            contexts[c_id] = info
-        return contexts
-
-    def _get_document_period_end_date(self, root):
-        # 策略 A: 纯 XML
-        nodes = root.xpath(".//*[local-name()='DocumentPeriodEndDate']")
-        if nodes: return self._get_node_text(nodes[0])
-
-        # 策略 B: iXBRL (HTML)
-        # 查找 name 属性包含 'DocumentPeriodEndDate' 的 nonNumeric 标签
-        nodes_ix = root.xpath(".//*[local-name()='nonNumeric'][contains(@name, 'DocumentPeriodEndDate')]")
-        if nodes_ix: return self._get_node_text(nodes_ix[0])
-            
+                    scale = int(fact['scale']) if fact['scale'] else None
+                except ValueError:
+                    scale = None
+
+                records.append({
+                    'concept': concept,
+                    'context_ref': fact['contextRef'],
+                    'period_start': ctx.get('start'),
+                    'period_end': ctx.get('end'),
+                    'instant': ctx.get('instant', False),
+                    'has_segment': ctx.get('has_segment', False),
+                    'unit': units.get(fact['unitRef'], fact['unitRef']),
+                    'scale': scale,
+                    'value': value
+                })
+        return records
+
+    def _index_document(self, root):
+        """
+        Walks the tree once and returns (contexts, units, facts).
+
+        facts: {concept local name: [fact, ...]} in document order. A fact is a dict
+        with 'contextRef', 'unitRef', 'scale', 'sign', 'text' and 'ix' (the iXBRL tag,
+        'nonFraction' / 'nonNumeric', or None for plain XBRL elements).
+        iXBRL facts are keyed by their name attribute without the prefix.
+        """
+        contexts, units, facts = {}, {}, {}
+
+        for node in root.iter():
+            tag = node.tag
+            if not isinstance(tag, str): continue # Comments / PIs
+            self._index_node(node, _local_name(tag), contexts, units, facts)
+
+        return contexts, units, facts
+
+    def _index_stream(self, target_file):
+        """
+        Streaming version of _index_document (same return value).
+
+        Elements are handled on their 'end' event and cleared right away, together
+        with their already-processed previous siblings. Clearing is suspended while a
+        context, unit or kept fact is still open, since its text and children are
+        read when it closes.
+        """
+        contexts, units, facts = {}, {}, {}
+        open_nodes = 0
+
+        events = etree.iterparse(target_file, events=('start', 'end'), recover=True, huge_tree=True)
+        for event, node in events:
+            tag = node.tag
+            if not isinstance(tag, str): continue
+            local = _local_name(tag)
+
+            if event == 'start':
+                if self._needs_subtree(node, local):
+                    open_nodes += 1
+                continue
+
+            if self._needs_subtree(node, local):
+                open_nodes -= 1
+            self._index_node(node, local, contexts, units, facts)
+
+            if open_nodes == 0:
+                node.clear(keep_tail=False)
+                parent = node.getparent()
+                if parent is not None:
+                    while node.getprevious() is not None:
+                        del parent[0]
+
+        return contexts, units, facts
+
+    def _needs_subtree(self, node, local):
+        if local in ('context', 'unit'):
+            return True
+        if not node.get("contextRef"):
+            return False
+        concept = _local_name(node.get("name") or "") if local in IX_FACT_TAGS else local
+        return self._is_numeric(node, local) or concept in TEXT_CONCEPTS
+
+    def _index_node(self, node, local, contexts, units, facts):
+        if local == 'context':
+            c_id = node.get("id")
+            if c_id:
+                contexts[c_id] = self._parse_context(node)
+            return
+
+        if local == 'unit':
+            u_id = node.get("id")
+            if u_id:
+                units[u_id] = self._parse_unit(node)
+            return
+
+        context_ref = node.get("contextRef")
+        if not context_ref: return
+
+        if local in IX_FACT_TAGS:
+            name = node.get("name")
+            if not name: return
+            concept, ix = _local_name(name), local
+        else:
+            concept, ix = local, None
+
+        fact = self._make_fact(node, concept, ix, context_ref)
+        if fact is not None:
+            facts.setdefault(concept, []).append(fact)
+
+    def _is_numeric(self, node, local):
+        # iXBRL: nonFraction; 纯 XBRL: 带 unitRef 的 item
+        if local in IX_FACT_TAGS:
+            return local == 'nonFraction'
+        return node.get("unitRef") is not None
+
+    def _make_fact(self, node, concept, ix, context_ref):
+        # Text facts (nonNumeric / XBRL items without unit) can be whole HTML blocks:
+        # only keep the handful the parser actually reads
+        numeric = self._is_numeric(node, ix or concept)
+        if not numeric and concept not in TEXT_CONCEPTS:
+            return None
+
+        return {
+            'contextRef': context_ref,
+            'unitRef': node.get("unitRef"),
+            'scale': node.get("scale"),
+            'sign': node.get("sign"),
+            'text': self._get_node_text(node),
+            'ix': ix,
+            'numeric': numeric
+        }
+
+    def _parse_context(self, context):
+        """
+        Reads a <context> by walking its children directly (entity / period)
+        instead of evaluating XPath expressions per context.
+        """
+        info = {'has_segment': False, 'instant': False}
+        dates = {}
+
+        for child in context:
+            if not isinstance(child.tag, str): continue
+            local = _local_name(child.tag)
+            if local == 'entity':
+                # Segment (维度) 可能嵌套在 entity 的任意层级
+                info['has_segment'] = any(
+                    isinstance(n.tag, str) and _local_name(n.tag) == 'segment' for n in child.iterdescendants()
+                )
+            elif local == 'period':
+                for n in child.iterdescendants():
+                    if not isinstance(n.tag, str): continue
+                    name = _local_name(n.tag)
+                    if name in PERIOD_DATE_TAGS and name not in dates:
+                        dates[name] = n
+
+        # 1. Duration (Start/End)  2. Instant
+        raw_end_date = None
+        if 'startDate' in dates and 'endDate' in dates:
+            raw_end_date = self._get_node_text(dates['endDate'])
+            info['start'] = self._iso_date(self._get_node_text(dates['startDate']))
+        elif 'instant' in dates:
+            raw_end_date = self._get_node_text(dates['instant'])
+            info['instant'] = True
+
+        # Context 日期也必须转为 ISO 格式
+        if raw_end_date:
+            info['end'] = self._iso_date(raw_end_date)
+
+        return info
+
+    def _iso_date(self, raw_date):
+        return _iso_date(raw_date)
+
+    def context_table(self, contexts):
+        """
+        Compact lookup table: end date -> frozenset of context ids without segment.
+        Lets the metric lookups filter facts by period with one set membership test.
+        """
+        table = {}
+        for c_id, ctx in contexts.items():
+            if ctx['has_segment'] or not ctx.get('end'): continue
+            table.setdefault(ctx['end'], set()).add(c_id)
+        return {end: frozenset(ids) for end, ids in table.items()}
+
+    def _parse_unit(self, unit):
+        # 'iso4217:USD', 或 divide 单位 'iso4217:USD/xbrli:shares'
+        numerator = unit.xpath(".//*[local-name()='unitNumerator']//*[local-name()='measure']")
+        if numerator:
+            denominator = unit.xpath(".//*[local-name()='unitDenominator']//*[local-name()='measure']")
+            return "*".join(self._get_node_text(m) for m in numerator) + "/" + \
+                "*".join(self._get_node_text(m) for m in denominator)
+        measures = unit.xpath(".//*[local-name()='measure']")
+        return "*".join(self._get_node_text(m) for m in measures)
+
+    def _ordered(self, facts, concept):
+        # 与旧逻辑一致: 纯 XML 节点优先于 iXBRL 节点 (stable sort 保留文档顺序)
+        return sorted(facts.get(concept, ()), key=lambda f: f['ix'] is not None)
+
+    def _get_fact_text(self, facts, name):
+        for fact in self._ordered(facts, name):
+            if fact['ix'] == 'nonFraction': continue
+            return fact['text']
         return None
 
-    def _extract_value(self, root, tag_list, contexts, target_date):
-        candidate_nodes = []
-        
-        # 1. 查找所有可能的节点
+    def _extract_value(self, facts, tag_list, target_contexts):
+        # 1. 按 tag 优先级取候选 fact (字典命中，无需扫描整棵树)
         for tag in tag_list:
-            # XML: 直接匹配 tag
-            xml_hits = root.xpath(f".//*[local-name()='{tag}']")
-            candidate_nodes.extend(xml_hits)
-            
-            # iXBRL: 匹配 name 属性包含 tag 的 nonFraction
-            # 使用 xpath 的 contains 函数，非常高效
-            ix_hits = root.xpath(f".//*[local-name()='nonFraction'][contains(@name, '{tag}')]")
-            candidate_nodes.extend(ix_hits)
-
-        # 2. 遍历筛选
-        for node in candidate_nodes:
-            context_ref = node.get("contextRef")
-            if not context_ref or context_ref not in contexts: continue
-            
-            ctx = contexts[context_ref]
-            if ctx['has_segment']: continue
-            
-            if ctx.get('end') == target_date:
-                raw_text = self._get_node_text(node)
-                if not raw_text: continue
+            for fact in self._ordered(facts, tag):
+                if not fact['numeric']: continue
 
-                try:
-                    clean_val = re.sub(r'[^\d.-]', '', raw_text)
-                    if not clean_val: continue
-                    value = float(clean_val)
-
-                    # Scale & Sign 处理
-                    scale = node.get("scale")
-                    if scale:
-                        try:
-                            value = value * (10 ** int(scale))
-                        except: pass
-                    
-                    sign = node.get("sign")
-                    if sign == "-":
-                        value = value * -1
-                        
+                # 2. 筛选: 一次集合查找代替逐个检查 context
+                if fact['contextRef'] not in target_contexts: continue
+
+                value = self._fact_value(fact)
+                if value is not None:
                     return value
-                except:
-                    continue
         return 0.0
 
-    def _get_text_safe(self, root, name):
-        # XML
-        nodes = root.xpath(f".//*[local-name()='{name}']")
-        if nodes: return self._get_node_text(nodes[0])
-        
-        # iXBRL
-        nodes_ix = root.xpath(f".//*[local-name()='nonNumeric'][contains(@name, '{name}')]")
-        if nodes_ix: return self._get_node_text(nodes_ix[0])
+    def _fact_value(self, fact):
+        raw_text = fact['text']
+        if not raw_text: return None
+
+        try:
+            clean_val = re.sub(r'[^\d.-]', '', raw_text)
+            if not clean_val: return None
+            value = float(clean_val)
+        except:
+            return None
+
+        # Scale & Sign 处理
+        scale = fact['scale']
+        if scale:
+            try:
+                value = value * (10 ** int(scale))
+            except: pass
         
-        return None
+        if fact['sign'] == "-":
+            value = value * -1
+            
+        return value
 
     def _get_node_text(self, node):
         if node is None: return None
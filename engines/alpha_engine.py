@@ -1,5 +1,13 @@
+import numpy as np
 import pandas as pd
 
+# 流量指标 (Flows): 按期间累计, 需要倒推 Q4 / 计算 TTM; 其余字段为存量 (Stocks)
+FLOW_METRICS = ['Revenue', 'COGS', 'Operating Income', 'Net Income', 'Operating Cash Flow', 'CapEx', 'Buybacks', 'Dividends']
+STOCK_METRICS = ['R&D', 'Stockholders Equity', 'Cash', 'Long Term Debt', 'Short Term Debt']
+
+# 三个季度 ≈ 273 天; 允许财报日历 (52/53 周) 的偏差
+THREE_QUARTERS_DAYS = (250, 300)
+
 class Alpha_Engine:
     @staticmethod
     def derive_q4_metrics(filings_list):
@@ -21,9 +29,7 @@ class Alpha_Engine:
         q4_derived['Source'] = '10-Q (Derived)'
         q4_derived['Source Type'] = '10-Q'
         
-        flow_metrics = ['Revenue', 'COGS', 'Operating Income', 'Net Income', 'Operating Cash Flow', 'CapEx', 'Buybacks', 'Dividends']
-        
-        for m in flow_metrics:
+        for m in FLOW_METRICS:
             val_10k = latest.get(m, 0)
             
             # 1. 尝试“离散扣减法” (Discrete Subtraction)
@@ -53,65 +59,170 @@ class Alpha_Engine:
         return q4_derived
 
     @staticmethod
-    def process_time_series(ticker, fundamentals_list, market_data):
+    def build_panel(fundamentals_list):
+        """
+        [面板] 把全部 filing 历史转成按 Period End Date 升序的 DataFrame.
+
+        每个 10-K 与其之前的 3 个 10-Q 组成一个完整财年; 对每个财年、每个流量指标
+        分别判断口径 (单季 vs YTD 累积, 与 derive_q4_metrics 相同的判定;
+        最后一个 10-K 之后的未结束财年沿用上一财年的口径), 然后:
+          - '{m} (Q)':   单季数值 (YTD 做差分, 10-K 行即倒推出的 Q4)
+          - '{m} (TTM)': 连续 4 个单季之和; 10-K 行直接用年报数值
+        其它列: Source, Fiscal Year, Fiscal Quarter, 原始报告值及存量指标.
+        panel.attrs['ytd'] = {metric: [按 YTD 口径报告的财年, ...]}
+        """
+        if not fundamentals_list: return None
+
+        df = pd.DataFrame(fundamentals_list)
+        df['Period End Date'] = pd.to_datetime(df['Period End Date'], errors='coerce')
+        df = df.dropna(subset=['Period End Date'])
+        # 同一期末出现多份 filing 时保留列表里靠前的那份 (最新下载 / 优先级更高)
+        df = df.drop_duplicates(subset='Period End Date', keep='first')
+        df = df.sort_values('Period End Date').set_index('Period End Date')
+
+        for m in FLOW_METRICS + STOCK_METRICS:
+            df[m] = pd.to_numeric(df[m], errors='coerce').fillna(0.0) if m in df else 0.0
+
+        dates = df.index.to_series()
+        is_k = df['Source'] == '10-K'
+
+        # 1. 财年分组: 每个 10-K 结束一组; 财年 = 该 10-K 期末的年份
+        group = is_k.astype(int).cumsum().shift(fill_value=0)
+        k_dates = dates.where(is_k)
+        k_year = k_dates.dt.year
+        df['Fiscal Year'] = k_year.bfill().fillna(k_year.ffill() + 1)
+
+        # 季度序号按距离上一个 (或下一个) 10-K 的天数推算, 缺失的季度不会打乱编号
+        since_prev = (dates - k_dates.ffill().shift()).dt.days / 91.3
+        until_next = (k_dates.bfill() - dates).dt.days / 91.3
+        quarter = since_prev.round().fillna(4 - until_next.round())
+        df['Fiscal Quarter'] = quarter.where(~is_k, 4).clip(1, 4)
+
+        # 完整财年: 恰好 Q1, Q2, Q3 + 10-K, 且 Q1 -> 10-K 相隔约三个季度
+        by_year = dates.groupby(group)
+        span = (dates - by_year.transform('first')).dt.days
+        has_k = is_k.groupby(group).transform('any')
+        complete = (
+            (by_year.transform('size') == 4)
+            & has_k
+            & span.where(is_k).groupby(group).transform('max').between(*THREE_QUARTERS_DAYS)
+        )
+
+        # TTM 窗口必须是连续 4 个季度
+        window_ok = (dates - dates.shift(3)).dt.days.between(*THREE_QUARTERS_DAYS)
+        ytd_years = {}
+
+        for m in FLOW_METRICS:
+            v = df[m]
+            g = v.groupby(group)
+            discrete_q4 = v - (g.cumsum() - v)  # 离散法: 10-K - (Q1 + Q2 + Q3)
+            ytd_q = g.diff().fillna(v)          # 累积法: 逐期差分 (10-K 行 = 10-K - Q3 YTD)
+
+            # 口径判定 (按财年, 与 derive_q4_metrics 一致): 10-K 为正但离散法倒推出负数 -> YTD
+            is_ytd = (is_k & (v > 0) & (discrete_q4 < 0)).groupby(group).transform('any') & complete
+
+            # 未结束的财年 (最后一个 10-K 之后的 10-Q) 没有年报可判定: 沿用上一个完整财年的口径;
+            # 之前没有完整财年时, 看数值是否单调累积 (|Q1| < |Q2| < |Q3|)
+            prior = is_ytd.where(complete).groupby(group).first().astype(float).ffill()
+            rising = (v.abs().groupby(group).diff().fillna(1) > 0).groupby(group).transform('all') \
+                & (g.transform('size') > 1)
+            open_ytd = group.map(prior).fillna(rising.astype(float)).astype(bool)
+            is_ytd = is_ytd | (~has_k & open_ytd)
+
+            quarterly = v.where(~is_k, discrete_q4).where(~is_ytd, ytd_q)
+            # 不完整财年里的 10-K 无法拆出 Q4
+            quarterly = quarterly.where(complete | ~is_k)
+            df[f'{m} (Q)'] = quarterly
+
+            ttm = quarterly.rolling(4, min_periods=4).sum().where(window_ok)
+            df[f'{m} (TTM)'] = ttm.where(~is_k, v)
+
+            ytd_years[m] = sorted(int(y) for y in df.loc[is_ytd & is_k, 'Fiscal Year'])
+
+        df.attrs['ytd'] = ytd_years
+        return df
+
+    @staticmethod
+    def cagr_series(panel, metric='Revenue', years=3):
+        """
+        每一行相对 `years` 年前的 TTM 复合增长率 (merge_asof 对齐最近的更早期末).
+        起点缺失或非正时为 NaN.
+        """
+        col = f'{metric} (TTM)'
+        ttm = panel[[col]].dropna().reset_index()
+        if ttm.empty:
+            return pd.Series(np.nan, index=panel.index)
+
+        lookup = ttm.rename(columns={'Period End Date': 'Base Date', col: 'Base'})
+        ttm['Target Date'] = ttm['Period End Date'] - pd.DateOffset(years=years)
+        merged = pd.merge_asof(
+            ttm.sort_values('Target Date'), lookup.sort_values('Base Date'),
+            left_on='Target Date', right_on='Base Date', direction='nearest', tolerance=pd.Timedelta(days=45)
+        ).set_index('Period End Date').sort_index()
+
+        valid = (merged['Base'] > 0) & (merged[col] > 0)
+        growth = np.power(merged[col].where(valid) / merged['Base'].where(valid), 1.0 / years) - 1
+        return growth.reindex(panel.index)
+
+    @staticmethod
+    def cagr(panel, metric='Revenue', years=3):
+        """最新一期的 N 年 TTM CAGR (无法计算时为 NaN)"""
+        if panel is None or panel.empty: return np.nan
+        return float(Alpha_Engine.cagr_series(panel, metric, years).iloc[-1])
+
+    @staticmethod
+    def process_time_series(ticker, fundamentals_list, market_data, panel=None):
         """
         [新增] 时间序列引擎：提取过去 N 个季度的核心指标走势
+        数据来自 build_panel: 毛利率用单季数值, FCF 用 TTM (缺失时回退到年化的单季 / 年报数值)
         """
         if not fundamentals_list: return None
         
-        history_data = []
         current_mkt_cap = market_data['Market Cap']
         
         print(f"📉 Building historical trend for {ticker} over {len(fundamentals_list)} filings...")
 
-        for filing in fundamentals_list:
-            try:
-                # 1. 确定年化系数 (10-K vs 10-Q)
-                # 注意：这里我们做简化处理，直接用 Filing 的类型来决定 Run Rate
-                # 这样可以在不进行复杂的 Q4 倒推情况下，快速画出趋势线
-                source = filing.get('Source', '10-Q')
-                af = 1.0 if '10-K' in source else 4.0
-                
-                # 2. 提取并年化核心数据
-                rev = filing.get('Revenue', 0) * af
-                cogs = filing.get('COGS', 0) * af
-                ocf = filing.get('Operating Cash Flow', 0) * af
-                capex = filing.get('CapEx', 0) * af
-                
-                # 3. 计算比率
-                if rev == 0: continue
-                
-                gross_margin = (rev - cogs) / rev
-                fcf = ocf - capex
-                
-                # FCF Yield (使用当前市值做分母，观察“盈利能力变化”对当前估值的贡献)
-                # 这回答了：如果是以前的盈利能力，现在的股价算便宜吗？
-                fcf_yield = fcf / current_mkt_cap if current_mkt_cap else 0
-                
-                history_data.append({
-                    'Date': filing.get('Period End Date'),
-                    'Source': source,
-                    'Gross Margin': gross_margin,
-                    'FCF Yield': fcf_yield
-                })
-                
-            except Exception as e:
-                continue
-                
-        # 转为 DataFrame
-        df = pd.DataFrame(history_data)
-        return df
+        if panel is None:
+            panel = Alpha_Engine.build_panel(fundamentals_list)
+        if panel is None or panel.empty:
+            return pd.DataFrame()
+
+        is_k = panel['Source'].astype(str).str.contains('10-K')
+        af = np.where(is_k, 1.0, 4.0)
+
+        def flow(m):
+            # 单季值缺失 (不完整财年的 10-K) 时用报告值
+            return panel[f'{m} (Q)'].fillna(panel[m])
+
+        def annual(m):
+            # TTM 优先, 否则按报告类型年化
+            return panel[f'{m} (TTM)'].fillna(flow(m) * np.where(panel[f'{m} (Q)'].isna(), 1.0, af))
+
+        rev_q = flow('Revenue')
+        gross_margin = (rev_q - flow('COGS')) / rev_q.replace(0, np.nan)
+        fcf = annual('Operating Cash Flow') - annual('CapEx')
+        fcf_yield = fcf / current_mkt_cap if current_mkt_cap else fcf * 0.0
+
+        # 与旧版一致: 新的在前, 跳过没有收入的期间
+        df = pd.DataFrame({
+            'Date': panel.index.strftime('%Y-%m-%d'),
+            'Source': panel['Source'].to_numpy(),
+            'Gross Margin': gross_margin.to_numpy(),
+            'FCF Yield': fcf_yield.to_numpy()
+        })
+        df = df[rev_q.to_numpy() != 0].dropna(subset=['Gross Margin'])
+        return df.iloc[::-1].reset_index(drop=True)
 
     @staticmethod
-    def process_analysis(ticker, fundamentals_list, market_data):
-        if not fundamentals_list: return None
-        
+    def normalize_latest(fundamentals_list):
+        """
+        --- 智能路由与数据归一化 (Normalization) ---
+        目标：无论输入是什么，最终都把 curr 变成“单季度量级”
+        Returns (curr, prev, af): 当前期, 对比期 (可能为 None), 年化系数
+        """
         curr = fundamentals_list[0]
         prev = None 
         
-        # --- 1. 智能路由与数据归一化 (Normalization) ---
-        # 目标：无论输入是什么，最终都把 curr 变成“单季度量级”
-        
         # 情况 A: 最新的是 10-K -> 尝试倒推 Q4
         is_derived_q4 = False
         if curr.get('Source') == '10-K':
@@ -136,13 +247,21 @@ class Alpha_Engine:
             if len(fundamentals_list) > 1:
                 prev = fundamentals_list[1]
                 print(f"🔎 Analyzing Q{curr.get('Source')} vs Previous Quarter")
-    
-        # --- 2. 统一计算逻辑 ---
-        
+
         # 关键点：确定年化系数 (AF)
         # 如果是 Derived Q4 或者 原生 10-Q，系数都是 4.0
         # 只有在倒推失败回退到年报(10-K)模式时，系数才是 1.0
         af = 1.0 if (curr.get('Source') == '10-K' and not is_derived_q4) else 4.0
+        return curr, prev, af
+
+    @staticmethod
+    def process_analysis(ticker, fundamentals_list, market_data):
+        if not fundamentals_list: return None
+        
+        # --- 1. 智能路由与数据归一化 ---
+        curr, prev, af = Alpha_Engine.normalize_latest(fundamentals_list)
+    
+        # --- 2. 统一计算逻辑 ---
     
         # 流量数据 (Flows) -> 年化
         revenue_run_rate = curr['Revenue'] * af
@@ -275,3 +394,109 @@ class Alpha_Engine:
             "Cost of Equity (Ke)": cost_of_equity,
             "EVA Spread": eva_spread,
         }
+
+    @staticmethod
+    def build_cross_section(universe):
+        """
+        [截面] {ticker: fundamentals_list} -> 每个 ticker 一行的 DataFrame (index = Ticker).
+        每行是 normalize_latest 之后的当前期 (单季度量级) + 对比期的 Revenue / COGS + 年化系数 AF.
+        """
+        rows = []
+        for ticker, fundamentals_list in universe.items():
+            if not fundamentals_list: continue
+            curr, prev, af = Alpha_Engine.normalize_latest(fundamentals_list)
+            row = {m: curr.get(m, 0) for m in FLOW_METRICS + STOCK_METRICS}
+            row.update({
+                'Ticker': ticker,
+                'Period End Date': curr.get('Period End Date'),
+                'Report Source': curr.get('Source Type', curr.get('Source')),
+                'AF': af,
+                'Has Prev': bool(prev),
+                'Prev Revenue': prev.get('Revenue', 0) if prev else np.nan,
+                'Prev COGS': prev.get('COGS', 0) if prev else np.nan,
+            })
+            rows.append(row)
+
+        if not rows:
+            return pd.DataFrame(columns=['Ticker']).set_index('Ticker')
+        return pd.DataFrame(rows).set_index('Ticker')
+
+    @staticmethod
+    def process_analysis_batch(cross_section, market_frame):
+        """
+        process_analysis 的向量化版本: 整个股票池一次算完.
+        cross_section: build_cross_section 的输出
+        market_frame:  index = Ticker, 列 Price / Market Cap / Beta / Risk-Free Rate
+        返回一个 DataFrame (index = Ticker), 列名与 process_analysis 的返回键一致.
+        """
+        df = cross_section.join(market_frame, how='inner')
+        if df.empty:
+            return pd.DataFrame(index=pd.Index([], name='Ticker'))
+
+        def col(name, default=0.0):
+            return pd.to_numeric(df[name], errors='coerce').fillna(default) if name in df else pd.Series(default, index=df.index)
+
+        def safe_div(num, den, valid=None):
+            # 与单票版一致: 分母为 0 (或条件不满足) 时结果为 0
+            valid = (den != 0) if valid is None else valid
+            return (num / den.where(valid)).where(valid, 0.0)
+
+        af = col('AF', 4.0)
+        revenue, cogs = col('Revenue'), col('COGS')
+        net_income, op_income = col('Net Income'), col('Operating Income')
+        cash, equity = col('Cash'), col('Stockholders Equity')
+        total_debt = col('Long Term Debt') + col('Short Term Debt')
+        mkt_cap = col('Market Cap')
+
+        # 增长与利润率
+        has_prev = df['Has Prev'].astype(bool)
+        prev_rev, prev_cogs = col('Prev Revenue'), col('Prev COGS')
+        sequential_growth = safe_div(revenue - prev_rev, prev_rev, has_prev & (prev_rev > 0))
+        gross_margin = safe_div(revenue - cogs, revenue)
+        prev_margin = safe_div(prev_rev - prev_cogs, prev_rev)
+        margin_expansion = ((gross_margin - prev_margin) * 100).where(has_prev, 0.0)
+
+        # 估值
+        ev = mkt_cap + total_debt - cash
+        fcf_yield = safe_div((col('Operating Cash Flow') - col('CapEx')) * af, mkt_cap)
+        pe = safe_div(mkt_cap, net_income * af)
+        ev_ebit = safe_div(ev, op_income * af, op_income != 0)
+
+        # ROIC (税率 21%), 投入资本为正才有意义
+        nopat = op_income * af * (1 - 0.21)
+        invested_capital = total_debt + equity - cash
+        roic = safe_div(nopat, invested_capital, invested_capital > 0)
+
+        # 股东回报 & CAPM
+        buyback_yield = safe_div(col('Buybacks') * af, mkt_cap)
+        dividend_yield = safe_div(col('Dividends') * af, mkt_cap)
+        beta = col('Beta', 1.0)
+        rfr = col('Risk-Free Rate', 0.045)
+        cost_of_equity = rfr + beta * 0.05
+        implied_growth = cost_of_equity - fcf_yield
+
+        return pd.DataFrame({
+            "Report Date": df['Period End Date'],
+            "Report Source": df['Report Source'],
+            "Real-time Price": col('Price', np.nan),
+            "Market Cap": mkt_cap,
+            "Enterprise Value (EV)": ev,
+            "Implied Growth": implied_growth,
+            "Alpha Gap": sequential_growth - implied_growth,
+            "Revenue (Run Rate)": revenue * af,
+            "Sequential Growth": sequential_growth,
+            "Gross Margin": gross_margin,
+            "Margin Expansion": margin_expansion,
+            "P/E Ratio": pe,
+            "FCF Yield": fcf_yield,
+            "EV/EBIT": ev_ebit,
+            "ROIC": roic,
+            "Risk-Free Rate": rfr,
+            "Equity Risk Premium (ERP)": fcf_yield - rfr,
+            "Buyback Yield": buyback_yield,
+            "Dividend Yield": dividend_yield,
+            "Total Shareholder Yield": buyback_yield + dividend_yield,
+            "Beta": beta,
+            "Cost of Equity (Ke)": cost_of_equity,
+            "EVA Spread": roic - cost_of_equity,
+        }, index=df.index.rename('Ticker'))
@@ -1,4 +1,5 @@
 # Configuration Constants
+import os
 
 RISK_FREE_RATE = 0.044  # Can be updated to dynamic later
 TRADING_DAYS_PER_YEAR = 252
@@ -6,3 +7,17 @@ TRADING_DAYS_PER_YEAR = 252
 # Display settings
 DISPLAY_WIDTH = 1000
 DISPLAY_FLOAT_FORMAT = '{:.2f}'.format
+
+# Option chain disk cache (set TTL to 0 to always re-download)
+CHAIN_CACHE_DIR = os.environ.get(
+    'OPTIONS_CHAIN_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'chains')
+)
+CHAIN_CACHE_TTL_SECONDS = int(os.environ.get('OPTIONS_CHAIN_CACHE_TTL', 15 * 60))
+CHAIN_CACHE_MAX_SNAPSHOTS = 3  # Older snapshots per (symbol, expiry) are pruned
+# In-memory enriched chains / IV warm starts are kept for the most recent symbols only (LRU)
+ENRICHED_MEMO_MAX_SYMBOLS = 4
+
+# Concurrent chain downloads (MarketDataService.get_chains)
+CHAIN_FETCH_WORKERS = 4
+CHAIN_FETCH_MAX_REQUESTS_PER_SEC = 5.0  # Per host (all chains come from Yahoo), split across scan worker processes
@@ -17,8 +17,14 @@ from options_runner.screeners.strangle_long import LongStrangleScreener
 from options_runner.screeners.leaps import LeapsScreener
 from options_runner.screeners.deep_itm import DeepITMScreener
 from options_runner.screeners.bear_call import BearCallScreener
+from options_runner.scan import scan_main
 
 def main():
+    # Universe mode: python options_runner/main.py scan watchlist.txt --strategies bull_put,iron_condor
+    if len(sys.argv) > 1 and sys.argv[1] == 'scan':
+        scan_main(sys.argv[2:])
+        return
+
     setup_pandas_display()
     
     parser = argparse.ArgumentParser(description="Options Screener Runner")
@@ -0,0 +1,217 @@
+import argparse
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+
+from options_runner.utils.market_data import MarketDataService
+from options_runner.utils.rate_limit import set_process_share
+from options_runner.utils.display import setup_pandas_display
+from options_runner.screeners.iron_condor import IronCondorScreener
+from options_runner.screeners.zebra import ZebraScreener
+from options_runner.screeners.bull_put import BullPutScreener
+from options_runner.screeners.bull_call import BullCallScreener
+from options_runner.screeners.double_bull import DoubleBullScreener
+from options_runner.screeners.strangle_short import ShortStrangleScreener
+from options_runner.screeners.strangle_long import LongStrangleScreener
+from options_runner.screeners.leaps import LeapsScreener
+from options_runner.screeners.deep_itm import DeepITMScreener
+from options_runner.screeners.bear_call import BearCallScreener
+
+# name -> (screener class, score column, higher_is_better, columns describing the setup)
+# The score is each screener's own primary ranking metric. higher_is_better may
+# also be a number: the value closest to that target wins.
+STRATEGIES = {
+    'iron_condor': (IronCondorScreener, 'RoR%', True, ['Long Put', 'Short Put', 'Short Call', 'Long Call', 'Credit']),
+    'zebra': (ZebraScreener, 'Net_Extrinsic', None, ['Long_Strike', 'Short_Strike', 'Debit']),
+    'bull_put': (BullPutScreener, 'EV', True, ['Short Put', 'Long Put', 'Width', 'Credit']),
+    'bull_call': (BullCallScreener, 'EV', True, ['Long', 'Short', 'Debit']),
+    'double_bull': (DoubleBullScreener, 'MaxProfit', True, ['BuyPut', 'SellPut', 'BuyCall', 'SellCall', 'Credit']),
+    'strangle_short': (ShortStrangleScreener, 'Theta_Daily', True, ['Short Put', 'Short Call', 'Credit']),
+    'strangle_long': (LongStrangleScreener, 'G/T Ratio', True, ['Put Strike', 'Call Strike', 'Debit']),
+    'leaps': (LeapsScreener, 'Delta', 0.80, ['Strike', 'Price']), # LeapsScreener's sweet spot
+    'deep_itm': (DeepITMScreener, 'Safety%', False, ['Long Strike', 'Short Strike', 'Debit']),
+    'bear_call': (BearCallScreener, 'EV', True, ['Short Call', 'Width', 'Credit']),
+}
+
+# Secondary sort (lower is better) for setups with the same score
+TIE_BREAKS = {
+    'leaps': 'IV%',
+}
+
+# One MarketDataService per worker process, created by the pool initializer
+_worker_market = None
+
+def _init_worker(n_workers=1):
+    global _worker_market
+    # Rate limiters are per process: each worker gets 1/n of the per-host budget
+    set_process_share(n_workers)
+    _worker_market = MarketDataService()
+
+def _score(df, column, higher_is_better):
+    # higher_is_better=None means "closest to zero wins" (ZEBRA net extrinsic),
+    # a number means "closest to that target wins" (LEAPS delta)
+    if higher_is_better is None:
+        return -df[column].abs()
+    if not isinstance(higher_is_better, bool):
+        return -(df[column] - higher_is_better).abs()
+    return df[column] if higher_is_better else -df[column]
+
+def _describe(row, setup_cols):
+    parts = []
+    for col in setup_cols:
+        val = row[col]
+        parts.append(f"{col}={val:.2f}" if isinstance(val, float) else f"{col}={val}")
+    return ", ".join(parts)
+
+def scan_symbol(symbol, strategy_names, top_n=5, market=None):
+    """
+    Runs every requested strategy for one symbol on a single MarketDataService,
+    so all strategies share the same downloaded and Greek-enriched chains.
+
+    Returns (rows, errors): rows are dicts for the consolidated table,
+    errors are (strategy, message) tuples.
+    """
+    market = market or _worker_market or MarketDataService()
+    rows, errors = [], []
+    try:
+        _scan_strategies(symbol, strategy_names, top_n, market, rows, errors)
+    finally:
+        # Each symbol is scanned once: free its chains / IV memo for the next one
+        market.forget(symbol)
+    return rows, errors
+
+def _scan_strategies(symbol, strategy_names, top_n, market, rows, errors):
+    for name in strategy_names:
+        screener_cls, score_col, higher_is_better, setup_cols = STRATEGIES[name]
+        try:
+            kwargs = {}
+            if name == 'double_bull':
+                # Same safe defaults as verify_all.py
+                current_price = market.get_current_price(symbol)
+                kwargs = {
+                    'max_put_strike': int(current_price * 0.9),
+                    'min_call_strike': int(current_price * 1.05)
+                }
+
+            # Screener reports are suppressed; only the returned frame is used
+            with contextlib.redirect_stdout(io.StringIO()):
+                df = screener_cls(market).run(symbol, **kwargs)
+        except Exception as e:
+            errors.append((name, str(e)))
+            continue
+
+        if df is None or df.empty:
+            continue
+
+        df = df.assign(_score=_score(df, score_col, higher_is_better))
+        tie_break = TIE_BREAKS.get(name)
+        if tie_break in df:
+            df = df.sort_values(by=['_score', tie_break], ascending=[False, True]).head(top_n)
+        else:
+            df = df.sort_values(by='_score', ascending=False).head(top_n)
+        for _, row in df.iterrows():
+            rows.append({
+                'Symbol': symbol,
+                'Strategy': name,
+                'Expiry': row.get('Expiry'),
+                'Metric': score_col,
+                'Value': row[score_col],
+                'Score': row['_score'],
+                'Setup': _describe(row, setup_cols)
+            })
+
+def rank_results(rows):
+    """
+    Builds the consolidated table. Scores are only comparable within a
+    strategy, so each row is ranked by its percentile inside its strategy.
+    """
+    if not rows:
+        return pd.DataFrame()
+    df = pd.DataFrame(rows)
+    df['Rank%'] = df.groupby('Strategy')['Score'].rank(pct=True) * 100
+    df = df.sort_values(by=['Rank%', 'Strategy', 'Symbol'], ascending=[False, True, True])
+    return df.drop(columns=['Score']).reset_index(drop=True)
+
+def run_scan(symbols, strategy_names, workers=None, top_n=5):
+    """
+    Fans the (symbol x strategies) work out across a process pool, one task
+    per symbol, and returns the consolidated ranked DataFrame.
+    """
+    workers = workers or min(len(symbols), os.cpu_count() or 1)
+    all_rows = []
+
+    print(f"🔭 Scanning {len(symbols)} symbols x {len(strategy_names)} strategies on {workers} workers...")
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(workers,)) as pool:
+        futures = {pool.submit(scan_symbol, sym, strategy_names, top_n): sym for sym in symbols}
+        for done, future in enumerate(as_completed(futures), start=1):
+            sym = futures[future]
+            try:
+                rows, errors = future.result()
+            except Exception as e:
+                print(f"❌ [{done}/{len(symbols)}] {sym}: {e}")
+                continue
+
+            all_rows.extend(rows)
+            status = "⚠️" if errors else "✅"
+            print(f"{status} [{done}/{len(symbols)}] {sym}: {len(rows)} setups")
+            for name, msg in errors:
+                print(f"   - {name}: {msg}")
+
+    return rank_results(all_rows)
+
+def load_symbols(path):
+    """Reads a watchlist file: one or more comma-separated symbols per line, '#' starts a comment."""
+    symbols = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.split('#', 1)[0]
+            for token in line.replace(',', ' ').split():
+                sym = token.strip().upper()
+                if sym and sym not in symbols:
+                    symbols.append(sym)
+    return symbols
+
+def scan_main(argv=None):
+    setup_pandas_display()
+
+    parser = argparse.ArgumentParser(prog="main.py scan", description="Universe scan: many symbols x many strategies")
+    parser.add_argument('symbols_file', type=str, help='Watchlist file (one symbol per line, or comma separated)')
+    parser.add_argument('--strategies', type=str, default='all',
+        help=f"Comma separated list or 'all' ({', '.join(STRATEGIES)})")
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--top', type=int, default=5, help='Setups kept per symbol and strategy')
+    parser.add_argument('--output', type=str, default=None, help='Optional CSV path for the consolidated table')
+
+    args = parser.parse_args(argv)
+
+    if args.strategies == 'all':
+        strategy_names = list(STRATEGIES)
+    else:
+        strategy_names = [s.strip().lower() for s in args.strategies.split(',') if s.strip()]
+        unknown = [s for s in strategy_names if s not in STRATEGIES]
+        if unknown:
+            parser.error(f"Unknown strategies: {', '.join(unknown)}")
+
+    symbols = load_symbols(args.symbols_file)
+    if not symbols:
+        print("❌ No symbols found in watchlist.")
+        return
+
+    df = run_scan(symbols, strategy_names, workers=args.workers, top_n=args.top)
+
+    print("\n" + "=" * 100)
+    print("🏁 Consolidated Ranking")
+    print("=" * 100)
+    if df.empty:
+        print("No valid strategies found.")
+        return
+    print(df.to_string(index=False))
+
+    if args.output:
+        df.to_csv(args.output, index=False)
+        print(f"\n💾 Saved {len(df)} rows to {args.output}")
+
+    return df
@@ -9,6 +9,8 @@ class BaseScreener(ABC):
     def run(self, symbol: str, **kwargs):
         """
         Main execution method for the screener.
+        Prints its report and returns the ranked result DataFrame
+        (None when no setups were found).
         """
         pass
 
@@ -2,7 +2,7 @@ import pandas as pd
 import numpy as np
 import scipy.stats as si
 from options_runner.screeners.base_screener import BaseScreener
-from options_runner.utils.option_math import calculate_greeks
+from options_runner.utils.option_math import match_strikes
 
 class BearCallScreener(BaseScreener):
     def run(self, symbol, spread_widths=[2.5, 5, 10], min_days=30, max_days=60, min_sell_strike=None):
@@ -30,21 +30,12 @@ class BearCallScreener(BaseScreener):
 
         results = []
         
-        for date_str, days in target_dates:
+        for date_str, days, calls, _ in self.market.get_enriched_chains(symbol, target_dates, current_price):
             try:
-                calls, _ = self.market.get_chain(symbol, date_str)
-                if calls.empty: continue
-                
                 # Filter specific to this strategy (min vol/OI)
                 calls = calls[(calls['volume'] >= 5) & (calls['openInterest'] >= 50)].copy()
                 if calls.empty: continue
                 
-                calls = calls[(calls['bid'] > 0) & (calls['ask'] > 0)].copy()
-                calls['mid'] = (calls['bid'] + calls['ask']) / 2
-                calls['time_to_expiry'] = days / 365.0
-                
-                calls = calculate_greeks(calls, current_price, 'c')
-                
                 # ATM IV
                 atm_row = calls.iloc[(calls['strike'] - current_price).abs().argsort()[:1]]
                 atm_iv = atm_row['iv'].iloc[0] if not atm_row.empty else 0
@@ -54,58 +45,71 @@ class BearCallScreener(BaseScreener):
                 if min_sell_strike:
                     short_candidates = short_candidates[short_candidates['strike'] >= min_sell_strike]
                     
-                for idx, short_row in short_candidates.iterrows():
-                    s_spread = short_row['ask'] - short_row['bid']
-                    if short_row['bid'] == 0: continue
+                # Short leg must have a bid
+                shorts = short_candidates[short_candidates['bid'] != 0]
+                if shorts.empty: continue
+                
+                # (short, width) grid, flattened in the same order as a nested short -> width loop
+                widths = np.asarray(spread_widths)
+                s_idx = np.repeat(np.arange(len(shorts)), len(widths))
+                width = np.tile(widths, len(shorts))
+                short_strike = shorts['strike'].to_numpy()[s_idx]
+                
+                # Long Strike > Short Strike (Credit Call Spread), looked up via the sorted strike index
+                target_long_strike = short_strike + width
+                long_pos, found = match_strikes(calls['strike'].to_numpy(), target_long_strike)
+                
+                s_mid = shorts['mid'].to_numpy()[s_idx]
+                s_spread = (shorts['ask'] - shorts['bid']).to_numpy()[s_idx]
+                l_spread = calls['ask'].to_numpy()[long_pos] - calls['bid'].to_numpy()[long_pos]
+                l_mid = calls['mid'].to_numpy()[long_pos]
+                
+                # Slippage logic
+                SLIPPAGE_PCT = 0.15
+                short_fill = s_mid - (s_spread * SLIPPAGE_PCT)
+                long_fill = l_mid + (l_spread * SLIPPAGE_PCT)
+                net_credit = short_fill - long_fill
+                
+                valid = found & ~(net_credit <= 0.05)
+                if not valid.any(): continue
+                
+                width = width[valid]
+                short_strike = short_strike[valid]
+                net_credit = net_credit[valid]
+                s_delta = shorts['delta'].to_numpy()[s_idx][valid]
+                sigma = shorts['iv'].to_numpy()[s_idx][valid]
+                t = calls['time_to_expiry'].iloc[0]
+                
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    max_loss = width - net_credit
+                    ror = (net_credit / max_loss) * 100
+                    
+                    # Real POP calculation (N(-d2))
+                    break_even = short_strike + net_credit
+                    d2 = (np.log(current_price / break_even) + (0.044 - 0.5 * sigma**2) * t) / (sigma * np.sqrt(t))
+                    real_pop = si.norm.cdf(-d2) * 100
                     
-                    for width in spread_widths:
-                        # Long Strike > Short Strike (Credit Call Spread)
-                        target_long_strike = short_row['strike'] + width
-                        
-                        long_rows = calls[calls['strike'] == target_long_strike]
-                        if long_rows.empty: continue
-                        long_row = long_rows.iloc[0]
-                        
-                        l_spread = long_row['ask'] - long_row['bid']
-                        
-                        # Slippage logic
-                        SLIPPAGE_PCT = 0.15
-                        short_fill = short_row['mid'] - (s_spread * SLIPPAGE_PCT)
-                        long_fill = long_row['mid'] + (l_spread * SLIPPAGE_PCT)
-                        net_credit = short_fill - long_fill
-                        
-                        if net_credit <= 0.05: continue
-                        
-                        max_loss = width - net_credit
-                        ror = (net_credit / max_loss) * 100
-                        
-                        # Real POP calculation (N(-d2))
-                        sigma = short_row['iv']
-                        break_even = short_row['strike'] + net_credit
-                        d2 = (np.log(current_price / break_even) + (0.044 - 0.5 * sigma**2) * calls['time_to_expiry'].iloc[0]) / (sigma * np.sqrt(calls['time_to_expiry'].iloc[0]))
-                        real_pop = si.norm.cdf(-d2) * 100
-                        
-                        # EV
-                        ev = (real_pop/100 * net_credit) - ((1 - real_pop/100) * max_loss)
-                        
-                        skew = short_row['iv'] - atm_iv
-                        buffer_pct = ((break_even - current_price) / current_price) * 100
-                        
-                        gamma_risk = "HIGH" if (days < 21 and short_row['delta'] > 0.35) else "LOW"
-                        
-                        results.append({
-                            'Expiry': date_str,
-                            'Width': width,
-                            'Short Call': short_row['strike'],
-                            'S.Delta': short_row['delta'],
-                            'Credit': net_credit,
-                            'RoR%': ror,
-                            'EV': ev,
-                            'Prob%': real_pop,
-                            'Buffer%': buffer_pct,
-                            'IV_Skew': skew,
-                            'Risk': gamma_risk
-                        })
+                    # EV
+                    ev = (real_pop/100 * net_credit) - ((1 - real_pop/100) * max_loss)
+                    
+                    skew = sigma - atm_iv
+                    buffer_pct = ((break_even - current_price) / current_price) * 100
+                
+                gamma_risk = np.where((days < 21) & (s_delta > 0.35), "HIGH", "LOW")
+                
+                results.append(pd.DataFrame({
+                    'Expiry': date_str,
+                    'Width': width,
+                    'Short Call': short_strike,
+                    'S.Delta': s_delta,
+                    'Credit': net_credit,
+                    'RoR%': ror,
+                    'EV': ev,
+                    'Prob%': real_pop,
+                    'Buffer%': buffer_pct,
+                    'IV_Skew': skew,
+                    'Risk': gamma_risk
+                }))
             except Exception:
                 continue
 
@@ -113,7 +117,7 @@ class BearCallScreener(BaseScreener):
             self.log("No valid strategies.")
             return
 
-        df = pd.DataFrame(results)
+        df = pd.concat(results, ignore_index=True)
         
         # Term structure
         self.log_separator()
@@ -135,3 +139,5 @@ class BearCallScreener(BaseScreener):
         if not filtered_df.empty:
             best = filtered_df.iloc[0]
             self.log(f"🎯 Sniper: {best['Expiry']} Sell ${best['Short Call']} Call (EV: ${best['EV']:.2f})")
+
+        return filtered_df
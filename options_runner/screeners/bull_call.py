@@ -1,7 +1,6 @@
 import pandas as pd
 import numpy as np
 from options_runner.screeners.base_screener import BaseScreener
-from options_runner.utils.option_math import calculate_greeks
 
 class BullCallScreener(BaseScreener):
     def run(self, symbol, spread_widths=[2.5, 5, 10], min_days=1, max_days=15, min_volume=30):
@@ -28,9 +27,8 @@ class BullCallScreener(BaseScreener):
 
         results = []
         
-        for date_str, days in target_dates:
+        for date_str, days, calls, _ in self.market.get_enriched_chains(symbol, target_dates, current_price):
             try:
-                calls, _ = self.market.get_chain(symbol, date_str)
                 if calls.empty: continue
                 
                 # Check liquidity
@@ -40,13 +38,6 @@ class BullCallScreener(BaseScreener):
                 # Fill na OI
                 calls['openInterest'] = calls['openInterest'].fillna(0)
                 
-                # Price estimation (mid)
-                calls['mid'] = (calls['bid'] + calls['ask']) / 2
-                calls['time_to_expiry'] = days / 365.0
-                
-                # Greeks
-                calls = calculate_greeks(calls, current_price, 'c')
-                
                 # VRP Logic
                 atm_idx = (calls['strike'] - current_price).abs().idxmin()
                 atm_iv = calls.loc[atm_idx, 'iv']
@@ -112,3 +103,5 @@ class BullCallScreener(BaseScreener):
         if not agg.empty:
             r = agg.iloc[0]
             self.log(f"🚀 Aggressive Pick: {r['Expiry']} ${r['Long']}/{r['Short']} (RoR: {r['RoR%']:.0f}%)")
+
+        return df_sorted
@@ -1,7 +1,7 @@
 import pandas as pd
 import numpy as np
 from options_runner.screeners.base_screener import BaseScreener
-from options_runner.utils.option_math import calculate_greeks
+from options_runner.utils.option_math import match_strikes
 
 class BullPutScreener(BaseScreener):
     def run(self, symbol, spread_widths=[5, 10, 15, 20], min_days=15, max_days=60, max_sell_strike=None, min_buy_strike=None):
@@ -35,19 +35,11 @@ class BullPutScreener(BaseScreener):
 
         results = []
         
-        for date_str, days in target_dates:
+        # Filtered, mid-priced, Greek-enriched chain (shared across screeners)
+        for date_str, days, _, puts in self.market.get_enriched_chains(symbol, target_dates, current_price):
             try:
-                _, puts = self.market.get_chain(symbol, date_str)
                 if puts.empty: continue
                 
-                # Filter valid
-                puts = puts[(puts['bid'] > 0) & (puts['ask'] > 0)].copy()
-                puts['mid'] = (puts['bid'] + puts['ask']) / 2
-                puts['time_to_expiry'] = days / 365.0
-                
-                # Calculate Greeks
-                puts = calculate_greeks(puts, current_price, 'p')
-                
                 # ATM IV for Skew
                 atm_row = puts.iloc[(puts['strike'] - current_price).abs().argsort()[:1]]
                 atm_iv = atm_row['iv'].iloc[0] if not atm_row.empty else 0
@@ -57,61 +49,81 @@ class BullPutScreener(BaseScreener):
                 if max_sell_strike:
                     short_candidates = short_candidates[short_candidates['strike'] <= max_sell_strike]
                     
-                for idx, short_row in short_candidates.iterrows():
-                    s_spread = short_row['ask'] - short_row['bid']
-                    if short_row['bid'] == 0 or (s_spread / short_row['bid']) > 0.25: continue
+                # Short leg liquidity: skip zero bids and wide (>25% of bid) markets
+                s_bid = short_candidates['bid'].to_numpy()
+                s_spread_all = short_candidates['ask'].to_numpy() - s_bid
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    liquid = (s_bid != 0) & ~((s_spread_all / s_bid) > 0.25)
+                shorts = short_candidates[liquid]
+                if shorts.empty: continue
+                
+                # (short, width) grid, flattened in the same order as a nested short -> width loop
+                widths = np.asarray(spread_widths)
+                s_idx = np.repeat(np.arange(len(shorts)), len(widths))
+                width = np.tile(widths, len(shorts))
+                short_strike = shorts['strike'].to_numpy()[s_idx]
+                target_long_strike = short_strike - width
+                
+                # Long leg lookup: searchsorted over the sorted strike index
+                long_pos, found = match_strikes(puts['strike'].to_numpy(), target_long_strike)
+                
+                s_mid = shorts['mid'].to_numpy()[s_idx]
+                s_spread = s_spread_all[liquid][s_idx]
+                s_delta = shorts['delta'].to_numpy()[s_idx]
+                s_iv = shorts['iv'].to_numpy()[s_idx]
+                l_bid = puts['bid'].to_numpy()[long_pos]
+                l_ask = puts['ask'].to_numpy()[long_pos]
+                l_mid = puts['mid'].to_numpy()[long_pos]
+                l_spread = l_ask - l_bid
+                
+                # Slippage
+                SLIPPAGE_PCT = 0.15
+                short_fill = s_mid - (s_spread * SLIPPAGE_PCT)
+                long_fill = l_mid + (l_spread * SLIPPAGE_PCT)
+                net_credit = short_fill - long_fill
+                
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    valid = found & ~((l_spread > 0.50) & ((l_spread / l_ask) > 0.30)) & ~(net_credit <= 0.05)
+                if min_buy_strike:
+                    valid &= ~(target_long_strike < min_buy_strike)
+                if not valid.any(): continue
+                
+                width = width[valid]
+                short_strike = short_strike[valid]
+                s_delta = s_delta[valid]
+                net_credit = net_credit[valid]
+                
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    max_loss = width - net_credit
+                    ror = (net_credit / max_loss) * 100
+                    pop = (1 - np.abs(s_delta)) * 100
+                    
+                    # Expected Value
+                    ev = (pop/100 * net_credit) - ((1 - pop/100) * max_loss)
                     
-                    short_strike = short_row['strike']
+                    # IV Skew
+                    skew = s_iv[valid] - atm_iv
                     
-                    for width in spread_widths:
-                        target_long_strike = short_strike - width
-                        if min_buy_strike and target_long_strike < min_buy_strike: continue
-                        
-                        long_rows = puts[puts['strike'] == target_long_strike]
-                        if long_rows.empty: continue
-                        long_row = long_rows.iloc[0]
-                        
-                        l_spread = long_row['ask'] - long_row['bid']
-                        if l_spread > 0.50 and (l_spread / long_row['ask']) > 0.30: continue
-                        
-                        # Slippage
-                        SLIPPAGE_PCT = 0.15
-                        short_fill = short_row['mid'] - (s_spread * SLIPPAGE_PCT)
-                        long_fill = long_row['mid'] + (l_spread * SLIPPAGE_PCT)
-                        net_credit = short_fill - long_fill
-                        
-                        if net_credit <= 0.05: continue
-                        
-                        max_loss = width - net_credit
-                        ror = (net_credit / max_loss) * 100
-                        pop = (1 - abs(short_row['delta'])) * 100
-                        
-                        # Expected Value
-                        ev = (pop/100 * net_credit) - ((1 - pop/100) * max_loss)
-                        
-                        # IV Skew
-                        skew = short_row['iv'] - atm_iv
-                        
-                        break_even = short_strike - net_credit
-                        buffer_pct = ((current_price - break_even) / current_price) * 100
-                        
-                        gamma_risk = "HIGH" if (days < 45 and abs(short_row['delta']) > 0.30) else "LOW"
-                        
-                        results.append({
-                            'Expiry': date_str,
-                            'Days': days,
-                            'Width': width,
-                            'Short Put': short_strike,
-                            'Long Put': target_long_strike,
-                            'S.Delta': short_row['delta'],
-                            'Credit': net_credit,
-                            'RoR%': ror,
-                            'EV': ev,
-                            'Prob%': pop,
-                            'Buffer%': buffer_pct,
-                            'IV_Skew': skew,
-                            'Risk': gamma_risk
-                        })
+                    break_even = short_strike - net_credit
+                    buffer_pct = ((current_price - break_even) / current_price) * 100
+                
+                gamma_risk = np.where((days < 45) & (np.abs(s_delta) > 0.30), "HIGH", "LOW")
+                
+                results.append(pd.DataFrame({
+                    'Expiry': date_str,
+                    'Days': days,
+                    'Width': width,
+                    'Short Put': short_strike,
+                    'Long Put': target_long_strike[valid],
+                    'S.Delta': s_delta,
+                    'Credit': net_credit,
+                    'RoR%': ror,
+                    'EV': ev,
+                    'Prob%': pop,
+                    'Buffer%': buffer_pct,
+                    'IV_Skew': skew,
+                    'Risk': gamma_risk
+                }))
             except Exception:
                 continue
 
@@ -119,7 +131,7 @@ class BullPutScreener(BaseScreener):
             self.log("No valid strategies found.")
             return
 
-        df = pd.DataFrame(results)
+        df = pd.concat(results, ignore_index=True)
         
         # Heatmap / Term Structure Logic
         self.log_separator()
@@ -151,3 +163,5 @@ class BullPutScreener(BaseScreener):
                 self.log("🌊 IV Crusher mode recommended (Sell high IV).")
             else:
                 self.log("🛡️ Defensive mode recommended (IV is low).")
+
+        return filtered_df
@@ -1,9 +1,9 @@
 import pandas as pd
+import numpy as np
 from options_runner.screeners.base_screener import BaseScreener
-from options_runner.utils.option_math import calculate_greeks
 
 class DeepITMScreener(BaseScreener):
-    def run(self, symbol, min_long_delta=0.75, min_days=10, max_days=20, target_otm_pct=1.05):
+    def run(self, symbol, min_long_delta=0.75, min_days=10, max_days=20, target_otm_pct=1.05, top_n=20):
         self.log_header(f"{symbol} Deep ITM Bull Call Spread (Stock Substitute)")
         
         try:
@@ -21,17 +21,10 @@ class DeepITMScreener(BaseScreener):
 
         results = []
         
-        for date_str, days in target_dates:
+        for date_str, days, calls, _ in self.market.get_enriched_chains(symbol, target_dates, current_price):
             try:
-                calls, _ = self.market.get_chain(symbol, date_str)
                 if calls.empty: continue
                 
-                calls = calls[(calls['bid']>0) & (calls['ask']>0)].copy()
-                calls['mid'] = (calls['bid']+calls['ask'])/2
-                calls['time_to_expiry'] = days/365.0
-                
-                calls = calculate_greeks(calls, current_price, 'c')
-                
                 # Long Legs: Deep ITM
                 limit_delta = min(0.99, min_long_delta) # Cap at 0.99
                 long_candidates = calls[calls['delta'] >= limit_delta]
@@ -40,34 +33,45 @@ class DeepITMScreener(BaseScreener):
                 min_short_strike = current_price * target_otm_pct
                 short_candidates = calls[calls['strike'] >= min_short_strike]
                 
-                for _, long_row in long_candidates.iterrows():
-                    for _, short_row in short_candidates.iterrows():
-                        if short_row['strike'] <= long_row['strike']: continue
-                        
-                        debit = long_row['mid'] - short_row['mid']
-                        break_even = long_row['strike'] + debit
-                        
-                        safety_pct = (break_even - current_price) / current_price * 100
-                        
-                        # Filter: We want safety < 1.5% (meaning current price is near or above BE)
-                        if safety_pct > 1.5: continue
-                        
-                        width = short_row['strike'] - long_row['strike']
-                        max_profit = width - debit
-                        ror = (max_profit / debit) * 100 if debit > 0 else 0
-                        
-                        net_vega = long_row['vega'] - short_row['vega']
-                        
-                        results.append({
-                            'Expiry': date_str,
-                            'Long Strike': long_row['strike'],
-                            'Short Strike': short_row['strike'],
-                            'Debit': debit,
-                            'BreakEven': break_even,
-                            'Safety%': safety_pct,
-                            'RoR%': ror,
-                            'Net Vega': net_vega
-                        })
+                if long_candidates.empty or short_candidates.empty: continue
+                
+                l_strike = long_candidates['strike'].to_numpy()
+                s_strike = short_candidates['strike'].to_numpy()
+                
+                # Broadcast grid: rows = long legs, columns = short legs
+                debit = long_candidates['mid'].to_numpy()[:, None] - short_candidates['mid'].to_numpy()[None, :]
+                break_even = l_strike[:, None] + debit
+                safety_pct = (break_even - current_price) / current_price * 100
+                
+                # Filter: We want safety < 1.5% (meaning current price is near or above BE)
+                mask = (s_strike[None, :] > l_strike[:, None]) & ~(safety_pct > 1.5)
+                li, si = np.nonzero(mask)
+                if len(li) == 0: continue
+                
+                # Keep only the top-N safest pairs of this expiry (partial sort, order preserved)
+                if top_n and len(li) > top_n:
+                    keep = np.argpartition(safety_pct[li, si], top_n - 1)[:top_n]
+                    keep.sort()
+                    li, si = li[keep], si[keep]
+                
+                debit = debit[li, si]
+                width = s_strike[si] - l_strike[li]
+                max_profit = width - debit
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    ror = np.where(debit > 0, (max_profit / debit) * 100, 0)
+                
+                net_vega = long_candidates['vega'].to_numpy()[li] - short_candidates['vega'].to_numpy()[si]
+                
+                results.append(pd.DataFrame({
+                    'Expiry': date_str,
+                    'Long Strike': l_strike[li],
+                    'Short Strike': s_strike[si],
+                    'Debit': debit,
+                    'BreakEven': break_even[li, si],
+                    'Safety%': safety_pct[li, si],
+                    'RoR%': ror,
+                    'Net Vega': net_vega
+                }))
 
             except Exception:
                 continue
@@ -76,7 +80,7 @@ class DeepITMScreener(BaseScreener):
             self.log("No valid strategies.")
             return
 
-        df = pd.DataFrame(results)
+        df = pd.concat(results, ignore_index=True)
         df = df.sort_values(by=['Safety%', 'RoR%'], ascending=[True, False])
         
         cols = ['Expiry', 'Long Strike', 'Short Strike', 'Debit', 'BreakEven', 'Safety%', 'RoR%', 'Net Vega']
@@ -87,3 +91,5 @@ class DeepITMScreener(BaseScreener):
             best = df.iloc[0]
             self.log(f"🛡️ Best Defensive Pick: {best['Expiry']} Buy ${best['Long Strike']} / Sell ${best['Short Strike']}")
             self.log(f"   Break Even: ${best['BreakEven']:.2f} (Safety: {best['Safety%']:.2f}%)")
+
+        return df
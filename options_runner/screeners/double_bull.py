@@ -1,6 +1,7 @@
 import pandas as pd
+import numpy as np
 from options_runner.screeners.base_screener import BaseScreener
-from options_runner.utils.option_math import calculate_greeks
+from options_runner.utils.option_math import match_strikes
 
 class DoubleBullScreener(BaseScreener):
     def run(self, symbol, max_put_strike=None, min_call_strike=None, put_width=5, min_days=45, max_days=90):
@@ -27,82 +28,76 @@ class DoubleBullScreener(BaseScreener):
 
         results = []
         
-        for date_str, days in target_dates:
+        # Basic filter & Greeks (shared enriched chain)
+        for date_str, days, calls, puts in self.market.get_enriched_chains(symbol, target_dates, current_price):
             try:
-                calls, puts = self.market.get_chain(symbol, date_str)
                 if calls.empty or puts.empty: continue
                 
-                # Basic filter & Greeks
-                puts = puts[(puts['bid'] > 0) & (puts['ask'] > 0)].copy()
-                puts['mid'] = (puts['bid'] + puts['ask']) / 2
-                puts['time_to_expiry'] = days / 365.0
-                puts = calculate_greeks(puts, current_price, 'p')
-                
-                calls = calls[(calls['bid'] > 0) & (calls['ask'] > 0)].copy()
-                calls['mid'] = (calls['bid'] + calls['ask']) / 2
-                
                 # --- Strategy Construction ---
                 # 1. Bull Put Spread (Credit)
-                short_put_candidates = puts[puts['strike'] <= max_put_strike]
+                short_puts = puts[puts['strike'] <= max_put_strike]
+                sp_strike = short_puts['strike'].to_numpy()
+                target_long_put = sp_strike - put_width
+                
+                lp_pos, found = match_strikes(puts['strike'].to_numpy(), target_long_put)
+                put_credit = short_puts['mid'].to_numpy() - puts['mid'].to_numpy()[lp_pos]
+                valid_put = found & (put_credit > 0)
+                if not valid_put.any(): continue
+                
+                sp_strike = sp_strike[valid_put]
+                target_long_put = target_long_put[valid_put]
+                put_credit = put_credit[valid_put]
+                
+                # 2. Bull Call Spread (Debit funded by credit)
+                short_calls = calls[calls['strike'] >= min_call_strike]
+                if short_calls.empty: continue
+                sc_strike = short_calls['strike'].to_numpy()
+                sc_mid = short_calls['mid'].to_numpy()
+                
+                # Total budget = Credit from puts + Premium from selling the call.
+                # The Long Call is funded by both: Net Credit = budget - long_call_price.
+                total_budget = put_credit[:, None] + sc_mid[None, :]
                 
-                for _, sp_row in short_put_candidates.iterrows():
-                    short_put_strike = sp_row['strike']
-                    target_long_put = short_put_strike - put_width
-                    
-                    lp_rows = puts[puts['strike'] == target_long_put]
-                    if lp_rows.empty: continue
-                    lp_row = lp_rows.iloc[0]
-                    
-                    put_credit = sp_row['mid'] - lp_row['mid']
-                    if put_credit <= 0: continue
-                    
-                    # 2. Bull Call Spread (Debit funded by credit)
-                    short_call_candidates = calls[calls['strike'] >= min_call_strike]
-                    
-                    for _, sc_row in short_call_candidates.iterrows():
-                        short_call_strike = sc_row['strike']
-                        short_call_price = sc_row['mid']
-                        
-                        # Total budget = Credit from puts + Premium we get from selling call (Wait??)
-                        # Original logic: total_budget = put_spread_credit + short_call_price
-                        # Then look for a Long Call such that long_call_price <= total_budget?
-                        # If long_call_price <= put_credit + short_call_price
-                        # Then Net Credit = (put_credit + short_call_price) - long_call_price
-                        # Yes, this funds the Long Call using both the Put Spread credit and the Short Call premium.
-                        
-                        total_budget = put_credit + short_call_price
-                        
-                        potential_long_calls = calls[
-                            (calls['mid'] <= total_budget) &
-                            (calls['strike'] < short_call_strike) &
-                            (calls['strike'] > current_price)
-                        ].sort_values(by='strike')
-                        
-                        if potential_long_calls.empty: continue
-                        
-                        lc_row = potential_long_calls.iloc[0] # Pick the lowest strike we can afford? 
-                        # Original code sorted by strike ascending, so lowest strike (Deepest ITM or closest)
-                        
-                        long_call_strike = lc_row['strike']
-                        
-                        net_credit = total_budget - lc_row['mid']
-                        collateral = put_width * 100
-                        
-                        call_spread_width = short_call_strike - long_call_strike
-                        max_profit = (call_spread_width * 100) + (net_credit * 100)
-                        real_max_loss = collateral - (net_credit * 100)
-                        
-                        results.append({
-                            'Expiry': date_str,
-                            'BuyPut': int(target_long_put),
-                            'SellPut': int(short_put_strike),
-                            'BuyCall': int(long_call_strike),
-                            'SellCall': int(short_call_strike),
-                            'Credit': net_credit,
-                            'MaxProfit': max_profit,
-                            'MaxLoss': real_max_loss,
-                            'Start': long_call_strike
-                        })
+                # Long call candidates: strike above spot, sorted by strike.
+                # prefix_min[i] = cheapest mid among the i+1 lowest strikes, so the
+                # lowest affordable strike for a budget B is the first i with
+                # prefix_min[i] <= B -> binary search on the non-increasing prefix.
+                long_calls = calls[calls['strike'] > current_price].sort_values(by='strike', kind='stable')
+                if long_calls.empty: continue
+                lc_strike = long_calls['strike'].to_numpy()
+                lc_mid = long_calls['mid'].to_numpy()
+                prefix_min = np.minimum.accumulate(lc_mid)
+                
+                lc_idx = np.searchsorted(-prefix_min, -total_budget.ravel(), side='left').reshape(total_budget.shape)
+                has_long = lc_idx < len(lc_strike)
+                lc_idx = np.minimum(lc_idx, len(lc_strike) - 1)
+                
+                # The lowest affordable strike must still sit below the short call
+                long_call_strike = lc_strike[lc_idx]
+                mask = has_long & (long_call_strike < sc_strike[None, :])
+                pi, ci = np.nonzero(mask)
+                if len(pi) == 0: continue
+                
+                long_call_strike = long_call_strike[pi, ci]
+                short_call_strike = sc_strike[ci]
+                net_credit = total_budget[pi, ci] - lc_mid[lc_idx[pi, ci]]
+                collateral = put_width * 100
+                
+                call_spread_width = short_call_strike - long_call_strike
+                max_profit = (call_spread_width * 100) + (net_credit * 100)
+                real_max_loss = collateral - (net_credit * 100)
+                
+                results.append(pd.DataFrame({
+                    'Expiry': date_str,
+                    'BuyPut': target_long_put[pi].astype(int),
+                    'SellPut': sp_strike[pi].astype(int),
+                    'BuyCall': long_call_strike.astype(int),
+                    'SellCall': short_call_strike.astype(int),
+                    'Credit': net_credit,
+                    'MaxProfit': max_profit,
+                    'MaxLoss': real_max_loss,
+                    'Start': long_call_strike
+                }))
 
             except Exception:
                 continue
@@ -111,7 +106,7 @@ class DoubleBullScreener(BaseScreener):
             self.log("No valid strategies.")
             return
 
-        df = pd.DataFrame(results)
+        df = pd.concat(results, ignore_index=True)
         df = df[df['Credit'] >= -0.10].sort_values(by=['Start', 'MaxProfit'], ascending=[True, False])
         
         cols = ['Expiry', 'BuyPut', 'SellPut', 'BuyCall', 'SellCall', 'Credit', 'MaxProfit', 'MaxLoss', 'Start']
@@ -122,3 +117,5 @@ class DoubleBullScreener(BaseScreener):
             self.log_separator()
             best = df.iloc[0]
             self.log(f"🚀 Best Aggressive: {best['Expiry']} | Start profit > ${best['Start']}")
+
+        return df
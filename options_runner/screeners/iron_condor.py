@@ -1,9 +1,73 @@
 import pandas as pd
+import numpy as np
 from options_runner.screeners.base_screener import BaseScreener
-from options_runner.utils.option_math import calculate_greeks
+
+def _vertical_spreads(side, option_type, short_delta, delta_band, min_width, max_width):
+    """
+    Every credit vertical on one side of the chain whose short leg has
+    |delta| within short_delta +/- delta_band and whose width is in band.
+
+    side: enriched calls or puts; option_type: 'p' or 'c' (not inferred from
+    delta signs, which may be NaN or rounded to -0.0). Puts take the long leg
+    below the short, calls above. Returns a DataFrame with one row per (short, long) pair,
+    with dominated wings already removed.
+    """
+    abs_delta = side['delta'].abs()
+    shorts = side[(abs_delta >= short_delta - delta_band) & (abs_delta <= short_delta + delta_band)]
+    if shorts.empty:
+        return pd.DataFrame()
+
+    s_strike = shorts['strike'].to_numpy()
+    l_strike = side['strike'].to_numpy()
+    is_put = option_type == 'p'
+
+    # Broadcast grid: rows = short legs, columns = candidate long legs
+    width = (s_strike[:, None] - l_strike[None, :]) if is_put else (l_strike[None, :] - s_strike[:, None])
+    credit = shorts['mid'].to_numpy()[:, None] - side['mid'].to_numpy()[None, :]
+    mask = (width >= min_width) & (width <= max_width) & (credit > 0)
+    si, li = np.nonzero(mask)
+    if len(si) == 0:
+        return pd.DataFrame()
+
+    spreads = pd.DataFrame({
+        'short_idx': si,
+        'short_strike': s_strike[si],
+        'long_strike': l_strike[li],
+        'short_delta': shorts['delta'].to_numpy()[si],
+        'width': width[si, li],
+        'credit': credit[si, li]
+    })
+
+    # Dominated-wing elimination: for the same short leg, a wider wing is only
+    # worth keeping if it collects strictly more credit than every narrower one.
+    spreads = spreads.sort_values(by=['short_idx', 'width'], kind='stable')
+    best_narrower = spreads.groupby('short_idx')['credit'].cummax().groupby(spreads['short_idx']).shift(1)
+    spreads = spreads[best_narrower.isna() | (spreads['credit'] > best_narrower)]
+    return spreads.reset_index(drop=True)
+
+def _pareto_frontier(ror, pop):
+    """Mask of combinations not beaten on both RoR and POP by another one."""
+    order = np.lexsort((-ror, -pop)) # POP desc, then RoR desc
+    best_ror = np.maximum.accumulate(ror[order])
+    prev_best = np.concatenate(([-np.inf], best_ror[:-1]))
+    frontier = np.zeros(len(ror), dtype=bool)
+    frontier[order] = ror[order] > prev_best
+    return frontier
 
 class IronCondorScreener(BaseScreener):
-    def run(self, symbol, short_delta=0.20, wing_width_target=2.5, min_days=25, max_days=60):
+    def run(self, symbol, short_delta=0.20, wing_width_target=2.5, min_days=25, max_days=60,
+            delta_band=0.10, min_width=None, max_width=None, min_credit_width=0.10, top_n=10):
+        """
+        Full-grid search: every (short put, long put, short call, long call)
+        with short |delta| in short_delta +/- delta_band and wing widths in
+        [min_width, max_width] (default: wing_width_target +/- 30%).
+        Wings are pruned per side (dominated wings, credit/width upper bound),
+        the surviving put x call spreads are combined as arrays, and the
+        RoR/POP Pareto frontier of each expiry is ranked by RoR (top_n kept).
+        """
+        min_width = wing_width_target * 0.7 if min_width is None else min_width
+        max_width = wing_width_target * 1.3 if max_width is None else max_width
+
         self.log_header(f"{symbol} Iron Condor Strategy")
         
         # 1. Market Data & Context
@@ -37,76 +101,65 @@ class IronCondorScreener(BaseScreener):
 
         results = []
         
-        for date_str, days in target_dates:
+        # Liquidity filter, mid prices and Greeks (shared enriched chain)
+        for date_str, days, calls, puts in self.market.get_enriched_chains(symbol, target_dates, current_price):
             try:
-                calls, puts = self.market.get_chain(symbol, date_str)
-                
-                # Filter liquidity
-                calls = calls[(calls['bid'] > 0) & (calls['ask'] > 0)].copy()
-                puts = puts[(puts['bid'] > 0) & (puts['ask'] > 0)].copy()
-                
-                calls['mid'] = (calls['bid'] + calls['ask']) / 2
-                puts['mid'] = (puts['bid'] + puts['ask']) / 2
-                
-                calls['time_to_expiry'] = days / 365.0
-                puts['time_to_expiry'] = days / 365.0
-                
-                # Calculate Greeks
-                calls = calculate_greeks(calls, current_price, 'c')
-                puts = calculate_greeks(puts, current_price, 'p')
-                
-                # Logic: Find Short Legs (~short_delta)
-                short_call = calls.iloc[(calls['delta'] - short_delta).abs().argsort()[:1]]
-                # Put delta is usually negative, so we look for distance from -short_delta
-                short_put = puts.iloc[(puts['delta'] - (-short_delta)).abs().argsort()[:1]]
-                
-                if short_call.empty or short_put.empty: continue
-                
-                s_call_row = short_call.iloc[0]
-                s_put_row = short_put.iloc[0]
-                
-                # Logic: Find Long Legs (Wings)
-                target_long_call_strike = s_call_row['strike'] + wing_width_target
-                target_long_put_strike = s_put_row['strike'] - wing_width_target
-                
-                long_call = calls.iloc[(calls['strike'] - target_long_call_strike).abs().argsort()[:1]]
-                long_put = puts.iloc[(puts['strike'] - target_long_put_strike).abs().argsort()[:1]]
-                
-                if long_call.empty or long_put.empty: continue
-                
-                l_call_row = long_call.iloc[0]
-                l_put_row = long_put.iloc[0]
-                
-                # Validate width
-                actual_width_call = l_call_row['strike'] - s_call_row['strike']
-                actual_width_put = s_put_row['strike'] - l_put_row['strike']
-                
-                if abs(actual_width_call - wing_width_target) > (wing_width_target * 0.3): continue
-                
-                # Metrics
-                credit = (s_call_row['mid'] - l_call_row['mid']) + (s_put_row['mid'] - l_put_row['mid'])
-                max_width = max(actual_width_call, actual_width_put)
-                max_loss = max_width - credit
+                # Logic: All Short Legs within the delta band, all Wings within the width band
+                put_spreads = _vertical_spreads(puts, 'p', short_delta, delta_band, min_width, max_width)
+                call_spreads = _vertical_spreads(calls, 'c', short_delta, delta_band, min_width, max_width)
+                if put_spreads.empty or call_spreads.empty: continue
+                
+                # Credit/width pruning: max(w_put, w_call) >= own width, so a side can
+                # at best reach (own credit + best other-side credit) / own width.
+                put_bound = (put_spreads['credit'] + call_spreads['credit'].max()) / put_spreads['width']
+                call_bound = (call_spreads['credit'] + put_spreads['credit'].max()) / call_spreads['width']
+                put_spreads = put_spreads[put_bound >= min_credit_width]
+                call_spreads = call_spreads[call_bound >= min_credit_width]
+                if put_spreads.empty or call_spreads.empty: continue
+                
+                # Combine: rows = put spreads, columns = call spreads
+                credit = put_spreads['credit'].to_numpy()[:, None] + call_spreads['credit'].to_numpy()[None, :]
+                max_width_grid = np.maximum(put_spreads['width'].to_numpy()[:, None], call_spreads['width'].to_numpy()[None, :])
+                max_loss = max_width_grid - credit
+                pop = 1 - (call_spreads['short_delta'].to_numpy()[None, :] + np.abs(put_spreads['short_delta'].to_numpy()[:, None]))
+                
+                valid = (max_loss > 0) & (credit / max_width_grid >= min_credit_width)
+                pi, ci = np.nonzero(valid)
+                if len(pi) == 0: continue
+                
+                credit = credit[pi, ci]
+                max_loss = max_loss[pi, ci]
+                max_width_grid = max_width_grid[pi, ci]
+                pop = pop[pi, ci]
+                ror = (credit / max_loss) * 100
                 
-                if max_loss <= 0: continue
+                # Ranked frontier: drop combos beaten on both RoR and POP
+                frontier = _pareto_frontier(ror, pop)
+                pi, ci = pi[frontier], ci[frontier]
                 
-                ror = (credit / max_loss) * 100
-                pop = 1 - (s_call_row['delta'] + abs(s_put_row['delta']))
+                sp_strike = put_spreads['short_strike'].to_numpy()[pi]
+                sc_strike = call_spreads['short_strike'].to_numpy()[ci]
+                credit = credit[frontier]
                 
-                results.append({
+                frame = pd.DataFrame({
                     'Expiry': date_str,
                     'Days': days,
-                    'Short Put': s_put_row['strike'],
-                    'Short Call': s_call_row['strike'],
-                    'Width': max_width,
+                    'Long Put': put_spreads['long_strike'].to_numpy()[pi],
+                    'Short Put': sp_strike,
+                    'Short Call': sc_strike,
+                    'Long Call': call_spreads['long_strike'].to_numpy()[ci],
+                    'Width': max_width_grid[frontier],
                     'Credit': credit,
-                    'Max Loss': max_loss,
-                    'RoR%': ror,
-                    'POP%': pop * 100,
-                    'Credit/Width': credit / max_width,
-                    'BE_Low': s_put_row['strike'] - credit,
-                    'BE_High': s_call_row['strike'] + credit
+                    'Max Loss': max_loss[frontier],
+                    'RoR%': ror[frontier],
+                    'POP%': pop[frontier] * 100,
+                    'Credit/Width': credit / max_width_grid[frontier],
+                    'BE_Low': sp_strike - credit,
+                    'BE_High': sc_strike + credit
                 })
+                frame = frame.sort_values(by='RoR%', ascending=False, kind='stable').head(top_n)
+                frame.insert(2, 'Rank', np.arange(1, len(frame) + 1))
+                results.append(frame)
 
             except Exception:
                 continue
@@ -115,11 +168,11 @@ class IronCondorScreener(BaseScreener):
             self.log("No valid strategies found.")
             return
 
-        df = pd.DataFrame(results)
-        df = df[df['Credit'] > 0].sort_values(by='RoR%', ascending=False)
+        df = pd.concat(results, ignore_index=True)
+        df = df[df['Credit'] > 0].sort_values(by=['Expiry', 'Rank'])
         
         # Display
-        cols = ['Expiry', 'Days', 'Short Put', 'Short Call', 'Width', 'Credit', 'Max Loss', 'RoR%', 'POP%', 'Credit/Width']
+        cols = ['Expiry', 'Days', 'Rank', 'Long Put', 'Short Put', 'Short Call', 'Long Call', 'Width', 'Credit', 'Max Loss', 'RoR%', 'POP%', 'Credit/Width']
         print(df[cols].to_string(index=False))
         
         self.log_separator()
@@ -132,3 +185,5 @@ class IronCondorScreener(BaseScreener):
             self.log(f"   Credit/Width: {best['Credit/Width']:.2f}")
         else:
              self.log("⚠️ No strategies meet the 30% credit/width Golden Rule.")
+
+        return df
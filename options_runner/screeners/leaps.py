@@ -1,6 +1,5 @@
 import pandas as pd
 from options_runner.screeners.base_screener import BaseScreener
-from options_runner.utils.option_math import calculate_greeks
 
 class LeapsScreener(BaseScreener):
     def run(self, symbol, min_days=250, max_days=530):
@@ -21,26 +20,14 @@ class LeapsScreener(BaseScreener):
 
         results = []
         
-        for date_str, days in target_dates:
+        # Filter Deep ITM
+        # Typically LEAPS look for 0.65 to 0.95 Delta
+        # But to filter delta we need to calculate it first
+        # (enriched chain: valid two-sided quotes only, mid + Greeks)
+        for date_str, days, calls, _ in self.market.get_enriched_chains(symbol, target_dates, current_price):
             try:
-                calls, _ = self.market.get_chain(symbol, date_str)
                 if calls.empty: continue
                 
-                # Filter Deep ITM
-                # Typically LEAPS look for 0.65 to 0.95 Delta
-                # But to filter delta we need to calculate it first
-                
-                calls['mid'] = (calls['bid']+calls['ask'])/2
-                # Use lastPrice if mid is stale/zero?
-                # Original script used lastPrice if mid is 0. 
-                # Our greeks calc needs a price.
-                
-                # Filter valid trades
-                calls = calls[(calls['bid']>0) & (calls['ask']>0)].copy()
-                calls['time_to_expiry'] = days/365.0
-                
-                calls = calculate_greeks(calls, current_price, 'c')
-                
                 # Filter Delta
                 calls = calls[(calls['delta'] >= 0.65) & (calls['delta'] <= 0.95)]
                 
@@ -83,3 +70,5 @@ class LeapsScreener(BaseScreener):
         df['delta_dist'] = (df['Delta'] - 0.80).abs()
         sweet = df.sort_values(by=['delta_dist', 'IV%']).iloc[0]
         self.log(f"★ Sweet Spot: {sweet['Expiry']} ${sweet['Strike']} (Delta {sweet['Delta']:.2f}, IV {sweet['IV%']:.1f}%)")
+
+        return df
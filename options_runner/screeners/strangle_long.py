@@ -1,6 +1,5 @@
 import pandas as pd
 from options_runner.screeners.base_screener import BaseScreener
-from options_runner.utils.option_math import calculate_greeks
 
 class LongStrangleScreener(BaseScreener):
     def run(self, symbol, min_days=14, max_days=60, target_deltas=[0.15, 0.20, 0.25]):
@@ -25,24 +24,11 @@ class LongStrangleScreener(BaseScreener):
 
         results = []
         
-        for date_str, days in target_dates:
+        # Filter & Greeks (shared enriched chain)
+        for date_str, days, calls, puts in self.market.get_enriched_chains(symbol, target_dates, current_price):
             try:
-                calls, puts = self.market.get_chain(symbol, date_str)
                 if calls.empty or puts.empty: continue
                 
-                # Filter & Greeks
-                calls = calls[(calls['bid']>0) & (calls['ask']>0)].copy()
-                puts = puts[(puts['bid']>0) & (puts['ask']>0)].copy()
-                
-                calls['mid'] = (calls['bid']+calls['ask'])/2
-                puts['mid'] = (puts['bid']+puts['ask'])/2
-                
-                calls['time_to_expiry'] = days/365.0
-                puts['time_to_expiry'] = days/365.0
-                
-                calls = calculate_greeks(calls, current_price, 'c')
-                puts = calculate_greeks(puts, current_price, 'p')
-                
                 for t_delta in target_deltas:
                     # Find Call ~ t_delta
                     call_leg = calls.iloc[(calls['delta'] - t_delta).abs().argsort()[:1]]
@@ -101,7 +87,11 @@ class LongStrangleScreener(BaseScreener):
             self.log(f"⚔️ Best Gamma Scalp: {best['Expiry']} (G/T: {best['G/T Ratio']:.1f})")
             
             # Value check
+            # Expiries now arrive in completion order, so take the horizon from target_dates
+            days = target_dates[-1][1]
             cheap_vol = df_sorted[df_sorted['Imp_Move%'] < (curr_hv * 100 * (days/365)**0.5)]
             if not cheap_vol.empty:
                 val = cheap_vol.iloc[0]
                 self.log(f"💎 Undervalued Volatility found: {val['Expiry']} (Implied Move {val['Imp_Move%']:.2f}%)")
+
+        return df_sorted
@@ -1,6 +1,5 @@
 import pandas as pd
 from options_runner.screeners.base_screener import BaseScreener
-from options_runner.utils.option_math import calculate_greeks
 
 class ShortStrangleScreener(BaseScreener):
     def run(self, symbol, min_days=30, max_days=60, target_deltas=[0.16, 0.20, 0.30]):
@@ -24,23 +23,11 @@ class ShortStrangleScreener(BaseScreener):
 
         results = []
         
-        for date_str, days in target_dates:
+        # Filter & Greeks (shared enriched chain)
+        for date_str, days, calls, puts in self.market.get_enriched_chains(symbol, target_dates, current_price):
             try:
-                calls, puts = self.market.get_chain(symbol, date_str)
                 if calls.empty or puts.empty: continue
                 
-                calls = calls[(calls['bid'] > 0) & (calls['ask'] > 0)].copy()
-                puts = puts[(puts['bid'] > 0) & (puts['ask'] > 0)].copy()
-                
-                calls['mid'] = (calls['bid'] + calls['ask']) / 2
-                puts['mid'] = (puts['bid'] + puts['ask']) / 2
-                
-                calls['time_to_expiry'] = days / 365.0
-                puts['time_to_expiry'] = days / 365.0
-                
-                calls = calculate_greeks(calls, current_price, 'c')
-                puts = calculate_greeks(puts, current_price, 'p')
-                
                 for t_delta in target_deltas:
                     # Closest Call to t_delta
                     call_leg = calls.iloc[(calls['delta'] - t_delta).abs().argsort()[:1]]
@@ -96,3 +83,5 @@ class ShortStrangleScreener(BaseScreener):
         if not df.empty:
             best = df.iloc[0]
             self.log(f"🛡️ Top Pick: {best['Expiry']} (Delta {best['Target Delta']}) | Daily Theta: ${best['Theta_Daily']:.2f}")
+
+        return df
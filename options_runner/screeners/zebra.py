@@ -1,9 +1,9 @@
 import pandas as pd
+import numpy as np
 from options_runner.screeners.base_screener import BaseScreener
-from options_runner.utils.option_math import calculate_greeks
 
 class ZebraScreener(BaseScreener):
-    def run(self, symbol, min_days=60, max_days=180, threshold_pct=1.0):
+    def run(self, symbol, min_days=60, max_days=180, threshold_pct=1.0, top_k=20):
         self.log_header(f"{symbol} ZEBRA Strategy (Zero Extrinsic Bullish Risk Adjustment)")
         
         # 1. Market Data
@@ -28,58 +28,66 @@ class ZebraScreener(BaseScreener):
         results = []
 
         def calculate_extrinsic(price, strike, spot):
-            intrinsic = max(0, spot - strike)
+            intrinsic = np.maximum(0, spot - strike)
             return price - intrinsic
 
-        for date_str, days in target_dates:
+        # Filtered, mid-priced, Greek-enriched chain (shared across screeners)
+        for date_str, days, calls, _ in self.market.get_enriched_chains(symbol, target_dates, current_price):
             try:
-                calls, _ = self.market.get_chain(symbol, date_str)
                 if calls.empty: continue
                 
-                calls = calls[(calls['bid'] > 0) & (calls['ask'] > 0)].copy()
-                calls['mid'] = (calls['bid'] + calls['ask']) / 2
-                calls['time_to_expiry'] = days / 365.0
-                
-                # Calculate Greeks
-                calls = calculate_greeks(calls, current_price, 'c')
-                
                 # Filter candidates for ZEBRA (2x ITM Long, 1x ATM Short)
                 # Long: ~0.75 delta (0.65-0.85)
                 # Short: ~0.50 delta (0.40-0.60)
                 long_candidates = calls[(calls['delta'] >= 0.65) & (calls['delta'] <= 0.85)]
                 short_candidates = calls[(calls['delta'] >= 0.40) & (calls['delta'] <= 0.60)]
                 
-                for _, long_row in long_candidates.iterrows():
-                    l_ext = calculate_extrinsic(long_row['mid'], long_row['strike'], current_price)
-                    
-                    for _, short_row in short_candidates.iterrows():
-                        if short_row['strike'] <= long_row['strike']: continue
-                        
-                        s_ext = calculate_extrinsic(short_row['mid'], short_row['strike'], current_price)
-                        
-                        # ZEBRA formula: Net Ext = 2*Long_Ext - 1*Short_Ext
-                        net_extrinsic = (2 * l_ext) - s_ext
-                        
-                        if abs(net_extrinsic) > dynamic_threshold: continue
-                        
-                        # Metrics
-                        total_debit = (2 * long_row['mid']) - short_row['mid']
-                        net_delta = (2 * long_row['delta']) - short_row['delta']
-                        
-                        # ZEBRA theta should be near 0
-                        net_theta = (2 * long_row['theta']) - short_row['theta'] 
-                        
-                        results.append({
-                            'Expiry': date_str,
-                            'Days': days,
-                            'Long_Strike': long_row['strike'],
-                            'Short_Strike': short_row['strike'],
-                            'Debit': total_debit,
-                            'Net_Delta': net_delta,
-                            'Net_Theta': net_theta,
-                            'Net_Extrinsic': net_extrinsic,
-                            'Leverage': (net_delta * current_price) / total_debit
-                        })
+                if long_candidates.empty or short_candidates.empty: continue
+                
+                l_strike = long_candidates['strike'].to_numpy()
+                l_mid = long_candidates['mid'].to_numpy()
+                s_strike = short_candidates['strike'].to_numpy()
+                s_mid = short_candidates['mid'].to_numpy()
+                
+                l_ext = calculate_extrinsic(l_mid, l_strike, current_price)
+                s_ext = calculate_extrinsic(s_mid, s_strike, current_price)
+                
+                # 2-D grid: rows = long legs, columns = short legs
+                # ZEBRA formula: Net Ext = 2*Long_Ext - 1*Short_Ext
+                net_extrinsic = (2 * l_ext[:, None]) - s_ext[None, :]
+                mask = (s_strike[None, :] > l_strike[:, None]) & ~(np.abs(net_extrinsic) > dynamic_threshold)
+                
+                # Row-major nonzero keeps the long -> short ordering of a nested loop
+                li, si = np.nonzero(mask)
+                if len(li) == 0: continue
+                
+                # Top-K closest to zero extrinsic per expiry (partial sort, order preserved)
+                if top_k and len(li) > top_k:
+                    keep = np.argpartition(np.abs(net_extrinsic[li, si]), top_k - 1)[:top_k]
+                    keep.sort()
+                    li, si = li[keep], si[keep]
+                
+                # Metrics
+                total_debit = (2 * l_mid[li]) - s_mid[si]
+                net_delta = (2 * long_candidates['delta'].to_numpy()[li]) - short_candidates['delta'].to_numpy()[si]
+                
+                # ZEBRA theta should be near 0
+                net_theta = (2 * long_candidates['theta'].to_numpy()[li]) - short_candidates['theta'].to_numpy()[si]
+                
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    leverage = (net_delta * current_price) / total_debit
+                
+                results.append(pd.DataFrame({
+                    'Expiry': date_str,
+                    'Days': days,
+                    'Long_Strike': l_strike[li],
+                    'Short_Strike': s_strike[si],
+                    'Debit': total_debit,
+                    'Net_Delta': net_delta,
+                    'Net_Theta': net_theta,
+                    'Net_Extrinsic': net_extrinsic[li, si],
+                    'Leverage': leverage
+                }))
             
             except Exception:
                 continue
@@ -88,7 +96,7 @@ class ZebraScreener(BaseScreener):
             self.log(f"No ZEBRA combinations found within {threshold_pct}% extrinsic limit.")
             return
 
-        df = pd.DataFrame(results)
+        df = pd.concat(results, ignore_index=True)
         # Sort by Net Extrinsic closest to 0
         df = df.sort_values(by='Net_Extrinsic', key=lambda x: x.abs())
         
@@ -100,3 +108,5 @@ class ZebraScreener(BaseScreener):
         self.log(f"🌟 Best Pick: {best['Expiry']} | Buy 2x {best['Long_Strike']}C / Sell 1x {best['Short_Strike']}C")
         self.log(f"   Net Extrinsic: ${best['Net_Extrinsic']:.2f}")
         self.log(f"   Net Theta: {best['Net_Theta']:.4f} (Time decay eliminated!)")
+
+        return df
@@ -0,0 +1,144 @@
+import os
+import shutil
+import time
+from datetime import datetime
+import pandas as pd
+from options_runner.config import CHAIN_CACHE_DIR, CHAIN_CACHE_TTL_SECONDS, CHAIN_CACHE_MAX_SNAPSHOTS
+
+# Microsecond resolution: two downloads in the same second must not share an id
+SNAPSHOT_FORMAT = "%Y%m%dT%H%M%S%f"
+LEGACY_SNAPSHOT_FORMAT = "%Y%m%dT%H%M%S"
+# A calls / puts file without its pair older than this is a leftover of a failed put
+ORPHAN_GRACE_SECONDS = 60
+
+class ChainCache:
+    """
+    Disk-backed option chain cache.
+
+    Layout: {root}/{SYMBOL}/{expiry}/{snapshot}_calls.parquet (+ _puts.parquet)
+    Each download is stored as a new snapshot, so older versions stay readable
+    until they are pruned (only the newest `max_snapshots` are kept).
+    """
+    def __init__(self, root=CHAIN_CACHE_DIR, ttl_seconds=CHAIN_CACHE_TTL_SECONDS, max_snapshots=CHAIN_CACHE_MAX_SNAPSHOTS):
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+        self.max_snapshots = max_snapshots
+
+    def _expiry_dir(self, symbol, date_str):
+        return os.path.join(self.root, symbol.upper(), date_str)
+
+    def list_snapshots(self, symbol, date_str):
+        """
+        Returns complete snapshot ids (newest first) for a (symbol, expiry).
+        A snapshot counts as complete only when both calls and puts files exist.
+        """
+        folder = self._expiry_dir(symbol, date_str)
+        if not os.path.isdir(folder):
+            return []
+        files = set(os.listdir(folder))
+        snapshots = []
+        for name in files:
+            if not name.endswith("_calls.parquet"):
+                continue
+            snap = name[:-len("_calls.parquet")]
+            if f"{snap}_puts.parquet" in files:
+                snapshots.append(snap)
+        return sorted(snapshots, reverse=True)
+
+    @staticmethod
+    def snapshot_time(snapshot):
+        fmt = SNAPSHOT_FORMAT if len(snapshot) > len("YYYYmmddTHHMMSS") else LEGACY_SNAPSHOT_FORMAT
+        return datetime.strptime(snapshot, fmt).timestamp()
+
+    def snapshot_age(self, snapshot):
+        return time.time() - self.snapshot_time(snapshot)
+
+    def get(self, symbol, date_str, max_age=None):
+        """
+        Returns (calls, puts, snapshot) of the newest snapshot younger than
+        max_age seconds (defaults to the cache TTL), or None on a miss.
+        """
+        ttl = self.ttl_seconds if max_age is None else max_age
+        if not ttl or ttl <= 0:
+            return None
+
+        snapshots = self.list_snapshots(symbol, date_str)
+        if not snapshots:
+            return None
+
+        latest = snapshots[0]
+        if self.snapshot_age(latest) > ttl:
+            return None
+
+        return self.load(symbol, date_str, latest) + (latest,)
+
+    def load(self, symbol, date_str, snapshot):
+        """Reads a specific snapshot version back as (calls, puts)."""
+        folder = self._expiry_dir(symbol, date_str)
+        calls = pd.read_parquet(os.path.join(folder, f"{snapshot}_calls.parquet"))
+        puts = pd.read_parquet(os.path.join(folder, f"{snapshot}_puts.parquet"))
+        return calls, puts
+
+    def put(self, symbol, date_str, calls, puts):
+        """
+        Stores a freshly downloaded chain as a new snapshot and returns its id.
+        Both sides are written to temp names first and only then renamed, so
+        readers never see a half-written snapshot; the calls file lands last
+        and marks completion. On failure every file of the snapshot is removed.
+        """
+        folder = self._expiry_dir(symbol, date_str)
+        os.makedirs(folder, exist_ok=True)
+
+        snapshot = datetime.now().strftime(SNAPSHOT_FORMAT)
+        paths = []
+        try:
+            for side, frame in (("puts", puts), ("calls", calls)):
+                final_path = os.path.join(folder, f"{snapshot}_{side}.parquet")
+                tmp_path = f"{final_path}.{os.getpid()}.tmp"
+                paths += [tmp_path, final_path]
+                frame.to_parquet(tmp_path, index=False)
+            for tmp_path, final_path in zip(paths[::2], paths[1::2]):
+                os.replace(tmp_path, final_path)
+        except BaseException:
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            raise
+
+        self.prune(symbol, date_str)
+        return snapshot
+
+    def prune(self, symbol, date_str):
+        """
+        Drops all but the newest `max_snapshots` versions of a chain, and
+        calls / puts files left without their pair (older than ORPHAN_GRACE_SECONDS).
+        """
+        folder = self._expiry_dir(symbol, date_str)
+        complete = self.list_snapshots(symbol, date_str)
+        if os.path.isdir(folder):
+            for name in os.listdir(folder):
+                snap, sep, side = name.rpartition("_")
+                if not sep or side not in ("calls.parquet", "puts.parquet") or snap in complete:
+                    continue
+                try:
+                    if self.snapshot_age(snap) > ORPHAN_GRACE_SECONDS:
+                        os.remove(os.path.join(folder, name))
+                except (ValueError, OSError):
+                    pass
+
+        if not self.max_snapshots or self.max_snapshots <= 0:
+            return
+        for snap in complete[self.max_snapshots:]:
+            for side in ("calls", "puts"):
+                try:
+                    os.remove(os.path.join(folder, f"{snap}_{side}.parquet"))
+                except OSError:
+                    pass
+
+    def clear(self, symbol=None):
+        """Removes cached chains for one symbol, or the whole cache."""
+        target = self.root if symbol is None else os.path.join(self.root, symbol.upper())
+        if os.path.isdir(target):
+            shutil.rmtree(target)
@@ -0,0 +1,133 @@
+import numpy as np
+from scipy.special import ndtr
+
+SQRT_2PI = np.sqrt(2 * np.pi)
+
+def _is_call(option_type, shape):
+    flags = np.broadcast_to(np.asarray(option_type), shape)
+    return np.char.lower(flags.astype(str)) == 'c'
+
+def bs_price_vega(S, K, T, r, sigma, is_call):
+    """Black-Scholes price and vega (q=0), element-wise over numpy arrays."""
+    sqrt_t = np.sqrt(T)
+    sig_sqrt_t = sigma * sqrt_t
+    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / sig_sqrt_t
+    d2 = d1 - sig_sqrt_t
+    disc_k = K * np.exp(-r * T)
+
+    call = S * ndtr(d1) - disc_k * ndtr(d2)
+    put = call - S + disc_k # put-call parity
+    vega = S * np.exp(-0.5 * d1 ** 2) / SQRT_2PI * sqrt_t
+    return np.where(is_call, call, put), vega
+
+def initial_guess(price, S, K, T, r, is_call):
+    """
+    Rational starting point: Corrado-Miller, falling back to
+    Brenner-Subrahmanyam where the Corrado-Miller root is undefined.
+    Puts are mapped to the equivalent call price via put-call parity.
+    """
+    disc_k = K * np.exp(-r * T)
+    call_price = np.where(is_call, price, price + S - disc_k)
+
+    half_gap = call_price - (S - disc_k) / 2
+    radicand = half_gap ** 2 - (S - disc_k) ** 2 / np.pi
+    cm = np.sqrt(2 * np.pi / T) / (S + disc_k) * (half_gap + np.sqrt(np.maximum(radicand, 0)))
+    bs = np.sqrt(2 * np.pi / T) * call_price / S
+    return np.where((radicand >= 0) & (cm > 0), cm, bs)
+
+def implied_volatility(price, S, K, T, r, option_type='c', sigma0=None,
+                       tol=1e-10, max_iter=100, sigma_min=1e-4, sigma_max=10.0, full_output=False):
+    """
+    Batched Black-Scholes implied volatility (q=0).
+
+    Every element keeps its own [lo, hi] bracket. Each iteration takes a Newton
+    step, falling back to bisection when the step leaves the bracket or vega
+    vanishes (deep ITM/OTM), so it cannot diverge the way plain Newton does.
+    Converged elements drop out of the working set.
+
+    Args:
+        price, S, K, T, r: scalars or arrays (broadcast together).
+        option_type: 'c'/'p', scalar or array.
+        sigma0: optional warm-start sigmas (e.g. the previous snapshot of the
+            same contract). NaN entries fall back to the rational guess.
+        tol: absolute price tolerance.
+        full_output: also return (converged mask, iterations used).
+
+    Returns:
+        numpy array of IVs. NaN wherever no IV can be trusted: prices with no
+        time value (zero or at / below intrinsic), prices above the
+        no-arbitrage upper bound, IVs outside [sigma_min, sigma_max], and
+        elements that did not converge within max_iter.
+    """
+    price, S, K, T, r = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (price, S, K, T, r)))
+    shape = price.shape
+    price, S, K, T, r = (x.ravel() for x in (price, S, K, T, r))
+    is_call = _is_call(option_type, shape).ravel()
+
+    n = price.size
+    iv = np.full(n, np.nan)
+    converged = np.zeros(n, dtype=bool)
+    iterations = np.zeros(n, dtype=int)
+
+    # No-arbitrage bounds: intrinsic (discounted) < price < upper bound
+    disc_k = K * np.exp(-r * T)
+    lower = np.where(is_call, np.maximum(S - disc_k, 0), np.maximum(disc_k - S, 0))
+    upper = np.where(is_call, S, disc_k)
+    valid = np.isfinite(price) & (T > 0) & (S > 0) & (K > 0) & (price > lower) & (price < upper)
+
+    idx = np.flatnonzero(valid)
+    if idx.size == 0:
+        return (iv.reshape(shape), converged.reshape(shape), iterations.reshape(shape)) if full_output else iv.reshape(shape)
+
+    p, s, k, t, rr, c = price[idx], S[idx], K[idx], T[idx], r[idx], is_call[idx]
+    lo = np.full(idx.size, sigma_min)
+    hi = np.full(idx.size, sigma_max)
+
+    # Prices outside [price(sigma_min), price(sigma_max)] have no IV in range (stay NaN)
+    p_lo, _ = bs_price_vega(s, k, t, rr, lo, c)
+    p_hi, _ = bs_price_vega(s, k, t, rr, hi, c)
+    in_range = (p >= p_lo - tol) & (p <= p_hi + tol)
+    idx, p, s, k, t, rr, c, lo, hi = (x[in_range] for x in (idx, p, s, k, t, rr, c, lo, hi))
+
+    sigma = initial_guess(p, s, k, t, rr, c)
+    if sigma0 is not None:
+        warm = np.broadcast_to(np.asarray(sigma0, dtype=float), shape).ravel()[idx]
+        sigma = np.where(np.isfinite(warm) & (warm > 0), warm, sigma)
+    sigma = np.clip(np.nan_to_num(sigma, nan=0.5), lo, hi)
+
+    for it in range(1, max_iter + 1):
+        if idx.size == 0:
+            break
+
+        model, vega = bs_price_vega(s, k, t, rr, sigma, c)
+        diff = model - p
+
+        done = (np.abs(diff) < tol) | (hi - lo < 1e-12)
+        if done.any():
+            iv[idx[done]] = sigma[done]
+            converged[idx[done]] = True
+            iterations[idx[done]] = it
+            keep = ~done
+            idx, p, s, k, t, rr, c, lo, hi, sigma, diff, vega = (
+                x[keep] for x in (idx, p, s, k, t, rr, c, lo, hi, sigma, diff, vega))
+            if idx.size == 0:
+                break
+
+        # Price is increasing in sigma: tighten the bracket around the root
+        too_high = diff > 0
+        hi = np.where(too_high, sigma, hi)
+        lo = np.where(too_high, lo, sigma)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            newton = sigma - diff / vega
+        safe = np.isfinite(newton) & (newton > lo) & (newton < hi)
+        sigma = np.where(safe, newton, 0.5 * (lo + hi))
+
+    # Whatever is left hit max_iter: unconverged, left as NaN
+    if idx.size:
+        iterations[idx] = max_iter
+
+    iv = iv.reshape(shape)
+    if full_output:
+        return iv, converged.reshape(shape), iterations.reshape(shape)
+    return iv
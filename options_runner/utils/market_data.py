@@ -2,11 +2,29 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from options_runner.utils.option_math import calculate_greeks
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from options_runner.config import (
+    RISK_FREE_RATE, CHAIN_FETCH_WORKERS, CHAIN_FETCH_MAX_REQUESTS_PER_SEC, ENRICHED_MEMO_MAX_SYMBOLS
+)
+from options_runner.utils.option_math import calculate_greeks, enrich_chain
+from options_runner.utils.chain_cache import ChainCache
+from options_runner.utils.rate_limit import get_host_limiter
+
+YAHOO_HOST = "query2.finance.yahoo.com"
 
 class MarketDataService:
-    def __init__(self):
+    def __init__(self, chain_cache=None, use_disk_cache=True):
         self._tickers = {} # Cache tickers
+        # Disk-backed chain cache survives across processes / screener runs
+        if chain_cache is None and use_disk_cache:
+            chain_cache = ChainCache()
+        self.chain_cache = chain_cache
+        # Per symbol, LRU-bounded to ENRICHED_MEMO_MAX_SYMBOLS:
+        #   'chains': (expiry, rate) -> (spot, calls, puts), enriched chains shared by all screeners
+        #             (only the latest spot per expiry is kept)
+        #   'iv':     contractSymbol -> last solved IV, used to warm-start later IV solves
+        self._memo = OrderedDict()
 
     def get_ticker(self, symbol):
         if symbol not in self._tickers:
@@ -76,9 +94,142 @@ class MarketDataService:
                 target_dates.append((d_str, days))
         return target_dates
 
-    def get_chain(self, symbol, date_str):
+    def get_chain(self, symbol, date_str, max_age=None):
+        """
+        Returns (calls, puts) for one expiry.
+        Served from the disk cache when a snapshot younger than the TTL
+        (or max_age seconds) exists, otherwise downloaded and stored.
+        """
+        if self.chain_cache is not None:
+            try:
+                cached = self.chain_cache.get(symbol, date_str, max_age=max_age)
+                if cached is not None:
+                    calls, puts, _ = cached
+                    return calls, puts
+            except Exception as e:
+                print(f"⚠️ Chain cache read failed for {symbol} {date_str}: {e}")
+
+        calls, puts = self._download_chain(symbol, date_str)
+
+        if self.chain_cache is not None:
+            try:
+                self.chain_cache.put(symbol, date_str, calls, puts)
+            except Exception as e:
+                print(f"⚠️ Chain cache write failed for {symbol} {date_str}: {e}")
+
+        return calls, puts
+
+    def _download_chain(self, symbol, date_str):
+        # All chain requests share one per-host limiter, across threads
+        get_host_limiter(YAHOO_HOST, CHAIN_FETCH_MAX_REQUESTS_PER_SEC).acquire()
         tk = self.get_ticker(symbol)
         opts = tk.option_chain(date_str)
-        calls = opts.calls.copy()
-        puts = opts.puts.copy()
-        return calls, puts
+        return opts.calls.copy(), opts.puts.copy()
+
+    def get_chains(self, symbol, dates, max_workers=CHAIN_FETCH_WORKERS):
+        """
+        Bulk version of get_chain.
+
+        Args:
+            dates: list of (date_str, days) tuples, as returned by get_option_dates.
+
+        Yields (date_str, days, calls, puts) as each download completes, so the
+        caller can process one expiry while the rest are still in flight.
+        Expiries that fail to download are skipped.
+        """
+        if not dates:
+            return
+
+        self.get_ticker(symbol) # Create the shared yf.Ticker before fanning out
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(dates))))
+        try:
+            futures = {
+                executor.submit(self.get_chain, symbol, date_str): (date_str, days)
+                for date_str, days in dates
+            }
+            for future in as_completed(futures):
+                date_str, days = futures[future]
+                try:
+                    calls, puts = future.result()
+                except Exception:
+                    continue
+                yield date_str, days, calls, puts
+        finally:
+            # Consumer may stop early: drop whatever has not started yet
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _symbol_memo(self, symbol):
+        memo = self._memo.get(symbol)
+        if memo is None:
+            memo = self._memo[symbol] = {'chains': {}, 'iv': {}}
+            while len(self._memo) > ENRICHED_MEMO_MAX_SYMBOLS:
+                self._memo.popitem(last=False)
+        self._memo.move_to_end(symbol)
+        return memo
+
+    def _memoized(self, memo, date_str, current_price, rate):
+        entry = memo['chains'].get((date_str, rate))
+        if entry is not None and entry[0] == round(float(current_price), 4):
+            return entry[1], entry[2]
+        return None
+
+    def _memoize(self, memo, date_str, current_price, rate, calls, puts):
+        memo['chains'][(date_str, rate)] = (round(float(current_price), 4), calls, puts)
+
+    def get_enriched_chain(self, symbol, date_str, days, current_price, rate=RISK_FREE_RATE):
+        """
+        Returns (calls, puts) filtered to two-sided quotes with 'mid',
+        'time_to_expiry', IV and Greeks already computed.
+
+        Memoized on (symbol, expiry, spot, rate), so running several screeners
+        against one service costs a single IV solve per contract.
+        Callers receive copies and may add or overwrite columns freely.
+        """
+        memo = self._symbol_memo(symbol)
+        cached = self._memoized(memo, date_str, current_price, rate)
+        if cached is None:
+            calls, puts = self.get_chain(symbol, date_str)
+            calls = enrich_chain(calls, days, current_price, 'c', rate=rate, iv_memory=memo['iv'])
+            puts = enrich_chain(puts, days, current_price, 'p', rate=rate, iv_memory=memo['iv'])
+            self._memoize(memo, date_str, current_price, rate, calls, puts)
+            cached = (calls, puts)
+
+        calls, puts = cached
+        return calls.copy(), puts.copy()
+
+    def get_enriched_chains(self, symbol, dates, current_price, rate=RISK_FREE_RATE, max_workers=CHAIN_FETCH_WORKERS):
+        """
+        Bulk version of get_enriched_chain.
+
+        Memoized expiries are yielded first; the rest are downloaded concurrently
+        via get_chains and enriched here as they arrive, overlapping the Greek
+        computation with the remaining downloads.
+        Yields (date_str, days, calls, puts).
+        """
+        memo = self._symbol_memo(symbol)
+        pending = []
+        for date_str, days in dates:
+            cached = self._memoized(memo, date_str, current_price, rate)
+            if cached is not None:
+                calls, puts = cached
+                yield date_str, days, calls.copy(), puts.copy()
+            else:
+                pending.append((date_str, days))
+
+        for date_str, days, calls, puts in self.get_chains(symbol, pending, max_workers=max_workers):
+            try:
+                calls = enrich_chain(calls, days, current_price, 'c', rate=rate, iv_memory=memo['iv'])
+                puts = enrich_chain(puts, days, current_price, 'p', rate=rate, iv_memory=memo['iv'])
+            except Exception:
+                continue
+            self._memoize(memo, date_str, current_price, rate, calls, puts)
+            yield date_str, days, calls.copy(), puts.copy()
+
+    def clear_enriched_cache(self):
+        """Drops memoized chains; solved IVs are kept as warm starts for the re-screen."""
+        for memo in self._memo.values():
+            memo['chains'].clear()
+
+    def forget(self, symbol):
+        """Drops every in-memory result for one symbol (chains and IV warm starts)."""
+        self._memo.pop(symbol, None)
@@ -1,7 +1,11 @@
-from py_vollib_vectorized import vectorized_implied_volatility, get_all_greeks
+import numpy as np
+from py_vollib_vectorized import get_all_greeks
 from options_runner.config import RISK_FREE_RATE
+from options_runner.utils.iv_solver import implied_volatility
 
-def calculate_greeks(df, current_price, option_type='c', model='black_scholes'):
+GREEK_COLUMNS = ['iv', 'delta', 'theta', 'vega', 'gamma', 'rho']
+
+def calculate_greeks(df, current_price, option_type='c', model='black_scholes', rate=RISK_FREE_RATE, iv_guess=None):
     """
     Calculates IV and Greeks for a DataFrame of options.
     
@@ -10,20 +14,26 @@ def calculate_greeks(df, current_price, option_type='c', model='black_scholes'):
         current_price: Underlying price.
         option_type: 'c' for call, 'p' for put.
         model: Pricing model.
+        rate: Risk-free rate.
+        iv_guess: Optional warm-start IVs aligned with df (NaN = no guess).
         
     Returns:
         DataFrame with added columns: 'iv', 'delta', 'theta', 'vega', 'gamma', 'rho'
     """
-    # Calculate IV
-    df['iv'] = vectorized_implied_volatility(
-        df['mid'], 
-        current_price, 
-        df['strike'], 
-        df['time_to_expiry'], 
-        RISK_FREE_RATE, 
-        option_type, 
-        q=0, 
-        return_as='numpy'
+    if df.empty:
+        for col in GREEK_COLUMNS:
+            df[col] = np.nan
+        return df
+
+    # Calculate IV (batched safeguarded Newton, warm-started when a guess is given)
+    df['iv'] = implied_volatility(
+        df['mid'].to_numpy(),
+        current_price,
+        df['strike'].to_numpy(),
+        df['time_to_expiry'].to_numpy(),
+        rate,
+        option_type,
+        sigma0=None if iv_guess is None else np.asarray(iv_guess, dtype=float)
     )
     
     # Calculate Greeks
@@ -32,7 +42,7 @@ def calculate_greeks(df, current_price, option_type='c', model='black_scholes'):
         current_price, 
         df['strike'], 
         df['time_to_expiry'], 
-        RISK_FREE_RATE, 
+        rate, 
         df['iv'], 
         q=0, 
         model=model, 
@@ -46,3 +56,50 @@ def calculate_greeks(df, current_price, option_type='c', model='black_scholes'):
     df['rho'] = greeks['rho']
     
     return df
+
+def enrich_chain(df, days, current_price, option_type='c', rate=RISK_FREE_RATE, iv_memory=None):
+    """
+    Standard screener preparation for one side of a chain:
+    drop quotes without a two-sided market, add 'mid' and 'time_to_expiry',
+    then solve IV and Greeks.
+
+    iv_memory: optional dict {contractSymbol: iv}. Known contracts warm-start
+    the IV solve from their last value, and the dict is updated with the new IVs.
+    """
+    df = df[(df['bid'] > 0) & (df['ask'] > 0)].copy()
+    df['mid'] = (df['bid'] + df['ask']) / 2
+    df['time_to_expiry'] = days / 365.0
+
+    use_memory = iv_memory is not None and 'contractSymbol' in df.columns
+    iv_guess = df['contractSymbol'].map(iv_memory) if use_memory and iv_memory else None
+    df = calculate_greeks(df, current_price, option_type, rate=rate, iv_guess=iv_guess)
+
+    if use_memory and not df.empty:
+        solved = df[df['iv'] > 0]
+        iv_memory.update(zip(solved['contractSymbol'], solved['iv']))
+    return df
+
+def match_strikes(strikes, targets):
+    """
+    Vectorized exact strike lookup (array join on a sorted strike index).
+
+    Args:
+        strikes: strikes of one chain side, in chain order.
+        targets: strikes to look up.
+
+    Returns:
+        (positions, found): positions index into `strikes` (first match in
+        chain order, like a boolean filter + iloc[0]); found marks targets
+        that exist on the chain. Positions where found is False are arbitrary.
+    """
+    strikes = np.asarray(strikes, dtype=float)
+    targets = np.asarray(targets, dtype=float)
+    if len(strikes) == 0:
+        return np.zeros(len(targets), dtype=int), np.zeros(len(targets), dtype=bool)
+
+    order = np.argsort(strikes, kind='stable')
+    sorted_strikes = strikes[order]
+    pos = np.searchsorted(sorted_strikes, targets, side='left')
+    pos_clipped = np.minimum(pos, len(strikes) - 1)
+    found = (pos < len(strikes)) & (sorted_strikes[pos_clipped] == targets)
+    return order[pos_clipped], found
@@ -0,0 +1,46 @@
+import threading
+import time
+
+class RateLimiter:
+    """
+    Thread-safe minimum-interval limiter: at most `max_per_sec` acquisitions
+    per second, shared by every thread that uses the same instance.
+    """
+    def __init__(self, max_per_sec):
+        self.interval = 1.0 / max_per_sec if max_per_sec and max_per_sec > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+# Limiters live in one process only: when N worker processes hit the same host,
+# each one must take 1/N of the budget (see set_process_share).
+_host_limiters = {}
+_host_lock = threading.Lock()
+_process_share = 1
+
+def set_process_share(n_processes):
+    """
+    Called once per worker process (pool initializer) with the pool size: every
+    host limiter of this process is then created at max_per_sec / n_processes,
+    so the whole pool stays within the per-host budget.
+    """
+    global _process_share
+    with _host_lock:
+        _process_share = max(1, int(n_processes))
+        _host_limiters.clear()
+
+def get_host_limiter(host, max_per_sec):
+    """Returns this process's limiter for a host, creating it on first use."""
+    with _host_lock:
+        if host not in _host_limiters:
+            _host_limiters[host] = RateLimiter(max_per_sec / _process_share if max_per_sec else max_per_sec)
+        return _host_limiters[host]
@@ -1,117 +1,269 @@
+import time
+import argparse
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from data.sec_core.SEC_Loader import SEC_Loader
 from data.sec_core.SEC_Parser import SEC_Parser
+from data.sec_core.SEC_ParseCache import SEC_ParseCache
+from data.sec_core.SEC_FactStore import SEC_FactStore
+from data.sec_core.SEC_ParallelParser import SEC_ParallelParser, sort_history
+from data.sec_core.SEC_CompanyFacts import SEC_CompanyFactsLoader
 from data.market_data import Market_Data
 from engines.alpha_engine import Alpha_Engine
 from reporting.reporting import Reporting
 from dashboards.valuation_dashboard import ValuationDashboard
 from dashboards.peer_dashboard import PeerDashboard
+from pipelines.staged_executor import Stage, StagedExecutor
+from pipelines.run_manifest import RunManifest, STAGES
+
+# SECTOR_SCAN 各阶段的线程数: 下载阶段多开, 解析阶段 1 个线程把 filing 分发给进程池,
+# 行情阶段只等待扫描开始时发出的那一次批量行情调用 (价格一次下载, 股本逐个并发查询)
+SCAN_INGEST_WORKERS = 4
+SCAN_PARSE_WORKERS = 1
+SCAN_MARKET_WORKERS = 1
+# 行情 checkpoint 的有效期: 同一 run 内超过这个时间的报价 / Beta 会重新获取
+QUOTE_TTL = 15 * 60
 
 
 def get_fundamental_history(ticker, loader, parser):
     """
     Orchestrates the loading and parsing of filings to build a history.
+    parser: SEC_ParallelParser (process pool) or a plain SEC_Parser (serial).
     """
     # 1. Get all file paths
     # Note: We need to implement get_all_filing_paths in SEC_Loader or use the two calls
     paths_k = loader.get_filing_paths(ticker, "10-K")
     paths_q = loader.get_filing_paths(ticker, "10-Q")
     all_paths = paths_k + paths_q
+
+    if not isinstance(parser, SEC_ParallelParser):
+        parser = SEC_ParallelParser(parser, max_workers=1)
     
-    all_data = []
-    for path in all_paths:
-        data = parser.parse_single_filing(path)
-        if data and 'Period End Date' in data:
-            all_data.append(data)
+    records = [(path, data) for path, data in parser.parse_filings(all_paths)
+               if data and 'Period End Date' in data]
             
-    # 2. Sort by date (descending)
-    all_data.sort(key=lambda x: x.get('Period End Date', '0000-00-00'), reverse=True)
-    return all_data
+    # 2. Sort by date (descending, ties by path)
+    return sort_history(records)
+
+def sector_scan_stages(loader, history_builder, facts_loader, alpha, download_limit, quotes, manifest, history_inputs,
+                       market_inputs, quotes_since):
+    """
+    SECTOR_SCAN as a staged pipeline:
+    ingestion (I/O threads) -> parsing (process pool) -> market data -> analysis.
+    quotes: Future of Market_Data.get_quotes for the tickers without a market checkpoint
+    finished after quotes_since.
+    The final payload per ticker is (cross-section row, market data, history digest, market digest).
+    """
+    def ingest(ticker, _):
+        # 已有 history checkpoint: 跳过下载和解析
+        hit, fundamentals, digest = manifest.lookup(ticker, "history", manifest.key(ticker, "history", *history_inputs))
+        if hit:
+            return fundamentals, digest
+        if facts_loader is not None:
+            # companyfacts JSON: 读文件即得到完整历史, 解析阶段直接透传
+            return facts_loader.get_fundamental_history(ticker, limit_per_form=download_limit), None
+        loader.fetch_filings(ticker, amount=download_limit, incremental=True)
+        return True, None
+
+    def parse(ticker, payload):
+        fetched, digest = payload
+        fundamentals = fetched
+        if digest is None:
+            fundamentals, digest = manifest.cached(ticker, "history", history_inputs, lambda: (
+                fetched if facts_loader is not None else get_fundamental_history(ticker, loader, history_builder)
+            ) or None)
+        if not fundamentals:
+            print(f"⚠️ Skipping {ticker}: Data incomplete.")
+            return None
+        return fundamentals, digest
 
-def run_pipeline(target_tickers, mode="DEEP_DIVE", email="tony.peng@example.com"):
+    def market(ticker, payload):
+        fundamentals, h_digest = payload
+        realtime_data, m_digest = manifest.cached(
+            ticker, "market", market_inputs, lambda: quotes.result().get(ticker.upper()), fresh_since=quotes_since
+        )
+        if not realtime_data:
+            print(f"⚠️ Skipping {ticker}: Data incomplete.")
+            return None
+        return fundamentals, realtime_data, h_digest, m_digest
+
+    def analyze(ticker, payload):
+        fundamentals, realtime_data, h_digest, m_digest = payload
+        print(f"\n📡 Analyzing {ticker}...")
+        return alpha.build_cross_section({ticker: fundamentals}), realtime_data, h_digest, m_digest
+
+    return [
+        Stage("Ingestion", ingest, workers=SCAN_INGEST_WORKERS),
+        Stage("Parsing", parse, workers=SCAN_PARSE_WORKERS),
+        Stage("Market Data", market, workers=SCAN_MARKET_WORKERS),
+        Stage("Analysis", analyze, workers=1),
+    ]
+
+def run_pipeline(target_tickers, mode="DEEP_DIVE", email="tony.peng@example.com", companyfacts_dir=None,
+                 run_id=None, force_stages=()):
+    """
+    companyfacts_dir: folder of extracted companyfacts JSON (bulk companyfacts.zip).
+    When set, fundamentals come from those files instead of downloading and parsing filings.
+
+    run_id: checkpoint name (default: mode + date). Rerunning with the same id resumes:
+    stages already recorded in the run manifest (history, market, metrics, trends) are
+    loaded instead of recomputed; market data is only reused within QUOTE_TTL.
+    force_stages: stages to recompute anyway.
+    """
     # --- Dependencies Injection ---
     loader = SEC_Loader("SmartInvestor_Lab", email)
-    parser = SEC_Parser()
+    # 已解析的 filing 直接走缓存; 所有数值 fact 同时写入 Parquet fact store
+    parser = SEC_Parser(cache=SEC_ParseCache(), fact_store=SEC_FactStore())
+    history_builder = SEC_ParallelParser(parser) # 未缓存的 filing 多进程解析
+    facts_loader = SEC_CompanyFactsLoader(companyfacts_dir, client=loader.incremental_loader.client) if companyfacts_dir else None
     alpha = Alpha_Engine()
     reporting = Reporting()
     
     print(f"\n🚀 System Mode: [{mode}] | Targets: {len(target_tickers)}")
     print("=" * 60)
 
-    batch_results = []
+    download_limit = 12 if mode == "DEEP_DIVE" else 4
 
-    for ticker in target_tickers:
-        print(f"\n📡 Analyzing {ticker}...")
+    # 断点续跑: 每个 ticker 每个阶段的结果都按内容寻址落盘
+    run_id = run_id or f"{mode.lower()}-{time.strftime('%Y%m%d')}"
+    manifest = RunManifest(run_id, force_stages=force_stages)
+    history_source = "companyfacts" if facts_loader is not None else parser.config_hash
+    history_inputs = [run_id, history_source, download_limit]
+    # 行情 checkpoint 只复用 QUOTE_TTL 内获取的 (按 finished_at 判断), 过期的重新拉取 (metrics / trends 随之重算)
+    # 基准时间在运行开始时固定, 同一次运行内的判断保持一致
+    market_inputs = [run_id]
+    quotes_since = time.time() - QUOTE_TTL
+    print(f"🗂️ Run: {run_id}")
+
+    if mode == "SECTOR_SCAN":
+        # 下载 / 解析 / 行情 / 分析 四个阶段流水线并行, 吞吐量取决于最慢的阶段
+        # 整个股票池的价格只下载一次 (宏观数据同样只取一次, 股本逐个并发查询), 与下载 / 解析并行
+        pending_quotes = [t for t in target_tickers
+                          if not manifest.lookup(t, "market", manifest.key(t, "market", *market_inputs),
+                                                 fresh_since=quotes_since)[0]]
+        # 解析进程池在流水线结束 (或出错) 时关闭
+        with ThreadPoolExecutor(max_workers=1) as quote_pool, history_builder:
+            quotes = quote_pool.submit(Market_Data.get_quotes, pending_quotes)
+            executor = StagedExecutor(sector_scan_stages(
+                loader, history_builder, facts_loader, alpha, download_limit, quotes, manifest, history_inputs,
+                market_inputs, quotes_since
+            ))
+            scanned = executor.run((t, None) for t in dict.fromkeys(target_tickers))
+
+        # --- Sector Scan Conclusion ---
+        print("\n🏁 Sector Scan Complete. Preparing Comparison Map...")
+        ordered = [t for t in dict.fromkeys(target_tickers) if t in scanned]
+        if not ordered:
+            print("❌ No valid data collected for sector analysis.")
+            return
+
+        # Alpha Generation: 已有 checkpoint 的直接读取, 其余整个截面一次算完 (列运算)
+        metrics_by_ticker = {}
+        for t in ordered:
+            hit, metrics, _ = manifest.lookup(t, "metrics", manifest.key(t, "metrics", *scanned[t][2:]))
+            if hit:
+                metrics_by_ticker[t] = metrics
+
+        pending = [t for t in ordered if t not in metrics_by_ticker]
+        if pending:
+            df_batch = alpha.process_analysis_batch(
+                pd.concat([scanned[t][0] for t in pending]),
+                pd.DataFrame.from_dict({t: scanned[t][1] for t in pending}, orient='index')
+            )
+            for t, metrics in df_batch.iterrows():
+                metrics_by_ticker[t] = metrics.to_dict()
+                manifest.store(t, "metrics", manifest.key(t, "metrics", *scanned[t][2:]), metrics_by_ticker[t])
+
+        df_scores = pd.DataFrame.from_dict(
+            {t: metrics_by_ticker[t] for t in ordered if t in metrics_by_ticker}, orient='index'
+        ).rename_axis('Ticker')
+
+        # Reporting
+        for ticker, metrics in df_scores.iterrows():
+            reporting.print_institutional_deck(ticker, metrics.to_dict())
+
+        df_peers = df_scores.reset_index()[[
+            'Ticker', 'Market Cap', 'FCF Yield', 'Sequential Growth', 'EV/EBIT', 'P/E Ratio',
+            'Equity Risk Premium (ERP)', 'ROIC'
+        ]].rename(columns={'Equity Risk Premium (ERP)': 'ERP'})
+        
+        print("\n📋 Top Picks by FCF Yield:")
+        pd.options.display.float_format = '{:,.2f}'.format
+        print(df_peers[['Ticker', 'FCF Yield', 'Sequential Growth', 'P/E Ratio']].sort_values(by='FCF Yield', ascending=False))
+        
+        print("\n🎨 Launching Peer Comparison Dashboard...")
+        peer_viz = PeerDashboard()
+        peer_viz.plot_peer_comparison(df_peers)
+        return
+
+    # --- DEEP_DIVE: 逐个 ticker 分析 + 交互式图表 ---
+    # 1. Ingestion: all tickers at once (concurrent, shared SEC rate limit)
+    #    已有 history checkpoint 的 ticker 不再下载
+    to_fetch = [t for t in target_tickers
+                if not manifest.lookup(t, "history", manifest.key(t, "history", *history_inputs))[0]]
+    if facts_loader is None and to_fetch:
         try:
-            # 1. Ingestion
-            download_limit = 12 if mode == "DEEP_DIVE" else 4
-            loader.fetch_filings(ticker, amount=download_limit)
-            
-            # 2. Data Construction
-            fundamentals = get_fundamental_history(ticker, loader, parser)
+            loader.fetch_filings_many(to_fetch, amount=download_limit)
+        except Exception as e:
+            print(f"❌ Download failed: {e}")
+
+    with history_builder: # 解析进程池随循环结束关闭
+        for ticker in target_tickers:
+            print(f"\n📡 Analyzing {ticker}...")
+            try:
+                # 2. Data Construction
+                fundamentals, h_digest = manifest.cached(ticker, "history", history_inputs, lambda: (
+                    facts_loader.get_fundamental_history(ticker, limit_per_form=download_limit)
+                    if facts_loader is not None else get_fundamental_history(ticker, loader, history_builder)
+                ) or None)
             
-            # 3. Market Data
-            realtime_data = Market_Data.get_realtime_market_data(ticker)
+                # 3. Market Data
+                realtime_data, m_digest = manifest.cached(
+                    ticker, "market", market_inputs, lambda: Market_Data.get_realtime_market_data(ticker),
+                    fresh_since=quotes_since
+                )
             
-            if fundamentals and realtime_data:
-                # 4. Alpha Generation
-                metrics = alpha.process_analysis(ticker, fundamentals, realtime_data)
+                if fundamentals and realtime_data:
+                    # 4. Alpha Generation
+                    metrics, _ = manifest.cached(ticker, "metrics", [h_digest, m_digest], lambda: (
+                        alpha.process_analysis(ticker, fundamentals, realtime_data)
+                    ))
                 
-                # 5. Reporting
-                reporting.print_institutional_deck(ticker, metrics)
+                    # 5. Reporting
+                    reporting.print_institutional_deck(ticker, metrics)
 
-                # 6. Visualization / Batching
-                if mode == "DEEP_DIVE":
+                    # 6. Visualization
                     print(f"🎨 Launching Deep Dive Dashboard for {ticker}...")
-                    
-                    df_trends = alpha.process_time_series(ticker, fundamentals, realtime_data)
+                
+                    df_trends, _ = manifest.cached(ticker, "trends", [h_digest, m_digest], lambda: (
+                        alpha.process_time_series(ticker, fundamentals, realtime_data)
+                    ))
                     viz = ValuationDashboard()
-                    
+                
                     if df_trends is not None and not df_trends.empty:
                          print("   (1/2) Showing Historical Trends...")
                          viz.plot_historical_trends(ticker, df_trends)
-                    
+                
                     print("   (2/2) Showing Valuation Snapshot...")
                     viz.plot_dashboard(ticker, metrics)
-                
-                else:
-                    # Collect for peers
-                    summary = {
-                        'Ticker': ticker,
-                        'Market Cap': metrics['Market Cap'],
-                        'FCF Yield': metrics['FCF Yield'],
-                        'Sequential Growth': metrics['Sequential Growth'],
-                        'EV/EBIT': metrics['EV/EBIT'],
-                        'P/E Ratio': metrics['P/E Ratio'],
-                        'ERP': metrics.get('Equity Risk Premium (ERP)', 0),
-                        'ROIC': metrics.get('ROIC', 0)
-                    }
-                    batch_results.append(summary)
-
-            else:
-                print(f"⚠️ Skipping {ticker}: Data incomplete.")
 
-        except Exception as e:
-            print(f"❌ Error analyzing {ticker}: {e}")
-            import traceback
-            traceback.print_exc()
+                else:
+                    print(f"⚠️ Skipping {ticker}: Data incomplete.")
 
-    # --- Sector Scan Conclusion ---
-    if mode == "SECTOR_SCAN":
-        print("\n🏁 Sector Scan Complete. Preparing Comparison Map...")
-        if batch_results:
-            df_peers = pd.DataFrame(batch_results)
-            
-            print("\n📋 Top Picks by FCF Yield:")
-            pd.options.display.float_format = '{:,.2f}'.format
-            print(df_peers[['Ticker', 'FCF Yield', 'Sequential Growth', 'P/E Ratio']].sort_values(by='FCF Yield', ascending=False))
-            
-            print("\n🎨 Launching Peer Comparison Dashboard...")
-            peer_viz = PeerDashboard()
-            peer_viz.plot_peer_comparison(df_peers)
-        else:
-            print("❌ No valid data collected for sector analysis.")
+            except Exception as e:
+                print(f"❌ Error analyzing {ticker}: {e}")
+                import traceback
+                traceback.print_exc()
 
 if __name__ == "__main__":
-    # Example usage
-    run_pipeline(['AAPL'], mode="DEEP_DIVE")
\ No newline at end of file
+    cli = argparse.ArgumentParser(description="SmartInvestor fundamental analysis pipeline")
+    cli.add_argument("tickers", nargs="*", default=["AAPL"], help="Tickers to analyze (default: AAPL)")
+    cli.add_argument("--mode", choices=["DEEP_DIVE", "SECTOR_SCAN"], default="DEEP_DIVE")
+    cli.add_argument("--run-id", default=None, help="Checkpoint name; reuse it to resume a run (default: mode + date)")
+    cli.add_argument("--force-stage", action="append", default=[], choices=STAGES,
+                     help="Recompute this stage for every ticker (repeatable)")
+    cli.add_argument("--companyfacts-dir", default=None, help="Use extracted companyfacts JSON instead of filings")
+    args = cli.parse_args()
+
+    run_pipeline([t.upper() for t in args.tickers], mode=args.mode, companyfacts_dir=args.companyfacts_dir,
+                 run_id=args.run_id, force_stages=args.force_stage)
\ No newline at end of file
@@ -3,7 +3,12 @@ import glob
 import pandas as pd
 from sec_edgar_downloader import Downloader
 from data.sec_core.SEC_Parser import SEC_Parser
+from data.sec_core.SEC_ParseCache import SEC_ParseCache
+from data.sec_core.SEC_FactStore import SEC_FactStore
+from data.sec_core.SEC_ParallelParser import SEC_ParallelParser, sort_history
 from data.market_data import Market_Data
+from data.sec_core.SEC_EdgarClient import SEC_EdgarClient
+from data.sec_core.SEC_IncrementalLoader import SEC_IncrementalLoader
 
 class InstitutionalDataPipeline:
     def __init__(self, company_name, email_address):
@@ -25,17 +30,37 @@ class InstitutionalDataPipeline:
             
         # 3. Initialize Downloader
         self.dl = Downloader(company_name, email_address, self.download_folder)
+        self.incremental_loader = SEC_IncrementalLoader(
+            SEC_EdgarClient(company_name, email_address),
+            os.path.join(self.download_folder, "sec-edgar-filings")
+        )
         
-        # 4. Initialize Parser
-        self.parser = SEC_Parser()
+        # 4. Initialize Parser (parse results and the fact store live next to the downloads)
+        self.fact_store = SEC_FactStore(os.path.join(self.download_folder, "fact_store"))
+        self.parser = SEC_Parser(
+            cache=SEC_ParseCache(os.path.join(self.download_folder, "parse_cache.sqlite")),
+            fact_store=self.fact_store
+        )
+        # Cache misses are parsed on a process pool (created on first use)
+        self.history_builder = SEC_ParallelParser(self.parser)
         
         self.base_dir = self.download_folder
         print(f"📂 [Init] SEC Data Path: {self.download_folder}")
 
-    def fetch_filings(self, ticker, form_type="10-K", amount=1):
+    def fetch_filings(self, ticker, form_type="10-K", amount=1, incremental=False):
         """
         Downloads filings.
+        incremental=True only fetches accessions not yet recorded / on disk.
         """
+        if incremental:
+            print(f"🚀 [Ingestion] Syncing latest {amount} {form_type} for {ticker}...")
+            try:
+                fetched = self.incremental_loader.sync(ticker, [form_type], amount)
+                print(f"✅ Sync complete: {len(fetched)} new filings.")
+            except Exception as e:
+                print(f"❌ Download failed: {e}")
+            return
+
         print(f"🚀 [Ingestion] Downloading latest {amount} {form_type} for {ticker}...")
         try:
             self.dl.get(form_type, ticker, limit=amount)
@@ -48,7 +73,7 @@ class InstitutionalDataPipeline:
         Orchestrates finding and parsing all historical filings (10-K and 10-Q).
         Returns a list of dictionaries (metrics).
         """
-        all_data = []
+        filing_forms = {}
         forms = ["10-K", "10-Q"]
         
         # Structure: sec_data/sec-edgar-filings/{ticker}/{form_type}/{accession_number}/...
@@ -63,21 +88,34 @@ class InstitutionalDataPipeline:
             for item in os.listdir(ticker_root):
                 filing_path = os.path.join(ticker_root, item)
                 if os.path.isdir(filing_path):
-                    # Parse this filing folder
-                    data = self.parser.parse_single_filing(filing_path)
-                    if data:
-                        # Ensure Source is set correctly if parser didn't set it (parser sets it based on path)
-                        # We can enforce it
-                        if data.get('Source') == 'Unknown':
-                            data['Source'] = form
-                        
-                        # Only include if we have a valid date
-                        if 'Period End Date' in data:
-                            all_data.append(data)
+                    filing_forms[filing_path] = form
+
+        # Parse all filing folders (cache hits first, the rest in parallel)
+        records = []
+        for filing_path, data in self.history_builder.parse_filings(list(filing_forms)):
+            if data:
+                # Ensure Source is set correctly if parser didn't set it (parser sets it based on path)
+                # We can enforce it
+                if data.get('Source') == 'Unknown':
+                    data['Source'] = filing_forms[filing_path]
+                
+                # Only include if we have a valid date
+                if 'Period End Date' in data:
+                    records.append((filing_path, data))
+
+        # Sort by date descending (ties by path, deterministic)
+        return sort_history(records)
+
+    def close(self):
+        """Shuts down the parse process pool and the parse cache connection."""
+        self.history_builder.close()
+        self.parser.cache.close()
+
+    def __enter__(self):
+        return self
 
-        # Sort by date descending
-        all_data.sort(key=lambda x: x.get('Period End Date', '0000-00-00'), reverse=True)
-        return all_data
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def get_realtime_market_data(self, ticker):
         """
@@ -95,7 +133,8 @@ class InstitutionalDataPipeline:
 
 if __name__ == "__main__":
     # Test
-    pipeline = InstitutionalDataPipeline("SmartInvestor_Lab", "test@example.com")
-    # pipeline.fetch_filings("AAPL", amount=1)
-    # h = pipeline.get_fundamental_history("AAPL")
-    # print(h)
\ No newline at end of file
+    with InstitutionalDataPipeline("SmartInvestor_Lab", "test@example.com") as pipeline:
+        print(f"📂 Filings under: {pipeline.base_dir}")
+        # pipeline.fetch_filings("AAPL", amount=1)
+        # h = pipeline.get_fundamental_history("AAPL")
+        # print(h)
\ No newline at end of file
@@ -0,0 +1,142 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+import threading
+
+# Per-ticker stages whose outputs are checkpointed, in pipeline order
+STAGES = ("history", "market", "metrics", "trends")
+
+class RunManifest:
+    """
+    Checkpoints of one analysis run, so a crashed run resumes where it stopped.
+
+    Layout:
+        {root}/objects/{digest[:2]}/{digest}.pkl   stage outputs, named by the sha256 of their content
+        {root}/runs/{run_id}.json                  per ticker: stage -> {key, object, finished_at}
+
+    A stage is reused when its recorded key matches. Keys are built from the
+    stage's inputs: upstream stages (history, market) use the run id, so a new
+    run fetches fresh data; downstream stages (metrics, trends) use the object
+    digests of their inputs, so they are recomputed only when an input changed.
+    fresh_since (lookup / cached) additionally rejects entries finished before
+    that time, e.g. market quotes older than a TTL within the same run.
+    force_stages drops the given stages from the manifest before the run.
+    """
+    def __init__(self, run_id, root=None, force_stages=()):
+        if root is None:
+            root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run_cache")
+        self.run_id = run_id
+        self.root = root
+        self.path = os.path.join(root, "runs", f"{run_id}.json")
+        self._lock = threading.Lock()
+
+        unknown = set(force_stages) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown stage(s) {sorted(unknown)}; expected one of {STAGES}")
+
+        self.data = self._load()
+        for stage in force_stages:
+            for entries in self.data['tickers'].values():
+                entries.pop(stage, None)
+        if force_stages:
+            print(f"♻️ [Run {run_id}] Invalidated stage(s): {', '.join(force_stages)}")
+            self.save()
+
+    def _load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"⚠️ [Run {self.run_id}] Corrupt manifest, starting over: {e}")
+        return {'run_id': self.run_id, 'created_at': time.time(), 'tickers': {}}
+
+    def save(self):
+        # Snapshot, write and replace under one lock: otherwise a thread holding an
+        # older snapshot can replace the file after a newer one (lost checkpoints)
+        with self._lock:
+            blob = json.dumps(self.data, indent=2, sort_keys=True)
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(blob)
+            os.replace(tmp_path, self.path)
+
+    # --- Keys & objects ---
+    @staticmethod
+    def key(ticker, stage, *inputs):
+        blob = json.dumps([ticker, stage, *inputs], sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.pkl")
+
+    def _write_object(self, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        digest = hashlib.sha256(blob).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path): # Same content -> same file
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        return digest
+
+    # --- Stage results ---
+    def lookup(self, ticker, stage, key, fresh_since=None):
+        """Returns (hit, value, digest). fresh_since: entries finished before this time are misses."""
+        with self._lock:
+            entry = self.data['tickers'].get(ticker, {}).get(stage)
+        if not entry or entry['key'] != key:
+            return False, None, None
+        if fresh_since is not None and entry.get('finished_at', 0) < fresh_since:
+            return False, None, None
+        try:
+            with open(self._object_path(entry['object']), 'rb') as f:
+                return True, pickle.load(f), entry['object']
+        except Exception:
+            return False, None, None # Object missing / unreadable: recompute
+
+    def store(self, ticker, stage, key, value):
+        digest = self._write_object(value)
+        with self._lock:
+            self.data['tickers'].setdefault(ticker, {})[stage] = {
+                'key': key, 'object': digest, 'finished_at': time.time()
+            }
+        self.save() # Checkpoint right away: a crash later keeps this stage
+        return digest
+
+    def cached(self, ticker, stage, inputs, compute, fresh_since=None):
+        """
+        Returns (value, digest): the checkpointed output if the key matches
+        (and it finished after fresh_since, if given), otherwise compute()
+        (stored unless it is None, i.e. failed / incomplete).
+        """
+        key = self.key(ticker, stage, *inputs)
+        hit, value, digest = self.lookup(ticker, stage, key, fresh_since=fresh_since)
+        if hit:
+            return value, digest
+
+        value = compute()
+        if value is None:
+            return None, None
+        return value, self.store(ticker, stage, key, value)
+
+    def latest(self, ticker, stage):
+        """Last recorded output of a stage regardless of its key (for reporting), or None."""
+        with self._lock:
+            entry = self.data['tickers'].get(ticker, {}).get(stage)
+        if not entry:
+            return None
+        try:
+            with open(self._object_path(entry['object']), 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+
+    def tickers(self):
+        with self._lock:
+            return sorted(self.data['tickers'])
@@ -0,0 +1,105 @@
+import queue
+import threading
+import traceback
+
+# 队列里的结束标记
+_STOP = object()
+
+class Stage:
+    """
+    One step of a StagedExecutor.
+
+    func(key, payload) -> new payload. Returning None drops the item
+    (e.g. "data incomplete"); an exception drops it too and is recorded.
+    workers: number of threads running this stage. I/O stages use several;
+    a CPU stage usually has one thread that hands work to a process pool.
+    """
+    def __init__(self, name, func, workers=1):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+
+class StagedExecutor:
+    """
+    Runs items through a chain of stages connected by bounded queues.
+
+    Every stage works on a different item at the same time, so total time is
+    bounded by the slowest stage instead of the sum of all stages. The bounded
+    queues give backpressure: a fast stage blocks once the next one is
+    `queue_size` items behind, instead of piling up results in memory.
+    """
+    def __init__(self, stages, queue_size=8):
+        self.stages = list(stages)
+        self.queue_size = queue_size
+        self.errors = {} # key -> (stage name, exception)
+        self._errors_lock = threading.Lock()
+
+    def run(self, items):
+        """
+        items: iterable of (key, payload).
+        Returns {key: final payload} for items that made it through every stage,
+        in completion order.
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results = queue.Queue() # Unbounded: the caller only drains it at the end
+        threads = []
+
+        for i, stage in enumerate(self.stages):
+            out_q = queues[i + 1] if i + 1 < len(self.stages) else results
+            next_workers = self.stages[i + 1].workers if i + 1 < len(self.stages) else 1
+            remaining = [stage.workers] # Workers of this stage still running
+            lock = threading.Lock()
+
+            for n in range(stage.workers):
+                t = threading.Thread(
+                    target=self._worker,
+                    args=(stage, queues[i], out_q, next_workers, remaining, lock),
+                    name=f"{stage.name}-{n}",
+                    daemon=True
+                )
+                t.start()
+                threads.append(t)
+
+        # Feed the first stage from the calling thread (blocks when it is full)
+        for key, payload in items:
+            queues[0].put((key, payload))
+        for _ in range(self.stages[0].workers):
+            queues[0].put(_STOP)
+
+        for t in threads:
+            t.join()
+
+        output = {}
+        while True:
+            item = results.get()
+            if item is _STOP: break
+            key, payload = item
+            output[key] = payload
+        return output
+
+    def _worker(self, stage, in_q, out_q, next_workers, remaining, lock):
+        while True:
+            item = in_q.get()
+            if item is _STOP:
+                break
+
+            key, payload = item
+            try:
+                result = stage.func(key, payload)
+            except Exception as e:
+                print(f"❌ [{stage.name}] {key} failed: {e}")
+                traceback.print_exc()
+                with self._errors_lock:
+                    self.errors[key] = (stage.name, e)
+                continue
+
+            if result is not None:
+                out_q.put((key, result))
+
+        # The last worker of a stage to finish closes the next queue
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            for _ in range(next_workers):
+                out_q.put(_STOP)
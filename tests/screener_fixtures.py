@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+from py_vollib_vectorized import vectorized_black_scholes
+
+from options_runner.utils.option_math import enrich_chain
+
+SPOT = 100.0
+RATE = 0.04
+# (expiry, days to expiry): covers every screener's default day window
+EXPIRIES = [("2030-01-11", 14), ("2030-02-01", 35), ("2030-02-22", 56), ("2030-03-22", 84), ("2030-05-17", 140)]
+
+def _side(flag, strikes, days, rng):
+    """Synthetic quotes around a skewed BS price; a few illiquid / one-sided markets."""
+    t = days / 365.0
+    sigma = 0.25 + 0.15 * np.abs(np.log(strikes / SPOT)) - (0.05 * np.log(strikes / SPOT) if flag == 'p' else 0)
+    fair = vectorized_black_scholes(flag, SPOT, strikes, t, RATE, sigma, return_as='numpy')
+    half = 0.01 + fair * rng.uniform(0.005, 0.06, len(strikes))
+    bid = np.round(np.maximum(fair - half, 0), 2)
+    ask = np.round(fair + half, 2) + 0.01
+    wide = rng.random(len(strikes)) < 0.08
+    ask[wide] += np.round(rng.uniform(0.3, 1.5, wide.sum()), 2)
+    bid[rng.random(len(strikes)) < 0.03] = 0.0
+    return pd.DataFrame({
+        'contractSymbol': [f"TST{days:03d}{flag.upper()}{k:08.2f}" for k in strikes],
+        'strike': strikes,
+        'bid': bid,
+        'ask': ask,
+        'volume': rng.integers(0, 2000, len(strikes)),
+        'openInterest': rng.integers(0, 5000, len(strikes)),
+    })
+
+def build_chains(seed=7):
+    """{expiry: (calls, puts)} enriched once, like MarketDataService.get_enriched_chains."""
+    rng = np.random.default_rng(seed)
+    strikes = np.concatenate([np.arange(50.0, 90.0, 5.0), np.arange(90.0, 110.0, 1.0), np.arange(110.0, 155.0, 2.5)])
+    chains = {}
+    for expiry, days in EXPIRIES:
+        calls = enrich_chain(_side('c', strikes, days, rng), days, SPOT, 'c', rate=RATE)
+        puts = enrich_chain(_side('p', strikes, days, rng), days, SPOT, 'p', rate=RATE)
+        chains[expiry] = (calls, puts)
+    return chains
+
+class FakeMarket:
+    """The subset of MarketDataService the screeners use, served from fixed chains."""
+    def __init__(self, chains=None):
+        self.chains = build_chains() if chains is None else chains
+
+    def get_volatility_data(self, symbol):
+        return {'current_price': SPOT, 'iv_rank': 55.0, 'hv_30': 0.22}
+
+    def get_earnings_date(self, symbol):
+        return None
+
+    def get_current_price(self, symbol):
+        return SPOT
+
+    def get_option_dates(self, symbol, min_days=0, max_days=365):
+        return [(e, d) for e, d in EXPIRIES if min_days <= d <= max_days]
+
+    def get_enriched_chains(self, symbol, dates, current_price, **kwargs):
+        for date_str, days in dates:
+            calls, puts = self.chains[date_str]
+            yield date_str, days, calls.copy(), puts.copy()
@@ -0,0 +1,71 @@
+import sys
+import os
+import io
+import contextlib
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.alpha_engine import Alpha_Engine, FLOW_METRICS, STOCK_METRICS
+
+def filing(date, source, scale=1.0, **overrides):
+    f = {'Period End Date': date, 'Source': source}
+    f.update({m: 100.0 * scale for m in FLOW_METRICS})
+    f.update({'COGS': 55.0 * scale, 'Operating Income': 30.0 * scale, 'Net Income': 20.0 * scale,
+              'Operating Cash Flow': 35.0 * scale, 'CapEx': 8.0 * scale, 'Buybacks': 5.0 * scale, 'Dividends': 3.0 * scale})
+    f.update({'R&D': 12.0, 'Stockholders Equity': 500.0, 'Cash': 150.0, 'Long Term Debt': 300.0, 'Short Term Debt': 40.0})
+    f.update(overrides)
+    return f
+
+# 新的在前, 与 SEC history 一致
+UNIVERSE = {
+    # 10-K + 3 个 10-Q: 倒推 Q4, 对比 Q3 (现金流按 YTD 累积报告)
+    'DERIVED': [filing("2023-12-31", "10-K", 4.2, **{'Operating Cash Flow': 150.0}),
+                filing("2023-09-30", "10-Q", 1.1, **{'Operating Cash Flow': 105.0}),
+                filing("2023-06-30", "10-Q", 1.0, **{'Operating Cash Flow': 70.0}),
+                filing("2023-03-31", "10-Q", 0.9, **{'Operating Cash Flow': 35.0})],
+    # 历史不足: 回退到年报, 对比上一份 10-K (AF = 1)
+    'ANNUAL': [filing("2023-12-31", "10-K", 4.0), filing("2023-09-30", "10-Q"), filing("2022-12-31", "10-K", 3.5)],
+    # 只有一份 10-Q: 没有对比期
+    'NOPREV': [filing("2024-03-31", "10-Q")],
+    # 各种分母为 0 / 投入资本为负
+    'ZERO': [filing("2024-03-31", "10-Q", **{'Revenue': 0.0, 'Net Income': 0.0, 'Operating Income': 0.0,
+                                              'Stockholders Equity': -900.0}),
+             filing("2023-12-31", "10-Q", **{'Revenue': 0.0})],
+    'NOCAP': [filing("2024-03-31", "10-Q", 1.2), filing("2023-12-31", "10-Q")],
+}
+MARKET = {
+    'DERIVED': {'Price': 50.0, 'Market Cap': 5000.0, 'Beta': 1.2, 'Risk-Free Rate': 0.04},
+    'ANNUAL': {'Price': 20.0, 'Market Cap': 2000.0, 'Beta': None, 'Risk-Free Rate': 0.045},
+    'NOPREV': {'Price': 10.0, 'Market Cap': 800.0, 'Beta': 0.8, 'Risk-Free Rate': 0.04},
+    'ZERO': {'Price': 5.0, 'Market Cap': 300.0, 'Beta': 1.0, 'Risk-Free Rate': 0.04},
+    'NOCAP': {'Price': 1.0, 'Market Cap': 0.0, 'Beta': 1.5, 'Risk-Free Rate': 0.04},
+}
+
+def test_batch_matches_scalar():
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = pd.DataFrame.from_dict(
+            {t: Alpha_Engine.process_analysis(t, UNIVERSE[t], MARKET[t]) for t in UNIVERSE}, orient='index'
+        )
+        batch = Alpha_Engine.process_analysis_batch(
+            Alpha_Engine.build_cross_section(UNIVERSE), pd.DataFrame.from_dict(MARKET, orient='index')
+        )
+
+    assert list(batch.index) == list(UNIVERSE)
+    assert list(batch.columns) == list(expected.columns)
+    assert (batch['Report Source'] == expected['Report Source']).all()
+    assert (batch['Report Date'] == expected['Report Date']).all()
+    numeric = [c for c in expected.columns if c not in ('Report Date', 'Report Source')]
+    np.testing.assert_allclose(batch[numeric].to_numpy(float), expected[numeric].to_numpy(float), rtol=1e-12)
+
+    # 覆盖到的分支
+    assert list(batch['Report Source']) == ['10-Q', '10-K', '10-Q', '10-Q', '10-Q']
+    assert batch.loc['NOPREV', 'Sequential Growth'] == 0.0 and batch.loc['NOPREV', 'Margin Expansion'] == 0.0
+    assert (batch.loc['ZERO', ['Gross Margin', 'P/E Ratio', 'EV/EBIT', 'ROIC', 'Sequential Growth']] == 0.0).all()
+    assert (batch.loc['NOCAP', ['FCF Yield', 'Buyback Yield', 'Dividend Yield']] == 0.0).all()
+
+if __name__ == "__main__":
+    test_batch_matches_scalar()
+    print("✅ Batch vs scalar process_analysis tests passed.")
@@ -0,0 +1,43 @@
+import sys
+import os
+import tempfile
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from options_runner.utils.chain_cache import ChainCache
+
+CHAIN = pd.DataFrame({'strike': [95.0, 100.0], 'bid': [5.1, 2.0], 'ask': [5.3, 2.2]})
+
+class BrokenFrame:
+    def to_parquet(self, *args, **kwargs):
+        raise OSError("disk full")
+
+def test_same_second_puts_get_distinct_snapshots():
+    with tempfile.TemporaryDirectory() as root:
+        cache = ChainCache(root=root, ttl_seconds=60, max_snapshots=2)
+        ids = [cache.put("TST", "2030-01-18", CHAIN, CHAIN) for _ in range(4)]
+        assert len(set(ids)) == 4
+        assert cache.list_snapshots("TST", "2030-01-18") == ids[:-3:-1]
+        assert cache.get("TST", "2030-01-18")[2] == ids[-1]
+
+def test_failed_put_and_orphans_leave_no_files():
+    with tempfile.TemporaryDirectory() as root:
+        cache = ChainCache(root=root, ttl_seconds=60, max_snapshots=2)
+        snapshot = cache.put("TST", "2030-01-18", CHAIN, CHAIN)
+        folder = os.path.join(root, "TST", "2030-01-18")
+        try:
+            cache.put("TST", "2030-01-18", BrokenFrame(), CHAIN)
+            assert False, "write error must propagate"
+        except OSError:
+            pass
+        # 旧版本 (秒级 id) 留下的孤立 puts 文件
+        CHAIN.to_parquet(os.path.join(folder, "20200101T000000_puts.parquet"))
+        cache.prune("TST", "2030-01-18")
+        assert sorted(os.listdir(folder)) == [f"{snapshot}_calls.parquet", f"{snapshot}_puts.parquet"]
+
+if __name__ == "__main__":
+    test_same_second_puts_get_distinct_snapshots()
+    test_failed_put_and_orphans_leave_no_files()
+    print("✅ Chain cache tests passed.")
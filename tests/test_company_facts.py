@@ -0,0 +1,56 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.sec_core.SEC_CompanyFacts import SEC_CompanyFactsLoader
+
+Q3, FY = "0000000001-23-000030", "0000000001-24-000010"
+
+def fact(accn, form, fp, end, val, start=None):
+    e = {'accn': accn, 'form': form, 'fy': 2023, 'fp': fp, 'end': end, 'val': val}
+    if start:
+        e['start'] = start
+    return e
+
+COMPANY_FACTS = {'facts': {
+    'us-gaap': {
+        'Revenues': {'units': {'USD': [
+            fact(Q3, "10-Q", "Q3", "2023-09-30", 100.0, "2023-07-01"),
+            fact(Q3, "10-Q", "Q3", "2023-09-30", 290.0, "2023-01-01"),
+            fact(FY, "10-K", "FY", "2023-12-31", 400.0, "2023-01-01"),
+        ]}},
+        'Cash': {'units': {'USD': [
+            fact(Q3, "10-Q", "Q3", "2023-09-30", 50.0),
+            fact(FY, "10-K", "FY", "2023-12-31", 60.0),
+        ]}},
+        # 期后事项 / 债务到期: 结束日期晚于报告期末
+        'LongTermDebt': {'units': {'USD': [
+            fact(Q3, "10-Q", "Q3", "2023-10-31", 500.0),
+            fact(FY, "10-K", "FY", "2028-06-30", 700.0),
+        ]}},
+        'DividendsCommonStock': {'units': {'USD': [
+            fact(FY, "10-K", "FY", "2024-02-15", 9.0, "2024-01-20"),
+        ]}},
+    },
+    'dei': {'EntityCommonStockSharesOutstanding': {'units': {'shares': [
+        fact(FY, "10-K", "FY", "2024-02-20", 1e6),
+    ]}}},
+}}
+
+METRICS = {'Revenue': ['Revenues'], 'Cash': ['Cash'], 'Long Term Debt': ['LongTermDebt']}
+
+def test_period_end_ignores_later_dated_facts():
+    loader = SEC_CompanyFactsLoader(facts_dir=".", metrics_map=METRICS)
+    filings = {f['Accession']: f for f in loader.build_filings("0000000001", COMPANY_FACTS)}
+
+    assert filings[Q3]['Period End Date'] == "2023-09-30"
+    assert filings[FY]['Period End Date'] == "2023-12-31"
+    # 报告期的数值: 单季收入, 期末现金
+    assert filings[Q3]['Revenue'] == 100.0 and filings[Q3]['Cash'] == 50.0
+    assert filings[FY]['Revenue'] == 400.0 and filings[FY]['Cash'] == 60.0
+
+if __name__ == "__main__":
+    test_period_end_ignores_later_dated_facts()
+    print("✅ Companyfacts period end tests passed.")
@@ -0,0 +1,63 @@
+import sys
+import os
+import numpy as np
+from py_vollib_vectorized import vectorized_black_scholes
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from options_runner.utils.iv_solver import implied_volatility
+
+S, R = 100.0, 0.04
+
+def grid():
+    """深度实值 / 平值 / 深度虚值 x 期限 x 波动率, 价格由 py_vollib 计算."""
+    K, T, sigma, flag = np.meshgrid([40.0, 70.0, 100.0, 140.0, 220.0], [0.1, 0.5, 2.0], [0.15, 0.4, 0.9], ['c', 'p'])
+    K, T, sigma, flag = (x.ravel() for x in (K, T, sigma, flag))
+    price = vectorized_black_scholes(flag, S, K, T, R, sigma, return_as='numpy')
+    # 只保留有实际时间价值的报价 (价格对 sigma 足够敏感, 反解才有意义)
+    bumped = vectorized_black_scholes(flag, S, K, T, R, sigma * 1.01, return_as='numpy')
+    keep = np.abs(bumped - price) > 1e-6
+    return price[keep], K[keep], T[keep], sigma[keep], flag[keep]
+
+def test_round_trip_deep_itm_and_otm():
+    price, K, T, sigma, flag = grid()
+    assert (K == 40.0).any() and (K == 220.0).any()
+    iv, converged, _ = implied_volatility(price, S, K, T, R, flag, full_output=True)
+    assert converged.all()
+    np.testing.assert_allclose(iv, sigma, rtol=1e-5)
+
+def test_no_time_value_returns_nan():
+    # 零价格, 恰好等于内在价值, 低于内在价值, 高于无套利上界
+    K = np.array([100.0, 80.0, 80.0, 100.0])
+    price = np.array([0.0, S - 80.0 * np.exp(-R), 5.0, 150.0])
+    iv = implied_volatility(price, S, K, 1.0, R, 'c')
+    assert np.isnan(iv).all()
+
+def test_warm_start_converges_faster():
+    price, K, T, sigma, flag = grid()
+    _, _, cold_iters = implied_volatility(price, S, K, T, R, flag, full_output=True)
+    warm_iv, converged, warm_iters = implied_volatility(price, S, K, T, R, flag, sigma0=sigma * 1.001, full_output=True)
+    assert converged.all()
+    np.testing.assert_allclose(warm_iv, sigma, rtol=1e-5)
+    assert warm_iters.sum() < cold_iters.sum()
+
+def test_warm_start_ignores_missing_guesses():
+    price, K, T, sigma, flag = grid()
+    guesses = np.where(np.arange(price.size) % 2 == 0, np.nan, sigma)
+    np.testing.assert_allclose(implied_volatility(price, S, K, T, R, flag, sigma0=guesses), sigma, rtol=1e-5)
+
+def test_unconverged_returns_nan():
+    price, K, T, sigma, flag = grid()
+    iv, converged, iterations = implied_volatility(price, S, K, T, R, flag, max_iter=1, full_output=True)
+    assert (~converged).any()
+    assert np.isnan(iv[~converged]).all()
+    assert (iterations[~converged] == 1).all()
+
+if __name__ == "__main__":
+    test_round_trip_deep_itm_and_otm()
+    test_no_time_value_returns_nan()
+    test_warm_start_converges_faster()
+    test_warm_start_ignores_missing_guesses()
+    test_unconverged_returns_nan()
+    print("✅ IV solver tests passed.")
@@ -0,0 +1,37 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.market_data import Market_Data
+
+def make_prices(n=250, seed=0):
+    """基准日收益率随机; AAA = 1.5 倍基准, BBB = 0.5 倍基准 + 噪声."""
+    rng = np.random.default_rng(seed)
+    mkt_rets = rng.normal(0, 0.01, n)
+    dates = pd.bdate_range("2024-01-02", periods=n)
+    aaa = 100 * np.cumprod(1 + 1.5 * mkt_rets)
+    bbb = 50 * np.cumprod(1 + 0.5 * mkt_rets + rng.normal(0, 0.001, n))
+    closes = pd.DataFrame({'AAA': aaa, 'BBB': bbb}, index=dates) # yf.download: 无时区
+    benchmark = pd.Series(4000 * np.cumprod(1 + mkt_rets), index=dates)
+    return closes, benchmark
+
+def test_betas_with_timezone_aware_benchmark():
+    closes, benchmark = make_prices()
+    # Ticker.history: 交易所时区
+    benchmark.index = benchmark.index.tz_localize("America/New_York")
+    betas = Market_Data._betas(closes, benchmark)
+    assert abs(betas['AAA'] - 1.5) < 1e-9
+    assert abs(betas['BBB'] - 0.5) < 0.05
+
+def test_betas_need_enough_observations():
+    closes, benchmark = make_prices(n=30)
+    assert Market_Data._betas(closes, benchmark).isna().all()
+
+if __name__ == "__main__":
+    test_betas_with_timezone_aware_benchmark()
+    test_betas_need_enough_observations()
+    print("✅ Market data beta tests passed.")
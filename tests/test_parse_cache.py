@@ -0,0 +1,45 @@
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.sec_core.SEC_ParseCache import SEC_ParseCache
+
+def make_filing(root):
+    folder = os.path.join(root, "0000000000-24-000001")
+    os.makedirs(folder)
+    doc = os.path.join(folder, "doc.htm")
+    with open(doc, "w") as f:
+        f.write("<html></html>")
+    return folder, doc
+
+def test_none_results_expire():
+    with tempfile.TemporaryDirectory() as root:
+        cache = SEC_ParseCache(os.path.join(root, "cache.sqlite"), none_ttl=3600)
+        folder, doc = make_filing(root)
+        cache.put(folder, doc, "cfg", None)
+        assert cache.get(folder, "cfg") == (True, None)
+
+        # 失败结果超过 TTL: 重新解析
+        with cache._conn:
+            cache._conn.execute("UPDATE parsed_filings SET parsed_at = parsed_at - 3601")
+        assert cache.get(folder, "cfg") == (False, None)
+        cache.close()
+
+def test_parsed_results_do_not_expire():
+    with tempfile.TemporaryDirectory() as root:
+        cache = SEC_ParseCache(os.path.join(root, "cache.sqlite"), none_ttl=0)
+        folder, doc = make_filing(root)
+        cache.put(folder, doc, "cfg", {'Revenue': 1.0})
+        with cache._conn:
+            cache._conn.execute("UPDATE parsed_filings SET parsed_at = 0")
+        assert cache.get(folder, "cfg") == (True, {'Revenue': 1.0})
+        assert cache.get(folder, "other")[0] is False
+        cache.close()
+
+if __name__ == "__main__":
+    test_none_results_expire()
+    test_parsed_results_do_not_expire()
+    print("✅ Parse cache tests passed.")
@@ -0,0 +1,21 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from options_runner.utils import rate_limit
+
+def test_process_share_splits_host_budget():
+    try:
+        assert rate_limit.get_host_limiter("a.test", 5.0).interval == 0.2
+        # 4 scan workers: each process may only use 1/4 of the host budget
+        rate_limit.set_process_share(4)
+        assert abs(rate_limit.get_host_limiter("a.test", 5.0).interval - 0.8) < 1e-12
+        assert rate_limit.get_host_limiter("b.test", 0).interval == 0.0
+    finally:
+        rate_limit.set_process_share(1)
+
+if __name__ == "__main__":
+    test_process_share_splits_host_budget()
+    print("✅ Rate limit tests passed.")
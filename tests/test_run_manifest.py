@@ -0,0 +1,45 @@
+import sys
+import os
+import time
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipelines.run_manifest import RunManifest
+
+def test_fresh_since_expires_old_checkpoints():
+    with tempfile.TemporaryDirectory() as root:
+        manifest = RunManifest("ttl", root=root)
+        calls = []
+        fetch = lambda: calls.append(1) or {'price': 10.0 + len(calls)}
+
+        value, _ = manifest.cached("AAA", "market", ["ttl"], fetch, fresh_since=time.time() - 900)
+        # 同一 TTL 内续跑: 复用
+        assert manifest.cached("AAA", "market", ["ttl"], fetch, fresh_since=time.time() - 900)[0] == value
+        assert len(calls) == 1
+
+        # 获取时间早于 fresh_since: 重新拉取
+        manifest.data['tickers']['AAA']['market']['finished_at'] -= 901
+        assert manifest.cached("AAA", "market", ["ttl"], fetch, fresh_since=time.time() - 900)[0] == {'price': 12.0}
+        assert len(calls) == 2
+
+        # Resumed from disk: the new finished_at was checkpointed
+        reloaded = RunManifest("ttl", root=root)
+        assert reloaded.lookup("AAA", "market", reloaded.key("AAA", "market", "ttl"), fresh_since=time.time() - 900)[0]
+
+def test_concurrent_stores_are_all_checkpointed():
+    with tempfile.TemporaryDirectory() as root:
+        manifest = RunManifest("threads", root=root)
+        tickers = [f"T{i:02d}" for i in range(40)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda t: manifest.store(t, "market", "k", {'ticker': t}), tickers))
+        # The last file written holds every ticker, not an older snapshot
+        assert RunManifest("threads", root=root).tickers() == tickers
+        assert not [f for f in os.listdir(os.path.join(root, "runs")) if f.endswith(".tmp")]
+
+if __name__ == "__main__":
+    test_fresh_since_expires_old_checkpoints()
+    test_concurrent_stores_are_all_checkpointed()
+    print("✅ Run manifest tests passed.")
@@ -0,0 +1,110 @@
+import sys
+import os
+import io
+import contextlib
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from screener_fixtures import FakeMarket
+
+# Vectorized screeners must return exactly what the old loops returned
+# (same rows, same order) on the same fixed synthetic chains.
+MARKET = FakeMarket()
+
+def run_quiet(screener_cls, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return screener_cls(MARKET).run("TST", **kwargs)
+
+def assert_same_rows(new, old):
+    assert new is not None and old is not None
+    assert not old.empty
+    pd.testing.assert_frame_equal(new.reset_index(drop=True), old.reset_index(drop=True), check_dtype=False)
+
+def test_bull_put_matches_loop():
+    from options_runner.screeners.bull_put import BullPutScreener
+    from legacy_screeners.bull_put import BullPutScreener as LoopBullPut
+    assert_same_rows(run_quiet(BullPutScreener), run_quiet(LoopBullPut))
+
+def test_bear_call_matches_loop():
+    from options_runner.screeners.bear_call import BearCallScreener
+    from legacy_screeners.bear_call import BearCallScreener as LoopBearCall
+    assert_same_rows(run_quiet(BearCallScreener), run_quiet(LoopBearCall))
+
+def test_zebra_matches_loop():
+    from options_runner.screeners.zebra import ZebraScreener
+    from legacy_screeners.zebra import ZebraScreener as LoopZebra
+    old = run_quiet(LoopZebra)
+    assert_same_rows(run_quiet(ZebraScreener, top_k=None), old)
+    # Per-expiry top_k pruning leaves the returned top-20 table unchanged
+    assert_same_rows(run_quiet(ZebraScreener), old)
+
+def test_double_bull_matches_loop():
+    from options_runner.screeners.double_bull import DoubleBullScreener
+    from legacy_screeners.double_bull import DoubleBullScreener as LoopDoubleBull
+    for bounds in ({'max_put_strike': 90, 'min_call_strike': 105}, {'max_put_strike': 95, 'min_call_strike': 104}):
+        assert_same_rows(run_quiet(DoubleBullScreener, **bounds), run_quiet(LoopDoubleBull, **bounds))
+
+def test_deep_itm_matches_loop():
+    from options_runner.screeners.deep_itm import DeepITMScreener
+    from legacy_screeners.deep_itm import DeepITMScreener as LoopDeepITM
+    old = run_quiet(LoopDeepITM)
+    assert_same_rows(run_quiet(DeepITMScreener, top_n=None), old)
+    # Per-expiry top_n keeps every pair of the printed top-20 table
+    assert_same_rows(run_quiet(DeepITMScreener).head(20), old.head(20))
+
+def loop_condors(expiry, days, calls, puts, short_delta=0.20, delta_band=0.10, min_width=1.75, max_width=3.25,
+                 min_credit_width=0.10, top_n=10):
+    """
+    Brute-force reference for the full-grid Iron Condor search: every
+    (long put, short put, short call, long call) in nested loops, the
+    RoR / POP frontier by pairwise dominance, ranked by RoR.
+    """
+    in_band = lambda d: short_delta - delta_band <= abs(d) <= short_delta + delta_band
+    put_spreads = [(sp, lp, sp['strike'] - lp['strike'], sp['mid'] - lp['mid'])
+                   for _, sp in puts.iterrows() if in_band(sp['delta']) for _, lp in puts.iterrows()]
+    call_spreads = [(sc, lc, lc['strike'] - sc['strike'], sc['mid'] - lc['mid'])
+                    for _, sc in calls.iterrows() if in_band(sc['delta']) for _, lc in calls.iterrows()]
+    ok = lambda w, c: min_width <= w <= max_width and c > 0
+
+    combos = []
+    for sp, lp, w_put, c_put in put_spreads:
+        if not ok(w_put, c_put): continue
+        for sc, lc, w_call, c_call in call_spreads:
+            if not ok(w_call, c_call): continue
+            credit, width = c_put + c_call, max(w_put, w_call)
+            max_loss = width - credit
+            if max_loss <= 0 or credit / width < min_credit_width: continue
+            combos.append({
+                'Expiry': expiry, 'Days': days,
+                'Long Put': lp['strike'], 'Short Put': sp['strike'],
+                'Short Call': sc['strike'], 'Long Call': lc['strike'],
+                'Width': width, 'Credit': credit, 'Max Loss': max_loss,
+                'RoR%': credit / max_loss * 100, 'POP%': (1 - (sc['delta'] + abs(sp['delta']))) * 100,
+                'Credit/Width': credit / width, 'BE_Low': sp['strike'] - credit, 'BE_High': sc['strike'] + credit
+            })
+
+    frontier = [a for a in combos if not any(
+        b['POP%'] >= a['POP%'] and b['RoR%'] >= a['RoR%'] and (b['POP%'] > a['POP%'] or b['RoR%'] > a['RoR%'])
+        for b in combos)]
+    frontier = sorted(frontier, key=lambda r: -r['RoR%'])[:top_n]
+    for rank, row in enumerate(frontier, 1):
+        row['Rank'] = rank
+    return frontier
+
+def test_iron_condor_matches_brute_force():
+    from options_runner.screeners.iron_condor import IronCondorScreener
+    new = run_quiet(IronCondorScreener)
+    rows = []
+    for expiry, days in MARKET.get_option_dates("TST", 25, 60):
+        calls, puts = MARKET.chains[expiry]
+        rows += loop_condors(expiry, days, calls, puts)
+    expected = pd.DataFrame(rows)[new.columns]
+    assert_same_rows(new, expected.sort_values(by=['Expiry', 'Rank'], kind='stable'))
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("✅ Screener regression tests passed.")
@@ -0,0 +1,141 @@
+import sys
+import os
+import time
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.sec_core.SEC_EdgarClient import SEC_EdgarClient, TokenBucket
+
+BODY = bytes(range(256)) * 40 # 10 KB document
+
+class StandIn(BaseHTTPRequestHandler):
+    """Local stand-in for EDGAR archives: Range support, scripted failures, request log."""
+    body = BODY
+    fail_with = [] # status codes returned (and consumed) before serving
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        StandIn.requests.append(('HEAD', None))
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+
+    def do_GET(self):
+        rng = self.headers.get("Range")
+        StandIn.requests.append(('GET', rng))
+        if StandIn.fail_with:
+            self.send_response(StandIn.fail_with.pop(0))
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        start = int(rng[len("bytes="):].rstrip("-")) if rng else 0
+        if start >= len(self.body):
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{len(self.body)}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(206 if rng else 200)
+        if rng:
+            self.send_header("Content-Range", f"bytes {start}-{len(self.body) - 1}/{len(self.body)}")
+        self.send_header("Content-Length", str(len(self.body) - start))
+        self.end_headers()
+        self.wfile.write(self.body[start:])
+
+def serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StandIn.body, StandIn.fail_with, StandIn.requests = BODY, [], []
+    client = SEC_EdgarClient("Test", "test@example.com", www_base_url=f"http://127.0.0.1:{server.server_port}",
+                             rate_limiter=TokenBucket(1000), max_retries=3, backoff_base=0.01)
+    return server, client
+
+def download(client, part=None):
+    """Downloads the stand-in document, optionally starting from an existing .part file."""
+    with tempfile.TemporaryDirectory() as root:
+        dest = os.path.join(root, "doc.htm")
+        if part is not None:
+            with open(f"{dest}.part", "wb") as f:
+                f.write(part)
+        size = client.download(f"{client.www_base_url}/doc.htm", dest)
+        with open(dest, "rb") as f:
+            return size, f.read(), os.path.exists(f"{dest}.part")
+
+def test_token_bucket_spaces_requests():
+    bucket = TokenBucket(50) # 无突发: 每 20ms 一个
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - start >= 5 / 50 * 0.95
+
+def test_token_bucket_burst_capacity():
+    bucket = TokenBucket(1, capacity=5)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.5
+
+def test_transient_errors_are_retried():
+    server, client = serve()
+    try:
+        StandIn.fail_with = [503, 429]
+        assert client.get_bytes(f"{client.www_base_url}/doc.htm") == BODY
+        assert len(StandIn.requests) == 3
+
+        # 404 不重试
+        StandIn.fail_with, StandIn.requests = [404], []
+        try:
+            client.get_bytes(f"{client.www_base_url}/doc.htm")
+            assert False, "404 must raise"
+        except HTTPError as e:
+            assert e.code == 404
+        assert len(StandIn.requests) == 1
+    finally:
+        server.shutdown()
+
+def test_download_resumes_with_range():
+    server, client = serve()
+    try:
+        StandIn.fail_with = [503]
+        size, data, part_left = download(client, part=BODY[:4000])
+        assert (size, data, part_left) == (len(BODY), BODY, False)
+        assert StandIn.requests[-1] == ('GET', "bytes=4000-")
+    finally:
+        server.shutdown()
+
+def test_416_with_complete_part_is_kept():
+    server, client = serve()
+    try:
+        size, data, _ = download(client, part=BODY)
+        assert (size, data) == (len(BODY), BODY)
+        assert StandIn.requests == [('GET', f"bytes={len(BODY)}-")]
+    finally:
+        server.shutdown()
+
+def test_416_with_stale_part_restarts():
+    server, client = serve()
+    try:
+        # 远端文档变短了: 旧的 .part 比它长, 不能当作完整文件
+        size, data, part_left = download(client, part=BODY + b"stale tail")
+        assert (size, data, part_left) == (len(BODY), BODY, False)
+        assert StandIn.requests[-1] == ('GET', None)
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_token_bucket_spaces_requests()
+    test_token_bucket_burst_capacity()
+    test_transient_errors_are_retried()
+    test_download_resumes_with_range()
+    test_416_with_complete_part_is_kept()
+    test_416_with_stale_part_restarts()
+    print("✅ EDGAR client tests passed.")
@@ -17,6 +17,7 @@ try:
     print("   Testing instantiation...")
     pipeline = InstitutionalDataPipeline("Test", "test@example.com")
     print("   ✅ Instantiated")
+    pipeline.close()
 
 except Exception as e:
     print(f"   ❌ Failed: {e}")